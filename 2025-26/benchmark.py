@@ -0,0 +1,374 @@
+import argparse
+import contextlib
+import functools
+import io
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from importlib import metadata
+from unittest import mock
+
+import yaml
+
+from utils import history
+from utils.context import RunContext
+from utils.data import build_lineup_record, save_projections, update_lineups, write_json_atomic
+from utils.history import HistoryStore, parse_live_payload
+from utils.identity import IdentityMap, match_player_columns
+from utils.matching import resolve_names
+from utils.rule_engine import has_rule_spec
+from utils.rules import get_rule, rule_module_name
+from utils.solver import SOLVER_BACKENDS, FPLChallengeOptimiser, build_selected_players
+from utils.synthetic import (
+    season_history_path, synthetic_bootstrap, synthetic_fbref, synthetic_history, synthetic_live,
+    synthetic_projections,
+)
+
+# Season directory this script belongs to, e.g. '2025-26'
+SEASON = os.path.abspath(__file__).split(os.sep)[-2]
+
+CONSTRAINTS_PATH = os.path.join(SEASON, 'data', 'constraints.yaml')
+
+# Results are written to BENCHMARK_DIR/{commit}.json
+BENCHMARK_DIR = os.environ.get('FPL_BENCHMARK_DIR', os.path.join('.cache', 'benchmarks'))
+
+DEFAULT_SIZES = [500, 5000, 50000]
+GROUPS = ('solver', 'rules', 'matching', 'history', 'persistence')
+
+# Finished gameweeks in the synthetic season (and so stored in its history)
+HISTORY_GAMEWEEKS = 10
+
+FBREF_STAT_TYPES = ['standard', 'shooting', 'passing', 'misc', 'defense', 'shot_events']
+
+# Lineups files are benchmarked holding a full season of gameweeks
+LINEUP_GAMEWEEKS = 38
+
+# `--compare` flags benchmarks whose fastest run grew by more than this factor
+REGRESSION_THRESHOLD = 1.2
+
+PACKAGES = ['numpy', 'pandas', 'pulp', 'scipy', 'rapidfuzz', 'pyyaml']
+
+
+def measure(func, repeat: int, warmup: int = 0) -> list[float]:
+    """
+    Time repeated calls of func with its printed output discarded.
+
+    Args:
+        func (Callable[[], object]): Work to time.
+        repeat (int): Timed calls.
+        warmup (int, optional): Untimed calls first (imports, caches). Defaults to 0.
+
+    Returns:
+        list[float]: Wall time of each timed call in milliseconds.
+    """
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            func()
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def run_benchmark(results: list, name: str, size: int | None, func, repeat: int, warmup: int = 0, **params) -> None:
+    """Measure one benchmark and append its record, recording the error instead if it raises."""
+    record = {'name': name, 'size': size}
+    if params:
+        record['params'] = params
+    try:
+        times = measure(func, repeat, warmup)
+    except Exception as e:
+        record['error'] = f'{type(e).__name__}: {e}'
+        print(f"  {name:<48} {size or '':>6}  failed ({record['error']})")
+    else:
+        record.update({
+            'min_ms': round(min(times), 3),
+            'median_ms': round(statistics.median(times), 3),
+            'runs_ms': [round(t, 3) for t in times],
+        })
+        print(f"  {name:<48} {size or '':>6}  {record['median_ms']:>10.1f} ms")
+    results.append(record)
+
+
+def constraint_blocks() -> list[tuple[list[int], dict]]:
+    """Distinct constraints.yaml blocks with the gameweeks sharing each."""
+    with open(CONSTRAINTS_PATH, 'r') as f:
+        constraints = yaml.safe_load(f)
+    blocks = {}
+    for key, block in constraints.items():
+        gameweeks, _ = blocks.setdefault(json.dumps(block, sort_keys=True), ([], block))
+        gameweeks.append(int(key[2:]))
+    return list(blocks.values())
+
+
+def rule_gameweeks() -> list[int]:
+    """Gameweeks with a hand-written rule module or a rules.yaml entry."""
+    return [gw for gw in range(1, history.MAX_GAMEWEEKS + 1) if rule_module_name(gw) or has_rule_spec(gw)]
+
+
+def bench_solver(results: list, projections, size: int, repeat: int) -> None:
+    """FPLChallengeOptimiser end to end (build, constrain, solve, read back) per constraint block and backend."""
+    def solve(gameweek, block, backend):
+        solver = FPLChallengeOptimiser(gameweek, projections, backend=backend)
+        solver.setup_problem(f'benchmark-gw{gameweek}')
+        solver.apply_constraints(block)
+        solver.solve()
+        solver.print_players_by_position()
+
+    for gameweeks, block in constraint_blocks():
+        for backend in SOLVER_BACKENDS:
+            run_benchmark(results, f'solver.{backend}.GW{gameweeks[0]}', size,
+                          functools.partial(solve, gameweeks[0], block, backend), repeat, gameweeks=gameweeks)
+
+
+@contextlib.contextmanager
+def synthetic_sources(projections, workspace: str, history_dir: str):
+    """
+    Point FBref loading, identity matching and the history store at synthetic data.
+
+    Rule modules import load_stats and match_player_columns by name, so both
+    are replaced on each loaded rule module; the identity map lives in the
+    workspace instead of data/player_identity.csv.
+    """
+    fbref = synthetic_fbref(projections, FBREF_STAT_TYPES)
+    identity = IdentityMap(os.path.join(workspace, f'identity-{len(projections)}.csv'))
+    patches = [mock.patch.object(history, 'HISTORY_DIR', history_dir)]
+    for gameweek in rule_gameweeks():
+        module = sys.modules.get(rule_module_name(gameweek) or '')
+        if module is not None and hasattr(module, 'load_stats'):
+            patches.append(mock.patch.object(
+                module, 'load_stats', lambda stat_types, season=None: {s: fbref[s] for s in stat_types}
+            ))
+        if module is not None and hasattr(module, 'match_player_columns'):
+            patches.append(mock.patch.object(
+                module, 'match_player_columns', functools.partial(match_player_columns, identity=identity)
+            ))
+    with contextlib.ExitStack() as stack:
+        for patch in patches:
+            stack.enter_context(patch)
+        yield
+
+
+def bench_rules(results: list, projections, bootstrap: dict, workspace: str, size: int, repeat: int) -> None:
+    """Every gameweek's rule on one shared context, after a warm-up call (imports, identity map)."""
+    gameweeks = rule_gameweeks()
+    for gameweek in gameweeks:
+        try:
+            get_rule(gameweek)
+        except ImportError:
+            pass  # recorded as a failure below
+
+    history_dir = os.path.join(workspace, f'history-{size}')
+    synthetic_history(projections, season_history_path(history_dir, bootstrap), list(range(1, HISTORY_GAMEWEEKS + 1)))
+
+    context = RunContext(bootstrap)
+    run_benchmark(results, 'context.elements', size, lambda: RunContext(bootstrap).elements, repeat)
+    with synthetic_sources(projections, workspace, history_dir):
+        for gameweek in gameweeks:
+            run_benchmark(results, f'rules.gw{gameweek}', size,
+                          lambda gameweek=gameweek: get_rule(gameweek)(projections.copy(), context), repeat, warmup=1)
+
+
+def bench_matching(results: list, projections, workspace: str, size: int, repeat: int) -> None:
+    """Batch fuzzy matching against an FBref table, and the identity map cold and warm."""
+    source = synthetic_fbref(projections, ['standard'])['standard']
+    names, teams = projections['Fuzzy'], projections['Team']
+
+    run_benchmark(results, 'matching.resolve_names', size,
+                  lambda: resolve_names(names, source['player']), repeat, choices=len(source))
+    run_benchmark(results, 'matching.resolve_names.blocked', size,
+                  lambda: resolve_names(names, source['player'], teams=teams, choice_teams=source['team']),
+                  repeat, choices=len(source))
+
+    # A fresh map per call matches everyone; the warm map only joins stored names
+    paths = (os.path.join(workspace, f'identity-cold-{size}-{i}.csv') for i in itertools.count())
+    columns = ['Playing Time_Min']
+    run_benchmark(results, 'identity.match_player_columns.cold', size,
+                  lambda: match_player_columns(projections, source, columns, name_column='player',
+                                               team_column='team', identity=IdentityMap(next(paths))),
+                  repeat, choices=len(source))
+    identity = IdentityMap(os.path.join(workspace, f'identity-warm-{size}.csv'))
+    run_benchmark(results, 'identity.match_player_columns.warm', size,
+                  lambda: match_player_columns(projections, source, columns, name_column='player',
+                                               team_column='team', identity=identity),
+                  repeat, warmup=1, choices=len(source))
+
+
+def bench_history(results: list, projections, workspace: str, size: int, repeat: int) -> None:
+    """Parsing and appending live payloads, and the store's reducers over every player."""
+    payload = synthetic_live(projections, HISTORY_GAMEWEEKS + 1)
+    run_benchmark(results, 'history.parse_live_payload', size, lambda: parse_live_payload(payload), repeat)
+
+    paths = (os.path.join(workspace, f'history-append-{size}-{i}') for i in itertools.count())
+    run_benchmark(results, 'history.append_gameweek', size,
+                  lambda: HistoryStore(next(paths)).append_gameweek(1, payload), repeat)
+
+    store = synthetic_history(projections, os.path.join(workspace, f'history-reduce-{size}'),
+                              list(range(1, HISTORY_GAMEWEEKS + 1)))
+    ids = projections['ID'].to_numpy()
+    run_benchmark(results, 'history.mean_per_appearance', size,
+                  lambda: store.mean_per_appearance('total_shots', ids), repeat, gameweeks=HISTORY_GAMEWEEKS)
+    run_benchmark(results, 'history.proportion', size,
+                  lambda: store.proportion(store.stat('bonus', ids) == 3, ids), repeat, gameweeks=HISTORY_GAMEWEEKS)
+
+
+def bench_persistence(results: list, projections, workspace: str, size: int, repeat: int,
+                      lineups: bool = True) -> None:
+    """
+    The atomic CSV/JSON writers, run inside the workspace.
+
+    Lineup files do not grow with the player pool, so their benchmarks are
+    recorded without a size and only when `lineups` is set.
+    """
+    lineup = build_selected_players(projections, projections.index[:6], {projections.index[0]})
+    record = build_lineup_record(lineup)
+    season = {gw: record for gw in range(1, LINEUP_GAMEWEEKS + 1)}
+
+    with contextlib.chdir(workspace):
+        run_benchmark(results, 'data.save_projections', size, lambda: save_projections(projections, SEASON, 1), repeat)
+        if not lineups:
+            return
+        with contextlib.redirect_stdout(io.StringIO()):
+            update_lineups('predicted_optimal.json', SEASON, season)
+        run_benchmark(results, 'data.build_lineup_record', None, lambda: build_lineup_record(lineup), repeat)
+        run_benchmark(results, 'data.write_json_atomic', None,
+                      lambda: write_json_atomic(os.path.join('bench', 'lineups.json'), season), repeat,
+                      gameweeks=LINEUP_GAMEWEEKS)
+        # Each save changes the stored content, so every call re-exports; .unchanged times the no-op path
+        revision = itertools.count()
+        run_benchmark(results, 'data.update_lineups.single', None,
+                      lambda: update_lineups('predicted_optimal.json', SEASON,
+                                             {1: {**record, 'Total_Points': next(revision)}}), repeat,
+                      gameweeks=LINEUP_GAMEWEEKS)
+        run_benchmark(results, 'data.update_lineups.unchanged', None,
+                      lambda: update_lineups('predicted_optimal.json', SEASON, {2: record}), repeat,
+                      gameweeks=LINEUP_GAMEWEEKS)
+        run_benchmark(results, 'data.update_lineups.batch', None,
+                      lambda: update_lineups('predicted_optimal.json', SEASON,
+                                             {gw: {**r, 'Total_Points': next(revision)} for gw, r in season.items()}),
+                      repeat, gameweeks=LINEUP_GAMEWEEKS)
+
+
+def git_commit() -> str:
+    """Short hash of HEAD, suffixed '-dirty' with uncommitted changes ('unknown' outside git)."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{commit}-dirty' if dirty else commit
+
+
+def package_versions() -> dict[str, str | None]:
+    versions = {}
+    for package in PACKAGES:
+        try:
+            versions[package] = metadata.version(package)
+        except metadata.PackageNotFoundError:
+            versions[package] = None
+    return versions
+
+
+def load_results(ref: str) -> dict:
+    """Load a results file by path, or by commit from BENCHMARK_DIR."""
+    path = ref if os.path.exists(ref) else os.path.join(BENCHMARK_DIR, f'{ref}.json')
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = REGRESSION_THRESHOLD) -> list[tuple]:
+    """
+    Print the fastest run of each benchmark side by side and return the regressions.
+
+    The minimum is compared rather than the median as it is the least
+    disturbed by other load on the machine.
+
+    Args:
+        baseline (dict): Earlier results file.
+        current (dict): Results of this run.
+        threshold (float, optional): Ratio above which a benchmark counts as slower.
+
+    Returns:
+        list[tuple]: (name, size, ratio) of every benchmark slower than threshold.
+    """
+    previous = {(r['name'], r['size']): r for r in baseline['results'] if 'min_ms' in r}
+    print(f"\nCompared with {baseline['commit']} ({baseline['created_at']})")
+    print(f"{'benchmark':<48} {'size':>6} {'before ms':>10} {'after ms':>10} {'ratio':>6}")
+    regressions = []
+    for record in current['results']:
+        before = previous.get((record['name'], record['size']))
+        if before is None or 'min_ms' not in record:
+            continue
+        ratio = record['min_ms'] / before['min_ms'] if before['min_ms'] else float('inf')
+        flag = '  slower' if ratio > threshold else '  faster' if ratio < 1 / threshold else ''
+        print(f"{record['name']:<48} {record['size'] or '':>6} {before['min_ms']:>10.1f} "
+              f"{record['min_ms']:>10.1f} {ratio:>6.2f}{flag}")
+        if ratio > threshold:
+            regressions.append((record['name'], record['size'], ratio))
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the solver, rules, matching and I/O on synthetic data.')
+    parser.add_argument('--sizes', type=lambda s: [int(n) for n in s.split(',')], default=DEFAULT_SIZES,
+                        help='Comma-separated player pool sizes (default: %(default)s)')
+    parser.add_argument('--only', nargs='+', choices=GROUPS, default=list(GROUPS), help='Benchmark groups to run')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed calls per benchmark (default: %(default)s)')
+    parser.add_argument('--output', help=f'Results file (default: {BENCHMARK_DIR}/<commit>.json)')
+    parser.add_argument('--compare', metavar='REF', help='Results file or commit to compare against')
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    output = args.output or os.path.join(BENCHMARK_DIR, f'{commit}.json')
+    report = {
+        'commit': commit,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'packages': package_versions(),
+        'sizes': args.sizes,
+        'repeat': args.repeat,
+        'results': [],
+    }
+    results = report['results']
+
+    with tempfile.TemporaryDirectory(prefix='fpl-benchmark-') as workspace:
+        for size in args.sizes:
+            print(f"\n{size} players")
+            projections = synthetic_projections(size)
+            bootstrap = synthetic_bootstrap(projections, finished=HISTORY_GAMEWEEKS)
+            if 'solver' in args.only:
+                bench_solver(results, projections, size, args.repeat)
+            if 'rules' in args.only:
+                bench_rules(results, projections, bootstrap, workspace, size, args.repeat)
+            if 'matching' in args.only:
+                bench_matching(results, projections, workspace, size, args.repeat)
+            if 'history' in args.only:
+                bench_history(results, projections, workspace, size, args.repeat)
+            if 'persistence' in args.only:
+                bench_persistence(results, projections, workspace, size, args.repeat,
+                                  lineups=size == args.sizes[0])
+
+    write_json_atomic(output, report)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        regressions = compare_results(load_results(args.compare), report)
+        print(f"\n{len(regressions)} benchmark(s) more than {REGRESSION_THRESHOLD:.1f}x slower")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
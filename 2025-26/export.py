@@ -0,0 +1,32 @@
+import argparse
+import os
+import sys
+
+from utils.site import INDEX_NAME, write_season_site
+from utils.store import LINEUP_FILES, LineupStore
+
+# Season directory this script belongs to, e.g. '2025-26'
+SEASON = os.path.abspath(__file__).split(os.sep)[-2]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Regenerate lineups JSON and the site index and shards from the lineup store.')
+    parser.add_argument('files', nargs='*', metavar='FILE',
+                        help=f"Lineups files to export (default: all of {', '.join(LINEUP_FILES)})")
+    parser.add_argument('--force', action='store_true', help='Rewrite files even if the store has not changed')
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.files if name not in LINEUP_FILES]
+    if unknown:
+        parser.error(f"unknown lineups file(s): {', '.join(unknown)}")
+
+    with LineupStore(SEASON) as store:
+        written = store.export(tuple(args.files) or LINEUP_FILES, force=args.force)
+    if write_season_site(SEASON, force=args.force):
+        written.append(INDEX_NAME)
+    if not written:
+        print('Site data is up to date.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,16 +2,16 @@ import os
 import pandas as pd
 import yaml
 from utils.projections import generate_projections
-from utils.rules.gw12 import gw12_rules
-from utils.decisions import run_ban_force
-from utils.solver import FPLChallengeOptimiser
-from utils.data import save_projections, save_optimal_prediction
+from utils.rules import apply_rules
+from utils.interactive import solve_and_save
+from utils.trace import finish_trace, span, start_trace, write_trace
 
 if __name__ == "__main__":
     FILE_PATH = os.path.abspath(__file__)
     SEASON = FILE_PATH.split('/')[-2]
     GAMEWEEK = int(FILE_PATH.split('/')[-1].replace('gw','').replace('.py',''))
     print('\nRunning GW', GAMEWEEK, 'for', SEASON)
+    start_trace(f'gw{GAMEWEEK}', season=SEASON, gameweek=GAMEWEEK)
 
     # Load constraints from YAML
     # ==================================================================
@@ -29,8 +29,9 @@ if __name__ == "__main__":
     # Load projections and make gameweek changes
     # ==================================================================
     try:
-        projections = generate_projections(GAMEWEEK)
-        projections = gw12_rules(projections)
+        with span('generate_projections'):
+            projections = generate_projections(GAMEWEEK)
+        projections = apply_rules(GAMEWEEK, projections)
     except Exception as e:
         print(f"Error generating projections. Loading saved predictions.")
         print(e)
@@ -44,30 +45,10 @@ if __name__ == "__main__":
 
     print(f"Projections generated for GW{GAMEWEEK}")
 
-    # Enforce player banning/forcing
+    # Ban/force players, solve and save
     # ===================================================================
-    ban_ids, force_ids = run_ban_force(projections)
-    
-    # Solver
-    # ===================================================================
-    solver = FPLChallengeOptimiser(GAMEWEEK, projections)
-    solver.setup_problem(f"fpl-{SEASON.replace('-', '')}-gw{GAMEWEEK}-challenge")
-
-    solver.exclude_players_constraint(ban_ids)
-    solver.force_players_constraint(force_ids)
-
-    solver.total_players_constraint(constraints['total_players'])
-    solver.captain_count_constraint(constraints['captain_count'])
-    solver.position_count_constraints(constraints['position_constraints'])
-    solver.max_players_from_same_team_constraint(1)
-    solver.budget_constraint(9999)
-    
-    # Solve and print results
-    # ===================================================================
-    solver.solve()
-    solver.print_players_by_position()
+    solve_and_save(SEASON, GAMEWEEK, projections, constraints)
 
-    # Save projections
+    # Write stage timings beside the lineup files
     # ===================================================================
-    save_projections(projections, SEASON, GAMEWEEK)
-    save_optimal_prediction(solver.selected_players, SEASON, GAMEWEEK)
\ No newline at end of file
+    write_trace(finish_trace(), SEASON)
@@ -1,15 +1,28 @@
+import argparse
 import os
-import json
-import requests
+import sys
+import time
 import pandas as pd
 import yaml
 import numpy as np
 from collections import defaultdict
-from utils.solver import FPLChallengeOptimiser
-from utils.data import ensure_season_in_registry
-from utils.actual import process_actual_outcome
-
-BASE_URL = 'https://fplchallenge.premierleague.com/api'
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from utils.club_dp import solve_lineup
+from utils.data import update_lineups
+from utils.actual import (
+    build_actual_outcome_for_gw, fetch_entry_picks, load_entry_id, load_predicted_lineups, process_actual_outcome,
+    save_actual_outcomes,
+)
+from utils.api import fetch_live, get_completed_gameweeks
+from utils.context import RunContext
+from utils.http import cache_report
+from utils.store import LineupStore
+
+# Season directory this script belongs to, e.g. '2025-26'
+SEASON = os.path.abspath(__file__).split(os.sep)[-2]
+
+# Concurrent live/picks requests in --parallel mode; overall rate is capped by utils.http
+FETCH_WORKERS = 8
 
 ELEMENT_TYPE_MAP = {
     1: 'Goalkeeper',
@@ -19,50 +32,6 @@ ELEMENT_TYPE_MAP = {
 }
 
 
-def fetch_bootstrap() -> dict:
-    """
-    Fetch the FPL Challenge bootstrap-static payload.
-
-    Returns:
-        dict: Parsed JSON response containing elements, teams, events, etc.
-    """
-    response = requests.get(f'{BASE_URL}/bootstrap-static/')
-    response.raise_for_status()
-    return response.json()
-
-
-def fetch_live(gameweek: int) -> dict:
-    """
-    Fetch live points data for a specific gameweek.
-
-    Args:
-        gameweek: The gameweek number to fetch.
-
-    Returns:
-        dict: Parsed JSON response containing per-element stats and points.
-    """
-    response = requests.get(f'{BASE_URL}/event/{gameweek}/live/')
-    response.raise_for_status()
-    return response.json()
-
-
-def get_completed_gameweeks(events: list) -> list[int]:
-    """
-    Return a sorted list of gameweek IDs that are fully finished and checked.
-
-    Args:
-        events: List of event dicts from the bootstrap-static payload.
-
-    Returns:
-        list[int]: Sorted gameweek IDs where finished and data_checked are True.
-    """
-    return sorted(
-        e['id']
-        for e in events
-        if e.get('finished') and e.get('data_checked')
-    )
-
-
 def build_player_dataframe(bootstrap: dict, live_data: dict) -> pd.DataFrame:
     """
     Construct a player DataFrame combining bootstrap metadata with actual
@@ -102,31 +71,19 @@ def build_player_dataframe(bootstrap: dict, live_data: dict) -> pd.DataFrame:
     return df
 
 
-def save_actual_optimal(
-    lineup: defaultdict,
-    season: str,
-    gameweek: int,
-    output_path: str,
-) -> None:
+def build_actual_optimal_record(lineup: defaultdict) -> dict:
     """
-    Persist the hindsight-optimal lineup for a gameweek to actual_optimal.json.
-    Doubles the captain's points before writing, matching the predicted_optimal
-    serialisation format.
+    Convert a hindsight lineup into the JSON record stored per gameweek.
 
-    Args:
-        lineup:      Selected players keyed by position from the solver.
-        season:      Season directory string (e.g. '2025-26').
-        gameweek:    Gameweek number being saved.
-        output_path: Absolute path to the target JSON file.
-    """
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    Doubles the captain's points, matching the predicted_optimal
+    serialisation format, and labels them Points.
 
-    if os.path.exists(output_path):
-        with open(output_path, 'r', encoding='utf-8') as f:
-            all_gameweeks: dict = json.load(f)
-    else:
-        all_gameweeks = {}
+    Args:
+        lineup: Selected players keyed by position from the solver.
 
+    Returns:
+        dict: Record with Players, Total_Cost and Total_Points keys.
+    """
     def _serialise_player(player: dict) -> dict:
         result = {}
         for k, v in player.items():
@@ -158,64 +115,70 @@ def save_actual_optimal(
         p['Points'] for players in converted.values() for p in players
     )
 
-    all_gameweeks[str(gameweek)] = {
+    return {
         'Players': converted,
         'Total_Cost': round(total_cost, 1),
         'Total_Points': round(total_points, 2),
     }
 
-    all_gameweeks = dict(
-        sorted(all_gameweeks.items(), key=lambda item: int(item[0]))
-    )
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(all_gameweeks, f, indent=4, ensure_ascii=False)
+def save_actual_optimal_records(records: dict[int, dict], season: str) -> None:
+    """
+    Store hindsight-optimal records and re-export actual_optimal.json.
 
-    print(f"Actual optimal for GW{gameweek} saved to {output_path}")
+    Args:
+        records: Gameweek -> record from build_actual_optimal_record.
+        season:  Season directory string (e.g. '2025-26').
+    """
+    update_lineups('actual_optimal.json', season, records)
 
-    # Mirror to the site data directory for the frontend
-    site_path = os.path.join('site', 'data', season, 'actual_optimal.json')
-    os.makedirs(os.path.dirname(site_path), exist_ok=True)
-    with open(site_path, 'w', encoding='utf-8') as f:
-        json.dump(all_gameweeks, f, indent=4, ensure_ascii=False)
 
-    print(f"Actual optimal for GW{gameweek} mirrored to {site_path}")
+def save_actual_optimal(lineup: defaultdict, season: str, gameweek: int) -> None:
+    """
+    Persist the hindsight-optimal lineup for a gameweek to actual_optimal.json.
 
-    ensure_season_in_registry(season)
+    Args:
+        lineup:   Selected players keyed by position from the solver.
+        season:   Season directory string (e.g. '2025-26').
+        gameweek: Gameweek number being saved.
+    """
+    save_actual_optimal_records({gameweek: build_actual_optimal_record(lineup)}, season)
 
 
-if __name__ == '__main__':
-    FILE_PATH = os.path.abspath(__file__)
-    SEASON = FILE_PATH.split('/')[-2]
+def solve_actual_optimal(gameweek: int, projections: pd.DataFrame, constraints: dict) -> dict:
+    """
+    Solve one gameweek on actual points and return its stored-form record.
 
-    constraints_path = os.path.join(SEASON, 'data', 'constraints.yaml')
-    with open(constraints_path, 'r') as f:
-        all_constraints: dict = yaml.safe_load(f)
+    Module-level so it can run in a worker process.
 
-    output_path = os.path.join(SEASON, 'data', 'lineups', 'actual_optimal.json')
+    Args:
+        gameweek:    Gameweek number.
+        projections: Output of build_player_dataframe for the gameweek.
+        constraints: Gameweek block from constraints.yaml.
 
-    # Identify which gameweeks have already been processed
-    if os.path.exists(output_path):
-        with open(output_path, 'r', encoding='utf-8') as f:
-            existing_data: dict = json.load(f)
-        already_processed: set[int] = {int(k) for k in existing_data if k.lstrip('-').isdigit()}
-    else:
-        already_processed = set()
+    Returns:
+        dict: Record from build_actual_optimal_record.
+    """
+    # Exact club DP for one-player-per-club weeks, MILP otherwise
+    solver = solve_lineup(
+        gameweek,
+        projections,
+        constraints,
+        f"fpl-hindsight-{SEASON.replace('-', '')}-gw{gameweek}",
+    )
+    solver.print_players_by_position()
+    return build_actual_optimal_record(solver.selected_players)
 
-    outcome_path = os.path.join(SEASON, 'data', 'lineups', 'actual_outcome.json')
-    if os.path.exists(outcome_path):
-        with open(outcome_path, 'r', encoding='utf-8') as f:
-            existing_outcomes: dict = json.load(f)
-        outcome_processed: set[int] = {int(k) for k in existing_outcomes if k.lstrip('-').isdigit()}
-    else:
-        outcome_processed = set()
 
-    print('Fetching bootstrap data...')
-    bootstrap = fetch_bootstrap()
+def processed_gameweeks(filename: str) -> set[int]:
+    """Gameweeks already stored for a lineups file."""
+    with LineupStore(SEASON) as store:
+        return store.gameweeks(filename)
 
-    completed_gameweeks = get_completed_gameweeks(bootstrap['events'])
-    print(f"Completed gameweeks: {completed_gameweeks}")
 
+def run_serial(bootstrap: dict, completed_gameweeks: list[int], all_constraints: dict,
+               already_processed: set[int], outcome_processed: set[int]) -> None:
+    """Process outstanding gameweeks one at a time, saving each as it completes."""
     for gw in completed_gameweeks:
         optimal_done = gw in already_processed
         outcome_done = gw in outcome_processed
@@ -235,26 +198,125 @@ if __name__ == '__main__':
             if constraints_key not in all_constraints:
                 print(f"No constraints found for GW{gw} — skipping optimal solver.")
             else:
-                constraints = all_constraints[constraints_key]
                 projections = build_player_dataframe(bootstrap, live_data)
+                record = solve_actual_optimal(gw, projections, all_constraints[constraints_key])
+                save_actual_optimal_records({gw: record}, SEASON)
 
-                solver = FPLChallengeOptimiser(gw, projections)
-                solver.setup_problem(
-                    f"fpl-hindsight-{SEASON.replace('-', '')}-gw{gw}"
-                )
+        if not outcome_done:
+            is_last = gw == completed_gameweeks[-1]
+            process_actual_outcome(SEASON, gw, live_data, bootstrap, is_last_gameweek=is_last)
 
-                solver.total_players_constraint(constraints['total_players'])
-                solver.captain_count_constraint(constraints['captain_count'])
-                solver.position_count_constraints(constraints['position_constraints'])
-                solver.max_players_from_same_team_constraint(constraints['max_per_team'])
 
-                solver.solve()
-                solver.print_players_by_position()
+def run_parallel(bootstrap: dict, completed_gameweeks: list[int], all_constraints: dict,
+                 already_processed: set[int], outcome_processed: set[int], workers: int | None = None) -> None:
+    """
+    Process every outstanding gameweek at once.
 
-                save_actual_optimal(solver.selected_players, SEASON, gw, output_path)
+    Live payloads and entry picks are fetched concurrently through the shared
+    HTTP client (which applies the rate limit), gameweeks are solved on a
+    process pool, and each lineups file is merged and written once at the end.
 
-        if not outcome_done:
-            is_last = gw == completed_gameweeks[-1]
-            process_actual_outcome(SEASON, gw, live_data, bootstrap, is_last_gameweek=is_last)
+    Args:
+        bootstrap:           Bootstrap-static payload.
+        completed_gameweeks: Finished and data-checked gameweeks.
+        all_constraints:     Parsed constraints.yaml.
+        already_processed:   Gameweeks already in actual_optimal.json.
+        outcome_processed:   Gameweeks already in actual_outcome.json.
+        workers:             Solver processes; one per CPU by default.
+    """
+    optimal_gws = [gw for gw in completed_gameweeks if gw not in already_processed]
+    missing_constraints = [gw for gw in optimal_gws if f'GW{gw}' not in all_constraints]
+    for gw in missing_constraints:
+        print(f"No constraints found for GW{gw} — skipping optimal solver.")
+    optimal_gws = [gw for gw in optimal_gws if gw not in missing_constraints]
+
+    predicted_all = load_predicted_lineups(SEASON) or {}
+    outcome_gws = [gw for gw in completed_gameweeks if gw not in outcome_processed]
+    for gw in outcome_gws:
+        if str(gw) not in predicted_all:
+            print(f"No predicted lineup found for GW{gw} — skipping actual outcome.")
+    outcome_gws = [gw for gw in outcome_gws if str(gw) in predicted_all]
+
+    live_gws = sorted(set(optimal_gws) | set(outcome_gws))
+    if not live_gws:
+        print("\nNothing to process.")
+        return
+
+    print(f"\nFetching {len(live_gws)} live payload(s) and {len(outcome_gws)} entry pick(s) concurrently...")
+    entry_id = load_entry_id(SEASON) if outcome_gws else None
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        live_futures = {gw: executor.submit(fetch_live, gw) for gw in live_gws}
+        pick_futures = {gw: executor.submit(fetch_entry_picks, gw, entry_id) for gw in outcome_gws}
+        live = {gw: future.result() for gw, future in live_futures.items()}
+        picks = {gw: future.result() for gw, future in pick_futures.items()}
+
+    records = {}
+    if optimal_gws:
+        workers = max(1, min(workers or os.cpu_count() or 1, len(optimal_gws)))
+        print(f"Solving {len(optimal_gws)} gameweek(s) on {workers} worker(s)...")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    solve_actual_optimal, gw, build_player_dataframe(bootstrap, live[gw]), all_constraints[f'GW{gw}']
+                ): gw
+                for gw in optimal_gws
+            }
+            for future in as_completed(futures):
+                records[futures[future]] = future.result()
+
+    outcomes = {
+        gw: build_actual_outcome_for_gw(
+            predicted_players=predicted_all[str(gw)]['Players'],
+            live_data=live[gw],
+            entry_history=picks[gw].get('entry_history', {}),
+        )
+        for gw in outcome_gws
+    }
 
-    print('\nHindsight optimisation complete.')
+    # One merged, atomic write per lineups file for the whole backfill
+    if records:
+        save_actual_optimal_records(records, SEASON)
+    if outcomes:
+        last_included = completed_gameweeks[-1] in outcomes
+        save_actual_outcomes(
+            SEASON, outcomes,
+            total_players=bootstrap.get('total_players') if last_included else None,
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Solve completed gameweeks on actual points.')
+    parser.add_argument('--parallel', action='store_true',
+                        help='Fetch concurrently, solve on a process pool and write each file once')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Solver processes for --parallel (default: one per CPU)')
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(SEASON, 'data', 'constraints.yaml'), 'r') as f:
+        all_constraints: dict = yaml.safe_load(f)
+
+    # Identify which gameweeks have already been processed
+    already_processed = processed_gameweeks('actual_optimal.json')
+    outcome_processed = processed_gameweeks('actual_outcome.json')
+
+    print('Fetching bootstrap data...')
+    context = RunContext()
+    bootstrap = context.bootstrap
+
+    completed_gameweeks = get_completed_gameweeks(bootstrap['events'])
+    print(f"Completed gameweeks: {completed_gameweeks}")
+
+    start = time.perf_counter()
+    if args.parallel:
+        run_parallel(bootstrap, completed_gameweeks, all_constraints, already_processed, outcome_processed,
+                     args.workers)
+    else:
+        run_serial(bootstrap, completed_gameweeks, all_constraints, already_processed, outcome_processed)
+
+    print(f'\nHindsight optimisation complete in {time.perf_counter() - start:.1f}s.')
+    print(cache_report())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
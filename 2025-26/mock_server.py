@@ -0,0 +1,55 @@
+import argparse
+import sys
+
+from utils.mock_api import DEFAULT_PORT, MockFPLServer, SnapshotSource, SyntheticSource, record_snapshots
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description='Serve a local stand-in for the FPL Challenge API. Point the pipeline at it with FPL_BASE_URL.'
+    )
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port, 0 for any free one (default: %(default)s)')
+    parser.add_argument('--snapshots', metavar='DIR', help='Serve recorded responses from DIR first')
+    parser.add_argument('--players', type=int, default=700,
+                        help='Synthetic players for paths without a snapshot (default: %(default)s)')
+    parser.add_argument('--finished', type=int, default=20, help='Finished synthetic gameweeks (default: %(default)s)')
+    parser.add_argument('--no-synthetic', action='store_true', help='Serve snapshots only; anything else is a 404')
+    parser.add_argument('--latency', type=float, default=0.0, help='Milliseconds added to each response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra random milliseconds')
+    parser.add_argument('--rate', type=float, default=None, help='Requests per second before answering 429')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests answered 429 at random')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After seconds sent with 429s')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true', help='Log every request')
+    parser.add_argument('--record', metavar='DIR',
+                        help='Copy the FPL responses in the HTTP cache into snapshot directory DIR and exit')
+    args = parser.parse_args(argv)
+
+    if args.record:
+        print(f"Recorded {record_snapshots(args.record)} response(s) to {args.record}")
+        return 0
+
+    sources = []
+    if args.snapshots:
+        sources.append(SnapshotSource(args.snapshots))
+    if not args.no_synthetic:
+        sources.append(SyntheticSource(args.players, args.finished, args.seed))
+
+    server = MockFPLServer(
+        (args.host, args.port), sources, latency=args.latency / 1000, jitter=args.jitter / 1000, rate=args.rate,
+        error_rate=args.error_rate, retry_after=args.retry_after, seed=args.seed, verbose=args.verbose,
+    )
+    print(f"Mock FPL API at {server.url} (stats at {server.url}/_stats)")
+    print(f"Point the pipeline at it with: export FPL_BASE_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
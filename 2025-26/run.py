@@ -0,0 +1,299 @@
+import argparse
+import importlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from utils.context import RunContext
+from utils.data import build_lineup_record, build_pool_record, save_projections, update_lineups
+from utils.club_dp import solve_lineup
+from utils.history import load_season_history
+from utils.matching import resolve_names
+from utils.rule_engine import compile_rule, has_rule_spec
+from utils.rules import apply_rules, print_import_report, rule_module_name
+from utils.simulation import ScoreModel, print_score_distribution
+from utils.solver import FPLChallengeOptimiser
+from utils.trace import add_record, finish_trace, span, start_trace, write_trace
+
+# Season directory this script belongs to, e.g. '2025-26'
+SEASON = os.path.abspath(__file__).split(os.sep)[-2]
+
+CONSTRAINTS_PATH = os.path.join(SEASON, 'data', 'constraints.yaml')
+RUN_CONFIG_PATH = os.environ.get('FPL_RUN_CONFIG', os.path.join(SEASON, 'data', 'run.yaml'))
+
+# Used for any key missing from both `defaults` and the GW{n} entry of run.yaml
+DEFAULT_OPTIONS = {'ban': [], 'force': [], 'save': True, 'top_k': 0}
+
+
+def parse_gameweeks(spec: str) -> list[int]:
+    """
+    Parse a gameweek selection such as '1-35', '7' or '1,3,10-12'.
+
+    Args:
+        spec (str): Comma-separated gameweeks and inclusive ranges.
+
+    Returns:
+        list[int]: Sorted, de-duplicated gameweeks.
+    """
+    gameweeks = set()
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        start, _, end = part.partition('-')
+        start, end = int(start), int(end or start)
+        if start > end:
+            raise ValueError(f"Invalid gameweek range '{part}'")
+        gameweeks.update(range(start, end + 1))
+    return sorted(gameweeks)
+
+
+def load_run_config(path: str = RUN_CONFIG_PATH) -> dict:
+    """Load run.yaml; a missing file means defaults for every gameweek."""
+    if not os.path.exists(path):
+        print(f"No run config at {path}; using defaults.")
+        return {}
+    with open(path, 'r') as f:
+        return yaml.safe_load(f) or {}
+
+
+def gameweek_options(config: dict, gameweek: int) -> dict:
+    """Merge DEFAULT_OPTIONS, the config's `defaults` and its GW{n} entry."""
+    return {**DEFAULT_OPTIONS, **(config.get('defaults') or {}), **(config.get(f'GW{gameweek}') or {})}
+
+
+def resolve_players(projections: pd.DataFrame, players: list) -> list[int]:
+    """
+    Turn configured players into projection row positions for the solver.
+
+    Args:
+        projections (pd.DataFrame): Projections the solver is built from.
+        players (list): FPL IDs (int) or names (str, fuzzy-matched on Name).
+
+    Returns:
+        list[int]: Row positions (not index labels), as expected by the
+            exclude/force constraints of both solver engines.
+
+    Raises:
+        ValueError: If a player cannot be found, so a ban or force is never
+            silently dropped.
+    """
+    rows = []
+    names = [player for player in players if isinstance(player, str)]
+    if names:
+        indices, _ = resolve_names(names, projections['Name'])
+        for name, i in zip(names, indices):
+            if i < 0:
+                raise ValueError(f"No player matching '{name}'")
+            rows.append(int(i))
+    ids = projections['ID'].to_numpy()
+    for player in players:
+        if isinstance(player, str):
+            continue
+        matches = np.flatnonzero(ids == int(player))
+        if len(matches) == 0:
+            raise ValueError(f"No player with ID {player}")
+        rows.append(int(matches[0]))
+    return rows
+
+
+def build_projections(gameweek: int, context: RunContext, from_saved: bool) -> tuple[pd.DataFrame, pd.DataFrame | None]:
+    """
+    Generate and adjust projections for a gameweek, falling back to the saved CSV.
+
+    Args:
+        gameweek (int): Gameweek number.
+        context (RunContext): Shared run context passed to rules that take one.
+        from_saved (bool): Skip generation and use the saved projections.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame | None]: Projections with the
+            gameweek's rules applied, and the projections before them (None
+            when the saved, already adjusted CSV was loaded).
+    """
+    if not from_saved:
+        try:
+            from utils.projections import generate_projections
+
+            with span('generate_projections'):
+                raw = generate_projections(gameweek)
+            return apply_rules(gameweek, raw, context), raw
+        except Exception as e:
+            print(f"GW{gameweek}: error generating projections ({e}). Loading saved projections.")
+
+    saved_path = os.path.join(SEASON, 'data', 'projections', f'gw{gameweek}.csv')
+    return pd.read_csv(saved_path), None
+
+
+def run_gameweek(gameweek: int, options: dict, bootstrap: dict | None = None, from_saved: bool = False,
+                 simulate: int = 0, targets: tuple[float, ...] = ()) -> dict:
+    """
+    Run the full pipeline for one gameweek without prompting.
+
+    Projections are generated and adjusted, bans and forces from the config
+    are applied, and the model is solved: with the exact club DP when the
+    constraints allow it, and always with the MILP when a top-k pool is
+    asked for. The per-gameweek projections CSV
+    is written here; lineup files shared between gameweeks are left to the
+    caller so they are written once.
+
+    Args:
+        gameweek (int): Gameweek number.
+        options (dict): Merged run.yaml options (ban, force, save, top_k).
+        bootstrap (dict, optional): Bootstrap-static payload fetched by the
+            parent process.
+        from_saved (bool, optional): Solve the saved projections instead of
+            regenerating them.
+        simulate (int, optional): Monte Carlo scenarios to draw for the
+            chosen lineup's score distribution; 0 skips the simulation.
+        targets (tuple[float, ...], optional): Scores to print P(score ≥ x) for.
+
+    Returns:
+        dict: gameweek, save, the stored-form lineup and pool (None unless
+            top_k is set), and this gameweek's trace (None when disabled).
+    """
+    start_trace(f'gw{gameweek}', gameweek=gameweek, pid=os.getpid())
+    with open(CONSTRAINTS_PATH, 'r') as f:
+        constraints = yaml.safe_load(f).get(f'GW{gameweek}')
+    if constraints is None:
+        raise ValueError(f"Constraints not found for GW{gameweek}")
+
+    context = RunContext(bootstrap)
+    projections, raw = build_projections(gameweek, context, from_saved)
+
+    problem_name = f"fpl-{SEASON.replace('-', '')}-gw{gameweek}-challenge"
+    ban_ids = resolve_players(projections, options['ban'])
+    force_ids = resolve_players(projections, options['force'])
+
+    pool = None
+    if options['top_k']:
+        solver = FPLChallengeOptimiser(gameweek, projections)
+        solver.setup_problem(problem_name)
+        solver.apply_constraints(constraints)
+        solver.exclude_players_constraint(ban_ids)
+        solver.force_players_constraint(force_ids)
+        pool = solver.solve_top_k(options['top_k'])
+    else:
+        solver = solve_lineup(gameweek, projections, constraints, problem_name, ban_ids, force_ids)
+    if solver.status != 'Optimal':
+        raise RuntimeError(f"GW{gameweek}: solver status {solver.status}")
+    solver.print_players_by_position()
+    if simulate:
+        with span('simulate'):
+            model = ScoreModel.for_gameweek(gameweek, projections, context, raw=raw)
+            print_score_distribution(model.simulate(solver.selected_players, n=simulate), targets)
+
+    if options['save']:
+        save_projections(projections, SEASON, gameweek)
+    return {
+        'gameweek': gameweek,
+        'save': options['save'],
+        'lineup': build_lineup_record(solver.selected_players),
+        'pool': build_pool_record(pool) if pool else None,
+        'trace': finish_trace(),
+    }
+
+
+def uses_history(gameweek: int) -> bool:
+    """Whether a gameweek's rules read the season history store."""
+    module_name = rule_module_name(gameweek)
+    if module_name is not None:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            return False
+        if hasattr(module, 'load_season_history'):
+            return True
+    return has_rule_spec(gameweek) and bool(compile_rule(gameweek).history_stats)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description='Run the gameweek pipeline for many gameweeks without prompts.')
+    parser.add_argument('gameweeks', type=parse_gameweeks, help="Gameweeks to run, e.g. '1-35' or '3,7,10-12'")
+    parser.add_argument('--config', default=RUN_CONFIG_PATH, help='Ban/force/save decisions (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--from-saved', action='store_true', help='Re-solve saved projections instead of regenerating them')
+    parser.add_argument('--no-save', action='store_true', help='Solve and print only; write nothing')
+    parser.add_argument('--simulate', type=int, default=0, metavar='N',
+                        help="Print each lineup's score distribution from N Monte Carlo scenarios")
+    parser.add_argument('--target', type=float, action='append', default=[], metavar='X',
+                        help='With --simulate, also print P(score ≥ X); repeatable')
+    parser.add_argument('--import-report', action='store_true',
+                        help="Print each gameweek rule's cold import cost and exit")
+    args = parser.parse_args(argv)
+    if args.simulate < 0:
+        parser.error('--simulate must be a positive number of scenarios')
+    if args.target and not args.simulate:
+        parser.error('--target needs --simulate')
+
+    gameweeks = args.gameweeks
+    if args.import_report:
+        print_import_report(gameweeks)
+        return 0
+
+    config = load_run_config(args.config)
+    options = {gameweek: gameweek_options(config, gameweek) for gameweek in gameweeks}
+    if args.no_save:
+        for gameweek_option in options.values():
+            gameweek_option['save'] = False
+
+    workers = max(1, min(args.workers or os.cpu_count() or 1, len(gameweeks)))
+    start_trace('run', season=SEASON, gameweeks=gameweeks, workers=workers)
+
+    # Fetch bootstrap once for every worker, and bring the history store up to
+    # date here so workers only ever read it
+    bootstrap = None
+    if not args.from_saved:
+        try:
+            with span('prefetch'):
+                bootstrap = RunContext().bootstrap
+                if any(uses_history(gameweek) for gameweek in gameweeks):
+                    load_season_history(bootstrap=bootstrap)
+        except Exception as e:
+            print(f"Could not prefetch bootstrap/history ({e}); workers will fetch their own.")
+
+    print(f"\nRunning {len(gameweeks)} gameweek(s) for {SEASON} on {workers} worker(s)")
+    start = time.perf_counter()
+
+    results, failures = {}, {}
+    with span('gameweeks'), ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(run_gameweek, gameweek, options[gameweek], bootstrap, args.from_saved,
+                            args.simulate, tuple(args.target)): gameweek
+            for gameweek in gameweeks
+        }
+        for future in as_completed(futures):
+            gameweek = futures[future]
+            try:
+                results[gameweek] = future.result()
+                add_record(results[gameweek]['trace'])
+                print(f"GW{gameweek}: {results[gameweek]['lineup']['Total_Points']} pts")
+            except Exception as e:
+                failures[gameweek] = e
+                print(f"GW{gameweek}: failed ({e})")
+
+    # One merged, atomic write per lineups file for the whole batch
+    lineups = {gw: result['lineup'] for gw, result in sorted(results.items()) if result['save']}
+    pools = {gw: result['pool'] for gw, result in sorted(results.items()) if result['save'] and result['pool']}
+    if lineups:
+        update_lineups('predicted_optimal.json', SEASON, lineups)
+    if pools:
+        update_lineups('predicted_pool.json', SEASON, pools)
+
+    trace = finish_trace()
+    if not args.no_save:
+        write_trace(trace, SEASON)
+
+    print(f"\n{len(results)} succeeded, {len(failures)} failed in {time.perf_counter() - start:.1f}s")
+    for gameweek, error in sorted(failures.items()):
+        print(f"  GW{gameweek}: {error}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
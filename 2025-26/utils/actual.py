@@ -1,11 +1,10 @@
-import os
-import json
 from pathlib import Path
 
-import requests
 import yaml
 
-from utils.data import ensure_season_in_registry
+from utils.data import update_lineups
+from utils.http import get_json
+from utils.store import LineupStore
 
 BASE_URL = 'https://fplchallenge.premierleague.com/api'
 
@@ -21,9 +20,7 @@ def fetch_entry_picks(gameweek: int, entry_id: int) -> dict:
     Returns:
         dict: Parsed JSON response containing entry_history and picks.
     """
-    response = requests.get(f'{BASE_URL}/entry/{entry_id}/event/{gameweek}/picks/')
-    response.raise_for_status()
-    return response.json()
+    return get_json(f'{BASE_URL}/entry/{entry_id}/event/{gameweek}/picks/')
 
 
 def build_actual_outcome_for_gw(
@@ -89,59 +86,55 @@ def build_actual_outcome_for_gw(
     }
 
 
-def save_actual_outcome(
+def save_actual_outcomes(
     season: str,
-    gameweek: int,
-    outcome: dict,
-    output_path: str,
+    outcomes: dict[int, dict],
     total_players: int | None = None,
 ) -> None:
     """
-    Persist the actual outcome for a gameweek and mirror it to the site directory.
+    Store actual outcomes for any number of gameweeks and re-export actual_outcome.json.
 
     total_players is written as a single top-level key after all gameweek entries
     rather than being nested inside any individual gameweek's Ranks dict.
 
     Args:
         season:        Season directory string (e.g. '2025-26').
-        gameweek:      Gameweek number being saved.
-        outcome:       Outcome data dict for the gameweek.
-        output_path:   Absolute path to the target JSON file.
-        total_players: Total competition entries; persisted at the top level.
+        outcomes:      Gameweek -> outcome data dict.
+        total_players: Total competition entries; the stored value is kept when None.
     """
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    update_lineups('actual_outcome.json', season, outcomes, extras={'total_players': total_players})
 
-    if os.path.exists(output_path):
-        with open(output_path, 'r', encoding='utf-8') as f:
-            all_gameweeks: dict = json.load(f)
-    else:
-        all_gameweeks = {}
 
-    # Preserve existing top-level total_players unless a new value is supplied
-    existing_total: int | None = all_gameweeks.pop('total_players', None)
-
-    all_gameweeks[str(gameweek)] = outcome
-    all_gameweeks = dict(
-        sorted(all_gameweeks.items(), key=lambda item: int(item[0]))
-    )
-
-    resolved_total = total_players if total_players is not None else existing_total
-    if resolved_total is not None:
-        all_gameweeks['total_players'] = resolved_total
+def save_actual_outcome(
+    season: str,
+    gameweek: int,
+    outcome: dict,
+    total_players: int | None = None,
+) -> None:
+    """
+    Persist the actual outcome for a single gameweek; see save_actual_outcomes.
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(all_gameweeks, f, indent=4, ensure_ascii=False)
+    Args:
+        season:        Season directory string (e.g. '2025-26').
+        gameweek:      Gameweek number being saved.
+        outcome:       Outcome data dict for the gameweek.
+        total_players: Total competition entries; persisted at the top level.
+    """
+    save_actual_outcomes(season, {gameweek: outcome}, total_players=total_players)
 
-    print(f"Actual outcome for GW{gameweek} saved to {output_path}")
 
-    site_path = os.path.join('site', 'data', season, 'actual_outcome.json')
-    os.makedirs(os.path.dirname(site_path), exist_ok=True)
-    with open(site_path, 'w', encoding='utf-8') as f:
-        json.dump(all_gameweeks, f, indent=4, ensure_ascii=False)
+def load_predicted_lineups(season: str) -> dict | None:
+    """Return predicted lineups keyed by gameweek string, or None if none have been saved."""
+    with LineupStore(season) as store:
+        return store.get('predicted_optimal.json') or None
 
-    print(f"Actual outcome for GW{gameweek} mirrored to {site_path}")
 
-    ensure_season_in_registry(season)
+def load_entry_id(season: str) -> int:
+    """Return the FPL Challenge team ID from the season's config.yaml."""
+    config_path = Path(season) / 'data' / 'config.yaml'
+    with config_path.open(encoding='utf-8') as f:
+        config: dict = yaml.safe_load(f)
+    return config['team_id']
 
 
 def process_actual_outcome(
@@ -164,14 +157,11 @@ def process_actual_outcome(
         bootstrap:        Bootstrap-static payload.
         is_last_gameweek: Whether this is the most recent completed gameweek.
     """
-    predicted_path = os.path.join(season, 'data', 'lineups', 'predicted_optimal.json')
-    if not os.path.exists(predicted_path):
+    predicted_all = load_predicted_lineups(season)
+    if predicted_all is None:
         print(f"predicted_optimal.json not found — skipping actual outcome for GW{gameweek}.")
         return
 
-    with open(predicted_path, 'r', encoding='utf-8') as f:
-        predicted_all: dict = json.load(f)
-
     gw_key = str(gameweek)
     if gw_key not in predicted_all:
         print(f"No predicted lineup found for GW{gameweek} — skipping actual outcome.")
@@ -179,10 +169,7 @@ def process_actual_outcome(
 
     predicted_players: dict = predicted_all[gw_key]['Players']
 
-    config_path = Path(season) / 'data' / 'config.yaml'
-    with config_path.open(encoding='utf-8') as f:
-        config: dict = yaml.safe_load(f)
-    entry_id: int = config['team_id']
+    entry_id = load_entry_id(season)
 
     print(f"Fetching entry picks for GW{gameweek}...")
     picks_data = fetch_entry_picks(gameweek, entry_id)
@@ -196,5 +183,4 @@ def process_actual_outcome(
         entry_history=entry_history,
     )
 
-    output_path = os.path.join(season, 'data', 'lineups', 'actual_outcome.json')
-    save_actual_outcome(season, gameweek, outcome, output_path, total_players=total_players)
+    save_actual_outcome(season, gameweek, outcome, total_players=total_players)
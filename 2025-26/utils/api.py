@@ -0,0 +1,62 @@
+from utils.http import get_json
+from utils.trace import traced
+
+BASE_URL = 'https://fplchallenge.premierleague.com/api'
+
+
+@traced()
+def fetch_bootstrap() -> dict:
+    """
+    Fetch the FPL Challenge bootstrap-static payload.
+
+    Returns:
+        dict: Parsed JSON response containing elements, teams, events, etc.
+    """
+    return get_json(f'{BASE_URL}/bootstrap-static/')
+
+
+@traced()
+def fetch_live(gameweek: int) -> dict:
+    """
+    Fetch live points data for a specific gameweek.
+
+    Args:
+        gameweek: The gameweek number to fetch.
+
+    Returns:
+        dict: Parsed JSON response containing per-element stats and points.
+    """
+    return get_json(f'{BASE_URL}/event/{gameweek}/live/')
+
+
+def get_completed_gameweeks(events: list) -> list[int]:
+    """
+    Return a sorted list of gameweek IDs that are fully finished and checked.
+
+    Args:
+        events: List of event dicts from the bootstrap-static payload.
+
+    Returns:
+        list[int]: Sorted gameweek IDs where finished and data_checked are True.
+    """
+    return sorted(
+        e['id']
+        for e in events
+        if e.get('finished') and e.get('data_checked')
+    )
+
+
+def get_finished_gameweeks(events: list) -> list[int]:
+    """
+    Return a sorted list of gameweek IDs whose fixtures have all finished.
+
+    Unlike get_completed_gameweeks this does not wait for the bonus/data check,
+    matching the finished-match filter used by element-summary histories.
+
+    Args:
+        events: List of event dicts from the bootstrap-static payload.
+
+    Returns:
+        list[int]: Sorted gameweek IDs where finished is True.
+    """
+    return sorted(e['id'] for e in events if e.get('finished'))
@@ -7,6 +7,9 @@ import requests
 import yaml
 
 from utils.data import ensure_season_in_registry
+from utils.http import get_client
+from utils.site import write_season_site
+from utils.trace import traced
 
 SEASON = "2025-26"
 CONFIG_PATH = Path(SEASON) / "data" / "config.yaml"
@@ -20,7 +23,7 @@ CHALLENGE_PATTERN = re.compile(
 
 def fetch_js(url: str) -> str:
     """
-    Fetch raw JS bundle text from a URL.
+    Fetch raw JS bundle text from a URL through the shared HTTP cache.
 
     Args:
         url (str): URL of the JS asset to retrieve.
@@ -28,11 +31,11 @@ def fetch_js(url: str) -> str:
     Returns:
         str: Response body as text.
     """
-    response = requests.get(url, timeout=30)
-    if not response.ok:
-        print(f"Failed to fetch JS ({response.status_code}): {url}", file=sys.stderr)
+    try:
+        return get_client().get(url, timeout=30).decode('utf-8')
+    except requests.RequestException as exc:
+        print(f"Failed to fetch JS ({exc}): {url}", file=sys.stderr)
         sys.exit(1)
-    return response.text
 
 
 def parse_challenges(js_content: str) -> dict:
@@ -72,6 +75,7 @@ def write_json(path: Path, data: dict) -> None:
     print(f"Written: {path}")
 
 
+@traced()
 def update_challenges() -> None:
     """
     Fetch, parse and persist FPL Challenge metadata for the 2025-26 season.
@@ -98,5 +102,6 @@ def update_challenges() -> None:
 
     write_json(Path(SEASON) / "data" / "descriptions" / "challenges.json", challenges)
     write_json(Path("site") / "data" / SEASON / "challenges.json", challenges)
+    write_season_site(SEASON)
 
     ensure_season_in_registry(SEASON)
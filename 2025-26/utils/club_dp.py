@@ -0,0 +1,330 @@
+from math import gcd
+
+import numpy as np
+import pandas as pd
+
+from utils.solver import FPLChallengeOptimiser, build_selected_players, print_selected_players
+
+POSITIONS = ('Goalkeeper', 'Defender', 'Midfielder', 'Forward')
+
+# FPL prices are quoted to one decimal place, so a 0.1m grid is exact
+COST_UNITS_PER_MILLION = 10
+
+
+def supports_club_dp(constraints: dict) -> bool:
+    """
+    Check whether a constraints.yaml gameweek block fits the one-player-per-club shape.
+
+    The club DP is exact when each club contributes at most one player, a single
+    captain is chosen and only the four standard positions are constrained.
+
+    Args:
+        constraints: Gameweek block from constraints.yaml.
+
+    Returns:
+        bool: True when ClubDPOptimiser can solve the block exactly.
+    """
+    return (
+        constraints.get('max_per_team') == 1
+        and constraints.get('captain_count') == 1
+        and set(constraints.get('position_constraints', {})) <= set(POSITIONS)
+    )
+
+
+class ClubDPOptimiser:
+    """
+    Exact dynamic-programming solver for one-player-per-club challenge formats.
+
+    Clubs are processed one at a time. The DP state is the number of players
+    picked per position plus a captain-used flag, and optionally the spend on a
+    discretised cost axis when a budget applies. Each club either contributes
+    nothing or one player, with or without the armband. Without a budget only
+    the best player per (club, position) can ever be picked; with a budget
+    only the cost/points Pareto frontier per (club, position) is kept.
+
+    The instance holds the static player arrays, so repeated solve() calls
+    with new points vectors (simulation, sensitivity sweeps) skip all
+    DataFrame work.
+    """
+
+    def __init__(self, gameweek, projections_data):
+        self.gameweek = gameweek
+        self.projections_data = projections_data
+        self.player_count = len(projections_data)
+
+        self.points = projections_data['Predicted_Points'].to_numpy(dtype=float)
+        self.costs = projections_data['Cost'].to_numpy(dtype=float)
+        self.cost_units = np.rint(self.costs * COST_UNITS_PER_MILLION).astype(np.int64)
+        self.team_codes, self.teams = pd.factorize(projections_data['Team'])
+        self.team_rows = [np.flatnonzero(self.team_codes == team) for team in range(len(self.teams))]
+        position_lookup = {position: k for k, position in enumerate(POSITIONS)}
+        self.position_codes = (
+            projections_data['Position'].map(position_lookup).fillna(-1).to_numpy(dtype=np.int64)
+        )
+        self.lineup_rows = []
+        self.captain_row = None
+        self.objective_value = None
+
+    def supports(self, constraints: dict) -> bool:
+        """
+        Check the constraint shape and, when budgeted, that costs sit on the 0.1m grid.
+
+        Args:
+            constraints: Gameweek block from constraints.yaml.
+
+        Returns:
+            bool: True when solve() will return the exact optimum.
+        """
+        if not supports_club_dp(constraints):
+            return False
+        if constraints.get('budget_max') is None and not constraints.get('budget_min'):
+            return True
+        return np.allclose(self.cost_units, self.costs * COST_UNITS_PER_MILLION)
+
+    def solve(self, constraints, exclude_ids=(), force_ids=(), points=None):
+        """
+        Solve a gameweek exactly by dynamic programming over clubs.
+
+        Args:
+            constraints (dict): Gameweek block from constraints.yaml. Must satisfy supports().
+            exclude_ids (Iterable[int]): Row positions of banned players.
+            force_ids (Iterable[int]): Row positions of players that must be selected.
+            points (np.ndarray, optional): Alternative points vector aligned with
+                projections_data, e.g. a simulated scenario. Defaults to Predicted_Points.
+
+        Returns:
+            bool: True if a feasible lineup was found. The lineup is stored in
+                lineup_rows, captain_row and objective_value.
+        """
+        points = self.points if points is None else np.asarray(points, dtype=float)
+        total_players = constraints['total_players']
+
+        lower = np.zeros(len(POSITIONS), dtype=np.int64)
+        upper = np.full(len(POSITIONS), total_players, dtype=np.int64)
+        for position, counts in constraints.get('position_constraints', {}).items():
+            k = POSITIONS.index(position)
+            if counts.get('min_count') is not None:
+                lower[k] = counts['min_count']
+            if counts.get('max_count') is not None:
+                upper[k] = min(counts['max_count'], total_players)
+
+        eligible = self.position_codes >= 0
+        eligible[list(exclude_ids)] = False
+        force_ids = list(dict.fromkeys(force_ids))
+        forced_teams = self.team_codes[force_ids]
+        if not eligible[force_ids].all() or len(set(forced_teams)) < len(forced_teams):
+            return self._infeasible()
+
+        cost_units, budget_max, budget_min = self._budget_grid(constraints, total_players)
+        self._budgeted = budget_max is not None
+
+        if self._budgeted:
+            candidates_by_team = [
+                self._pareto_frontier(rows[eligible[rows]], points, cost_units)
+                for rows in self.team_rows
+            ]
+        else:
+            candidates_by_team = self._best_per_team_position(eligible, points)
+        for row, team in zip(force_ids, forced_teams):
+            candidates_by_team[team] = [row]
+
+        # One DP dimension per position count, one for the captain flag and,
+        # when a budget binds, one for spend on the cost grid
+        shape = tuple(upper + 1) + (2,)
+        if self._budgeted:
+            shape += (budget_max + 1,)
+        dp = np.full(shape, -np.inf)
+        dp[(0,) * len(shape)] = 0.0
+
+        choices = []
+        forced_team_set = set(forced_teams.tolist())
+        for team, candidates in enumerate(candidates_by_team):
+            # Option 0 is "no player from this club", unless a player is forced.
+            # Every option writes its transition into its own layer and the
+            # club's new DP table is the max over layers.
+            options = [None] + [(row, captain) for row in candidates for captain in (False, True)]
+            layers = np.full((len(options),) + shape, -np.inf)
+            if team not in forced_team_set:
+                layers[0] = dp
+            for k in range(1, len(options)):
+                self._relax(dp, layers[k], *options[k], points, cost_units)
+            choices.append((options, layers.argmax(axis=0)))
+            dp = layers.max(axis=0)
+
+        # Only terminal states meeting every count, captain and budget bound are valid
+        counts = np.indices(shape[:len(POSITIONS)])
+        valid = counts.sum(axis=0) == total_players
+        for k in range(len(POSITIONS)):
+            valid &= counts[k] >= lower[k]
+        if self._budgeted:
+            valid = valid[..., None] & (np.arange(budget_max + 1) >= budget_min)
+            terminal = np.where(valid, dp[..., 1, :], -np.inf)
+        else:
+            terminal = np.where(valid, dp[..., 1], -np.inf)
+
+        best = np.unravel_index(np.argmax(terminal), terminal.shape)
+        if not np.isfinite(terminal[best]):
+            return self._infeasible()
+
+        self.objective_value = float(terminal[best])
+        self._backtrack(choices, best, cost_units)
+        return True
+
+    def _budget_grid(self, constraints, total_players):
+        """
+        Discretise costs and budget bounds, dropping the cost axis when it cannot bind.
+
+        Returns:
+            tuple: (cost_units, budget_max, budget_min) on a grid reduced by the
+                common divisor of all prices; budget_max is None when unconstrained.
+        """
+        budget_max = constraints.get('budget_max')
+        budget_min = constraints.get('budget_min') or 0
+        max_spend = total_players * int(self.cost_units.max(initial=0))
+        if budget_max is not None:
+            budget_max = int(np.floor(budget_max * COST_UNITS_PER_MILLION + 1e-9))
+        if (budget_max is None or budget_max >= max_spend) and budget_min <= 0:
+            return self.cost_units, None, 0
+
+        budget_max = min(budget_max if budget_max is not None else max_spend, max_spend)
+        budget_min = int(np.ceil(budget_min * COST_UNITS_PER_MILLION - 1e-9))
+
+        # Shrink the grid by the common divisor of prices (typically 0.5m steps)
+        step = max(gcd(*self.cost_units.tolist()), 1)
+        cost_units = self.cost_units // step
+        return cost_units, budget_max // step, -(-budget_min // step)
+
+    def _best_per_team_position(self, eligible, points):
+        """
+        Find the highest-scoring eligible player per (club, position) in one sort.
+
+        Without a budget no other player from a club can ever be picked.
+
+        Returns:
+            list[np.ndarray]: Candidate row positions for each club.
+        """
+        rows = np.flatnonzero(eligible)
+        key = self.team_codes[rows] * len(POSITIONS) + self.position_codes[rows]
+        order = np.lexsort((-points[rows], key))
+        rows, key = rows[order], key[order]
+        best = rows[np.r_[True, key[1:] != key[:-1]]] if len(rows) else rows
+        bounds = np.searchsorted(self.team_codes[best], np.arange(1, len(self.teams)))
+        return [list(group) for group in np.split(best, bounds)]
+
+    def _pareto_frontier(self, rows, points, cost_units):
+        """
+        Reduce a club's eligible players to each position's cost/points Pareto frontier.
+
+        Under a budget a player is only worth considering if they outscore every
+        cheaper player in the same club and position.
+
+        Returns:
+            list[int]: Candidate row positions for the club.
+        """
+        keep = []
+        for position in range(len(POSITIONS)):
+            group = rows[self.position_codes[rows] == position]
+            # Sort by cost ascending, then points descending
+            group = group[np.lexsort((-points[group], cost_units[group]))]
+            best_so_far = -np.inf
+            for row in group:
+                if points[row] > best_so_far:
+                    keep.append(row)
+                    best_so_far = points[row]
+        return keep
+
+    def _relax(self, dp, layer, row, captain, points, cost_units):
+        """Write the (player, captain) transition from dp into one option layer."""
+        position = self.position_codes[row]
+        value = points[row] * (2 if captain else 1)
+
+        src = [slice(None)] * dp.ndim
+        dst = [slice(None)] * dp.ndim
+        src[position] = slice(0, dp.shape[position] - 1)
+        dst[position] = slice(1, dp.shape[position])
+        if captain:
+            src[len(POSITIONS)] = 0
+            dst[len(POSITIONS)] = 1
+        if self._budgeted:
+            cost = cost_units[row]
+            if cost >= dp.shape[-1]:
+                return
+            src[-1] = slice(0, dp.shape[-1] - cost)
+            dst[-1] = slice(cost, dp.shape[-1])
+
+        layer[tuple(dst)] = dp[tuple(src)] + value
+
+    def _backtrack(self, choices, state, cost_units):
+        """Walk the per-club argmax tables backwards from the best terminal state."""
+        state = list(state[:len(POSITIONS)]) + [1] + list(state[len(POSITIONS):])
+        self.lineup_rows = []
+        self.captain_row = None
+        for options, choice in reversed(choices):
+            option = options[choice[tuple(state)]]
+            if option is None:
+                continue
+            row, captain = option
+            self.lineup_rows.append(row)
+            state[self.position_codes[row]] -= 1
+            if captain:
+                self.captain_row = row
+                state[len(POSITIONS)] = 0
+            if self._budgeted:
+                state[-1] -= cost_units[row]
+        self.lineup_rows.reverse()
+
+    def _infeasible(self):
+        self.lineup_rows = []
+        self.captain_row = None
+        self.objective_value = None
+        return False
+
+    @property
+    def status(self):
+        """'Optimal' after a feasible solve, 'Infeasible' otherwise, matching the MILP's status strings."""
+        return 'Optimal' if self.objective_value is not None else 'Infeasible'
+
+    def print_players_by_position(self):
+        if self.objective_value is None:
+            self.selected_players = {}
+            self.total_points, self.total_cost = None, None
+            print("\nInfeasible: no lineup satisfies the constraints.")
+            return
+        index = self.projections_data.index
+        lineup_rows = [index[i] for i in self.lineup_rows]
+        captain_rows = {index[self.captain_row]} if self.captain_row is not None else set()
+        self.selected_players = build_selected_players(self.projections_data, lineup_rows, captain_rows)
+        self.total_points, self.total_cost = print_selected_players(self.selected_players)
+
+
+def solve_lineup(gameweek, projections_data, constraints, problem_name, exclude_ids=(), force_ids=(), backend='cbc'):
+    """
+    Solve a gameweek with the club DP when the constraints fit, otherwise with the MILP.
+
+    Args:
+        gameweek (int): Gameweek being solved.
+        projections_data (pd.DataFrame): Player projections with ID, Name, Team,
+            Position, Cost and Predicted_Points columns.
+        constraints (dict): Gameweek block from constraints.yaml.
+        problem_name (str): Model name used if the MILP fallback is taken.
+        exclude_ids (Iterable[int]): Row positions of banned players.
+        force_ids (Iterable[int]): Row positions of players that must be selected.
+        backend (str): MILP backend for the fallback ('cbc' or 'highs').
+
+    Returns:
+        ClubDPOptimiser | FPLChallengeOptimiser: The solved engine. Call
+            print_players_by_position() to populate selected_players.
+    """
+    engine = ClubDPOptimiser(gameweek, projections_data)
+    if engine.supports(constraints):
+        engine.solve(constraints, exclude_ids, force_ids)
+        print(f"Status: {engine.status} (club DP)")
+        return engine
+
+    solver = FPLChallengeOptimiser(gameweek, projections_data, backend=backend)
+    solver.setup_problem(problem_name)
+    solver.exclude_players_constraint(exclude_ids)
+    solver.force_players_constraint(force_ids)
+    solver.apply_constraints(constraints)
+    solver.solve()
+    return solver
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from utils.api import fetch_bootstrap
+
+
+class RunContext:
+    """
+    Data shared by every rule and helper in one run.
+
+    The FPL Challenge bootstrap-static payload is fetched once on first use
+    (through the shared HTTP cache) and its elements are parsed once into a
+    column-oriented frame indexed by element ID. Rules read player attributes
+    by aligning on ID instead of downloading and re-parsing the payload.
+
+    Typical use from a gameweek script:
+
+        context = RunContext()
+        projections = gw35_rules(projections, context)
+    """
+
+    def __init__(self, bootstrap: dict | None = None):
+        """
+        Args:
+            bootstrap (dict, optional): An already fetched bootstrap-static
+                payload. Fetched lazily when omitted.
+        """
+        self._bootstrap = bootstrap
+        self._elements = None
+
+    @property
+    def bootstrap(self) -> dict:
+        """The bootstrap-static payload, fetched on first access."""
+        if self._bootstrap is None:
+            self._bootstrap = fetch_bootstrap()
+        return self._bootstrap
+
+    @property
+    def events(self) -> list[dict]:
+        return self.bootstrap['events']
+
+    @property
+    def elements(self) -> pd.DataFrame:
+        """All bootstrap elements as one frame indexed by element ID."""
+        if self._elements is None:
+            self._elements = pd.DataFrame(self.bootstrap['elements']).set_index('id')
+        return self._elements
+
+    def element_columns(self, ids, columns: list[str]) -> pd.DataFrame:
+        """
+        Look up element attributes for a sequence of player IDs.
+
+        Args:
+            ids (pd.Series | array-like): FPL element IDs, e.g. projections['ID'].
+            columns (list[str]): Element fields, e.g. ['minutes', 'goals_scored'].
+
+        Returns:
+            pd.DataFrame: One row per ID in the given order, sharing the index of
+                `ids` when it is a Series (a RangeIndex otherwise). Unknown IDs
+                give NaN.
+        """
+        frame = self.elements[columns].reindex(np.asarray(ids))
+        frame.index = ids.index if isinstance(ids, pd.Series) else pd.RangeIndex(len(frame))
+        return frame
+
+    def element_column(self, ids, column: str) -> pd.Series:
+        """Single-column form of element_columns."""
+        return self.element_columns(ids, [column])[column]
@@ -3,65 +3,97 @@ import os
 import json
 from collections import defaultdict
 import numpy as np
-
-
-SEASONS_REGISTRY = os.path.join('site', 'data', 'seasons.json')
+from utils.site import write_season_site
+from utils.store import LineupStore
+from utils.trace import traced
 
 
 def ensure_season_in_registry(season: str) -> None:
     """
     Guarantee that a season is present in site/data/seasons.json.
 
-    Reads the existing registry, appends the season if absent, sorts the list
-    chronologically and writes it back. A missing registry file is created
-    automatically.
+    The registry is updated through the season's LineupStore under a
+    registry-wide file lock, so concurrent runs, for the same season or
+    different ones, cannot drop each other's seasons. Saving lineups registers the season on its own; this is for
+    season data written outside the store, such as challenges.json.
 
     Args:
         season: Season string in YYYY-YY format (e.g. '2025-26').
     """
-    os.makedirs(os.path.dirname(SEASONS_REGISTRY), exist_ok=True)
+    with LineupStore(season) as store:
+        store.register_season()
+
 
-    if os.path.exists(SEASONS_REGISTRY):
-        with open(SEASONS_REGISTRY, 'r', encoding='utf-8') as f:
-            raw = f.read().strip()
-        seasons: list[str] = json.loads(raw) if raw else []
-    else:
-        seasons = []
+def write_json_atomic(path: str, data) -> None:
+    """
+    Write JSON through a temporary file and rename it into place.
 
-    if season not in seasons:
-        seasons.append(season)
-        seasons.sort()
-        with open(SEASONS_REGISTRY, 'w', encoding='utf-8') as f:
-            json.dump(seasons, f, indent=4, ensure_ascii=False)
-        print(f"Season {season} added to {SEASONS_REGISTRY}")
+    Readers (the site, a concurrent run) see either the old file or the new
+    one, never a partial write.
 
+    Args:
+        path (str): Destination file; parent directories are created.
+        data: JSON-serialisable object.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=4, ensure_ascii=False)
+    os.replace(tmp_path, path)
 
+
+@traced()
 def save_projections(df, season, gameweek):
     projections_path = os.path.join(season, 'data', 'projections', f'gw{gameweek}.csv')
-    if not os.path.exists(os.path.dirname(projections_path)):
-        os.makedirs(os.path.dirname(projections_path))
-    
-    df.to_csv(projections_path, index=False)
+    os.makedirs(os.path.dirname(projections_path), exist_ok=True)
+
+    tmp_path = f'{projections_path}.{os.getpid()}.tmp'
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, projections_path)
     print(f"Projections saved to {projections_path}")
 
-def save_optimal_prediction(lineup_prediction, season, gameweek):
-    proceed = input(f"Save optimal prediction to {season}/data/lineups/predicted_optimal.json? (y/n): ")
-    if proceed.lower() != 'y':
-        return
-    
-    optimal_prediction_path = os.path.join(season, 'data', 'lineups', 'predicted_optimal.json')
-    
-    # Ensure directory exists
-    if not os.path.exists(os.path.dirname(optimal_prediction_path)):
-        os.makedirs(os.path.dirname(optimal_prediction_path))
-    
-    # Load existing data if file exists
-    if os.path.exists(optimal_prediction_path):
-        with open(optimal_prediction_path, 'r') as f:
-            all_gameweeks = json.load(f)
-    else:
-        all_gameweeks = {}
-    
+
+@traced()
+def update_lineups(filename, season, records, extras=None):
+    """
+    Store per-gameweek records in the lineup store and re-export the lineups JSON.
+
+    Records are written to the season's LineupStore in one transaction, so
+    concurrent runs cannot lose each other's gameweeks. The JSON file, its
+    site mirror and the season's site index and shards are regenerated only
+    if the stored content changed.
+
+    Args:
+        filename (str): File under {season}/data/lineups/, e.g. 'predicted_optimal.json'.
+        season (str): Season string in YYYY-YY format (e.g. '2025-26').
+        records (dict): Gameweek -> record to store under that gameweek.
+        extras (dict, optional): Top-level keys placed after the gameweeks,
+            e.g. {'total_players': n}; None values keep what is stored.
+
+    Returns:
+        str: Path of the season data file.
+    """
+    with LineupStore(season) as store:
+        store.put(filename, records, extras)
+        if store.export((filename,)):
+            write_season_site(season)
+        else:
+            print(f"{filename} unchanged at {store.season_path(filename)}")
+        return store.season_path(filename)
+
+def build_lineup_record(lineup_prediction):
+    """
+    Convert a solver lineup into the JSON record stored per gameweek.
+
+    NumPy scalars are converted to plain Python types and the captain's
+    Predicted_Points are doubled so totals match the site's expectations.
+
+    Args:
+        lineup_prediction (dict): Position-keyed lineup from the solver.
+
+    Returns:
+        dict: Record with Players, Total_Cost and Total_Points keys.
+    """
     def convert_player(player: dict) -> dict:
         result = {}
         for k, v in player.items():
@@ -86,32 +118,56 @@ def save_optimal_prediction(lineup_prediction, season, gameweek):
     total_cost = sum(player['Cost'] for players in converted_prediction.values() for player in players)
     total_points = sum(player['Predicted_Points'] for players in converted_prediction.values() for player in players)
     
-    # Prepare data for this gameweek
-    gw_data = {
+    return {
         'Players': converted_prediction,
         'Total_Cost': round(total_cost, 1), 
         'Total_Points': round(total_points, 2)
     }
-    
-    # Update or add gameweek
-    all_gameweeks[str(gameweek)] = gw_data
-    
-    # Ensure sort by gameweek
-    all_gameweeks = dict(sorted(all_gameweeks.items(), key=lambda x: int(x[0])))
-    
-    # Save back to JSON with encoding
-    with open(optimal_prediction_path, 'w', encoding='utf-8') as f:
-        json.dump(all_gameweeks, f, indent=4, ensure_ascii=False)
 
-    print(f"Optimal prediction saved to {optimal_prediction_path}")
+def build_pool_record(pool):
+    """Convert a ranked top-k pool from solve_top_k into its stored JSON form."""
+    return [
+        {'Rank': entry['Rank'], **build_lineup_record(entry['Players'])}
+        for entry in pool
+    ]
 
-    # Mirror to the site data directory for the frontend
-    site_path = os.path.join('site', 'data', season, 'predicted_optimal.json')
-    os.makedirs(os.path.dirname(site_path), exist_ok=True)
-    with open(site_path, 'w', encoding='utf-8') as f:
-        json.dump(all_gameweeks, f, indent=4, ensure_ascii=False)
 
-    print(f"Optimal prediction mirrored to {site_path}")
+@traced()
+def save_optimal_prediction(lineup_prediction, season, gameweek, confirm=True):
+    """
+    Save a gameweek's lineup to predicted_optimal.json and the site mirror.
 
-    ensure_season_in_registry(season)
-   
\ No newline at end of file
+    Args:
+        lineup_prediction (dict): Position-keyed lineup from the solver.
+        season (str): Season string in YYYY-YY format (e.g. '2025-26').
+        gameweek (int): Gameweek the lineup was solved for.
+        confirm (bool, optional): Ask before saving. Defaults to True; batch
+            runs pass False.
+
+    Returns:
+        bool: Whether the lineup was saved.
+    """
+    if confirm:
+        proceed = input(f"Save optimal prediction to {season}/data/lineups/predicted_optimal.json? (y/n): ")
+        if proceed.lower() != 'y':
+            return False
+
+    update_lineups('predicted_optimal.json', season, {gameweek: build_lineup_record(lineup_prediction)})
+    return True
+
+
+@traced()
+def save_prediction_pool(pool, season, gameweek):
+    """
+    Save the ranked top-k lineup pool for a gameweek next to predicted_optimal.json.
+
+    The pool is written to {season}/data/lineups/predicted_pool.json keyed by
+    gameweek and mirrored to site/data/{season}/ so the site can show
+    alternatives to the predicted optimal lineup.
+
+    Args:
+        pool (list[dict]): Ranked lineups from FPLChallengeOptimiser.solve_top_k.
+        season (str): Season string in YYYY-YY format (e.g. '2025-26').
+        gameweek (int): Gameweek the pool was solved for.
+    """
+    update_lineups('predicted_pool.json', season, {gameweek: build_pool_record(pool)})
@@ -1,4 +1,47 @@
-from fuzzywuzzy import process
+from utils.trace import traced
+
+def select_player(df, search_name, action):
+    """
+    Fuzzy-match a name against the projections and let the user pick one match.
+
+    Args:
+        df (pd.DataFrame): Player projections with Name and ID columns.
+        search_name (str): Name typed by the user.
+        action (str): Verb shown in the prompt, e.g. 'ban' or 'force'.
+
+    Returns:
+        int | None: Index label of the chosen player, or None if nothing was chosen.
+    """
+    from fuzzywuzzy import process
+
+    # Perform fuzzy matching with a lower score cutoff and no player limit
+    matches = process.extractBests(search_name, df['Name'].tolist(), score_cutoff=50)
+    
+    if not matches:
+        print("No matches found. Please try again.")
+        return None
+    
+    # Display matches
+    print("Matches found:")
+    for idx, (name, score) in enumerate(matches, 1):
+        player_index = df[df['Name'] == name].index[0]
+        player_id = df.loc[player_index, 'ID']
+        print(f"{idx}. {name} (ID: {player_id}, Index: {player_index}, Score: {score})")
+    
+    # Ask user to select a match
+    while True:
+        choice = input(f"Enter the number of the player to {action} (or 'skip' to search again): ")
+        if choice.lower() == 'skip':
+            return None
+        try:
+            choice_idx = int(choice) - 1
+            if 0 <= choice_idx < len(matches):
+                selected_name = matches[choice_idx][0]
+                return df[df['Name'] == selected_name].index[0]
+            else:
+                print("Invalid choice. Please try again.")
+        except ValueError:
+            print("Invalid input. Please enter a number or 'skip'.")
 
 def ban_players(df):
     ban_ids = []
@@ -8,38 +51,10 @@ def ban_players(df):
         if search_name.lower() == '':
             break
         
-        # Perform fuzzy matching with a lower score cutoff and no player limit
-        matches = process.extractBests(search_name, df['Name'].tolist(), score_cutoff=50)
-        
-        if not matches:
-            print("No matches found. Please try again.")
-            continue
-        
-        # Display matches
-        print("Matches found:")
-        for idx, (name, score) in enumerate(matches, 1):
-            player_index = df[df['Name'] == name].index[0]
-            player_id = df.loc[player_index, 'ID']
-            print(f"{idx}. {name} (ID: {player_id}, Index: {player_index}, Score: {score})")
-        
-        # Ask user to select a match
-        while True:
-            choice = input("Enter the number of the player to ban (or 'skip' to search again): ")
-            if choice.lower() == 'skip':
-                break
-            try:
-                choice_idx = int(choice) - 1
-                if 0 <= choice_idx < len(matches):
-                    selected_name = matches[choice_idx][0]
-                    selected_index = df[df['Name'] == selected_name].index[0]
-                    selected_id = df.loc[selected_index, 'ID']
-                    ban_ids.append(selected_index)
-                    print(f"Banned: {selected_name} (ID: {selected_id}, Index: {selected_index})")
-                    break
-                else:
-                    print("Invalid choice. Please try again.")
-            except ValueError:
-                print("Invalid input. Please enter a number or 'skip'.")
+        selected_index = select_player(df, search_name, 'ban')
+        if selected_index is not None:
+            ban_ids.append(selected_index)
+            print(f"Banned: {df.loc[selected_index, 'Name']} (ID: {df.loc[selected_index, 'ID']}, Index: {selected_index})")
     
     return ban_ids
 
@@ -51,41 +66,14 @@ def force_players(df, force_ids):
         if search_name.lower() == '':
             break
         
-        # Perform fuzzy matching with a lower score cutoff and no limit
-        matches = process.extractBests(search_name, df['Name'].tolist(), score_cutoff=50)
-        
-        if not matches:
-            print("No matches found. Please try again.")
-            continue
-        
-        # Display matches
-        print("Matches found:")
-        for idx, (name, score) in enumerate(matches, 1):
-            player_index = df[df['Name'] == name].index[0]
-            player_id = df.loc[player_index, 'ID']
-            print(f"{idx}. {name} (ID: {player_id}, Index: {player_index}, Score: {score})")
-        
-        # Ask user to select a match
-        while True:
-            choice = input("Enter the number of the player to force (or 'skip' to search again): ")
-            if choice.lower() == 'skip':
-                break
-            try:
-                choice_idx = int(choice) - 1
-                if 0 <= choice_idx < len(matches):
-                    selected_name = matches[choice_idx][0]
-                    selected_index = df[df['Name'] == selected_name].index[0]
-                    selected_id = df.loc[selected_index, 'ID']
-                    force_ids.append(selected_index)  # Add to force_ids instead of ban_ids
-                    print(f"Forced: {selected_name} (ID: {selected_id}, Index: {selected_index})")
-                    break
-                else:
-                    print("Invalid choice. Please try again.")
-            except ValueError:
-                print("Invalid input. Please enter a number or 'skip'.")
+        selected_index = select_player(df, search_name, 'force')
+        if selected_index is not None:
+            force_ids.append(selected_index)
+            print(f"Forced: {df.loc[selected_index, 'Name']} (ID: {df.loc[selected_index, 'ID']}, Index: {selected_index})")
     
     return force_ids
 
+@traced()
 def run_ban_force(df):
     should_ban = input("Do you want to ban players? (yes/no): ").strip().lower()
     if should_ban == 'yes':
@@ -0,0 +1,146 @@
+import glob
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+
+from utils.api import fetch_bootstrap, get_finished_gameweeks
+from utils.trace import traced
+
+# Season directory this package belongs to, e.g. '2025-26'
+SEASON = os.path.abspath(__file__).split(os.sep)[-3]
+
+LEAGUE = 'ENG-Premier League'
+
+# Root of the on-disk cache; one subdirectory per league and season
+FBREF_CACHE_DIR = os.environ.get('FPL_FBREF_CACHE_DIR', os.path.join('.cache', 'fbref'))
+
+# Stat types scraped at once; each worker drives its own FBref reader
+MAX_WORKERS = 4
+
+# Pseudo stat type for the per-shot event table (read_shot_events)
+SHOT_EVENTS = 'shot_events'
+
+
+def season_key(season: str) -> str:
+    """Normalise an FBref season ('24-25', '2425', '2024-2025') to 'YYYY' digits, e.g. '2425'."""
+    digits = re.sub(r'\D', '', str(season))
+    if len(digits) == 8:
+        digits = digits[2:4] + digits[6:8]
+    elif len(digits) == 6:
+        digits = digits[2:]
+    return digits
+
+
+def flatten_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reset the index and join MultiIndex column levels with '_'.
+
+    ('Playing Time', 'Min') becomes 'Playing Time_Min' and ('player', '')
+    becomes 'player'.
+    """
+    df = df.reset_index()
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = ['_'.join(str(level) for level in col).strip('_') for col in df.columns]
+    return df
+
+
+def _freshness_stamp(season: str) -> str:
+    """
+    Return the cache stamp for a season's stats.
+
+    Past seasons never change and are stamped 'final'. The current season is
+    stamped with the latest finished gameweek, so it is re-scraped once per
+    gameweek. Returns '' if the gameweek cannot be determined.
+    """
+    if season_key(season) != season_key(SEASON):
+        return 'final'
+    try:
+        finished = get_finished_gameweeks(fetch_bootstrap()['events'])
+    except (requests.RequestException, ValueError, KeyError) as exc:
+        print(f"  Could not determine the current gameweek for FBref freshness: {exc}")
+        return ''
+    return f'gw{finished[-1] if finished else 0}'
+
+
+def _cache_path(season: str, stat_type: str, stamp: str) -> str:
+    league = re.sub(r'\W+', '_', LEAGUE).strip('_')
+    return os.path.join(FBREF_CACHE_DIR, league, season_key(season), f'{stat_type}.{stamp}.pkl')
+
+
+def _scrape(season: str, stat_type: str, no_cache: bool) -> pd.DataFrame:
+    """Scrape one stat type from FBref and flatten it."""
+    # soccerdata pulls in selenium and a Chrome driver; import it only to scrape
+    import soccerdata as sd
+
+    fbref = sd.FBref(leagues=[LEAGUE], seasons=[season_key(season)], no_cache=no_cache)
+    if stat_type == SHOT_EVENTS:
+        return flatten_columns(fbref.read_shot_events())
+    return flatten_columns(fbref.read_player_season_stats(stat_type=stat_type))
+
+
+@traced()
+def load_stats(stat_types: list[str], season: str = SEASON) -> dict[str, pd.DataFrame]:
+    """
+    Load FBref Premier League stats, scraping only what the cache lacks.
+
+    Each stat type is cached as a pickled, flattened DataFrame under
+    FBREF_CACHE_DIR. Current-season stats are refreshed once per finished
+    gameweek; past seasons are scraped once. Missing stat types are scraped
+    concurrently, each with its own FBref reader. If the current gameweek
+    cannot be determined, the most recent cached copy is reused.
+
+    Args:
+        stat_types (list[str]): FBref season stat types, e.g. 'standard',
+            'passing', 'misc', or SHOT_EVENTS for the per-shot table.
+        season (str, optional): FBref season, e.g. '2526' or '24-25'.
+            Defaults to the current season.
+
+    Returns:
+        dict[str, pd.DataFrame]: Stat type -> flattened DataFrame with the
+            index reset and MultiIndex columns joined by '_'.
+    """
+    stat_types = list(dict.fromkeys(stat_types))
+    stamp = _freshness_stamp(season)
+    frames = {}
+    missing = []
+    for stat_type in stat_types:
+        path = _cache_path(season, stat_type, stamp)
+        if not stamp:
+            cached = sorted(glob.glob(_cache_path(season, stat_type, '*')), key=os.path.getmtime)
+            path = cached[-1] if cached else None
+        if path and os.path.exists(path):
+            frames[stat_type] = pd.read_pickle(path)
+        else:
+            missing.append(stat_type)
+
+    if missing:
+        print(f"  Scraping FBref {', '.join(missing)} for {season} ({len(missing)} concurrent)...")
+        no_cache = stamp != 'final'
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(missing))) as executor:
+            scraped = dict(zip(missing, executor.map(lambda s: _scrape(season, s, no_cache), missing)))
+        for stat_type, df in scraped.items():
+            frames[stat_type] = df
+            if stamp:
+                _store(df, season, stat_type, stamp)
+
+    return {stat_type: frames[stat_type] for stat_type in stat_types}
+
+
+def load_stat(stat_type: str, season: str = SEASON) -> pd.DataFrame:
+    """Load a single stat type; see load_stats."""
+    return load_stats([stat_type], season)[stat_type]
+
+
+def _store(df: pd.DataFrame, season: str, stat_type: str, stamp: str) -> None:
+    """Write a frame atomically and drop copies with older stamps."""
+    path = _cache_path(season, stat_type, stamp)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+    for old_path in glob.glob(_cache_path(season, stat_type, '*')):
+        if old_path != path:
+            os.remove(old_path)
@@ -0,0 +1,358 @@
+import json
+import os
+
+import numpy as np
+
+from utils.api import fetch_bootstrap, fetch_live, get_completed_gameweeks, get_finished_gameweeks
+from utils.trace import traced
+
+# Root of the on-disk store; one subdirectory per season
+HISTORY_DIR = os.environ.get('FPL_HISTORY_DIR', os.path.join('.cache', 'history'))
+
+# Columns are addressed directly by gameweek number (column 0 is unused)
+MAX_GAMEWEEKS = 38
+
+# Rows are addressed directly by FPL element ID; the store grows past this on demand
+INITIAL_PLAYER_CAPACITY = 1024
+
+# Per-player counts kept beside the stat arrays
+FIXTURES = '_fixtures'
+APPEARANCES = '_appearances'
+
+
+def season_from_events(events: list) -> str:
+    """
+    Derive the season string (e.g. '2025-26') from bootstrap-static events.
+
+    Args:
+        events: List of event dicts from the bootstrap-static payload.
+
+    Returns:
+        str: Season in YYYY-YY format, based on the first deadline's year.
+    """
+    start = int(events[0]['deadline_time'][:4])
+    return f'{start}-{str(start + 1)[-2:]}'
+
+
+def _as_number(value):
+    """Return value as a float if it is numeric (live payloads send some stats as strings)."""
+    if isinstance(value, (bool, int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def parse_live_payload(live_payload: dict) -> tuple[np.ndarray, dict, np.ndarray, np.ndarray]:
+    """
+    Flatten one event/{gw}/live payload into per-player columns.
+
+    Fixture and appearance counts come from each element's explain list (one
+    entry per fixture, with the minutes played); when explain lists no minutes
+    the gameweek minutes stand in for a single appearance.
+
+    Args:
+        live_payload: Live endpoint payload for one gameweek.
+
+    Returns:
+        tuple: (player_ids, stats, fixtures, appearances) where stats maps stat
+            name -> array aligned with player_ids.
+    """
+    elements = live_payload.get('elements', [])
+    player_ids = np.array([el['id'] for el in elements], dtype=np.int64)
+    stats: dict[str, np.ndarray] = {}
+    fixtures = np.zeros(len(elements), dtype=np.int16)
+    appearances = np.zeros(len(elements), dtype=np.int16)
+
+    for r, el in enumerate(elements):
+        for key, value in el.get('stats', {}).items():
+            number = _as_number(value)
+            if number is None:
+                continue
+            if key not in stats:
+                stats[key] = np.zeros(len(elements), dtype=np.float32)
+            stats[key][r] = number
+
+        explain = el.get('explain') or []
+        fixtures[r] = len(explain)
+        appearances[r] = sum(
+            1 for fixture in explain
+            if any(s.get('identifier') == 'minutes' and s.get('value', 0) > 0 for s in fixture.get('stats', []))
+        )
+        if _as_number(el.get('stats', {}).get('minutes', 0)) and appearances[r] == 0:
+            fixtures[r] = max(fixtures[r], 1)
+            appearances[r] = 1
+
+    return player_ids, stats, fixtures, appearances
+
+
+class HistoryStore:
+    """
+    Persistent season history on memory-mapped NumPy arrays.
+
+    One .npy file per stat holds a (player ID x gameweek) matrix of gameweek
+    totals, addressed directly by element ID and gameweek number. Two count
+    arrays sit beside them: finished fixtures per gameweek (2 in a double
+    gameweek) and appearances (fixtures with minutes > 0). A gameweek is
+    written once its fixtures finish and rewritten at most once more, when
+    FPL marks its data checked (bonus and minutes corrections land then);
+    meta.json records which gameweeks are stored and which are final.
+
+    Reducers work on every requested player at once:
+        mean_per_appearance   sum(stat) / appearances
+        per_90                sum(stat) / minutes * 90
+        proportion            share of gameweeks meeting a boolean condition
+        rolling_mean_per_appearance
+                              per-appearance mean over trailing windows
+
+    Stats are gameweek totals, so means per appearance are exact even across
+    double gameweeks, while per-match conditions (e.g. bonus == 3) can only be
+    tested per gameweek.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._arrays: dict[str, np.memmap] = {}
+        meta_path = os.path.join(path, 'meta.json')
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        else:
+            meta = {}
+        self.gameweeks: list[int] = meta.get('gameweeks', [])
+        # Gameweeks stored after data_checked; the rest may still hold provisional stats
+        self.checked: list[int] = meta.get('checked', [])
+        self.stats: list[str] = meta.get('stats', [])
+        self.capacity: int = meta.get('capacity', INITIAL_PLAYER_CAPACITY)
+
+    # -- writing -----------------------------------------------------------------
+
+    def append_gameweek(self, gameweek: int, live_payload: dict, checked: bool = True) -> bool:
+        """
+        Store one finished gameweek's live payload.
+
+        Args:
+            gameweek: Gameweek number (1-38).
+            live_payload: event/{gw}/live payload for that gameweek.
+            checked: Whether FPL has marked the gameweek's data checked. An
+                unchecked gameweek is replaced by its next checked append.
+
+        Returns:
+            bool: False if the gameweek was already stored and nothing was
+                written (it is final, or the new payload is not checked either).
+        """
+        if gameweek in self.gameweeks and (gameweek in self.checked or not checked):
+            return False
+
+        player_ids, stats, fixtures, appearances = parse_live_payload(live_payload)
+        if len(player_ids) and player_ids.max() >= self.capacity:
+            self._grow(int(player_ids.max()) + 1)
+
+        columns = {FIXTURES: fixtures, APPEARANCES: appearances, **stats}
+        for name, values in columns.items():
+            array = self._array(name, writable=True)
+            array[:, gameweek] = 0
+            array[player_ids, gameweek] = values
+            array.flush()
+            if name not in self.stats and not name.startswith('_'):
+                self.stats.append(name)
+
+        # Recorded last, so an interrupted append is simply redone next time
+        self.gameweeks = sorted(set(self.gameweeks) | {gameweek})
+        if checked:
+            self.checked = sorted(set(self.checked) | {gameweek})
+        self._write_meta()
+        return True
+
+    def _file(self, name):
+        return os.path.join(self.path, f'{name}.npy')
+
+    def _array(self, name, writable=False):
+        """Open (or create zero-filled) the memory-mapped matrix for a stat."""
+        array = self._arrays.get(name)
+        if array is not None and (not writable or array.mode == 'r+'):
+            return array
+
+        file = self._file(name)
+        if os.path.exists(file):
+            array = np.load(file, mmap_mode='r+' if writable else 'r')
+        elif writable:
+            os.makedirs(self.path, exist_ok=True)
+            dtype = np.int16 if name.startswith('_') else np.float32
+            array = np.lib.format.open_memmap(file, mode='w+', dtype=dtype, shape=(self.capacity, MAX_GAMEWEEKS + 1))
+        else:
+            return None
+        self._arrays[name] = array
+        return array
+
+    def _grow(self, min_capacity):
+        """Re-allocate every array with room for higher element IDs."""
+        capacity = max(min_capacity, self.capacity * 2)
+        for name in [FIXTURES, APPEARANCES] + self.stats:
+            old = self._array(name)
+            if old is None:
+                continue
+            data = np.array(old)
+            self._arrays.pop(name, None)
+            del old
+            grown = np.lib.format.open_memmap(
+                self._file(name), mode='w+', dtype=data.dtype, shape=(capacity, MAX_GAMEWEEKS + 1)
+            )
+            grown[:len(data)] = data
+            grown.flush()
+            self._arrays[name] = grown
+        self.capacity = capacity
+        self._write_meta()
+
+    def _write_meta(self):
+        os.makedirs(self.path, exist_ok=True)
+        meta_path = os.path.join(self.path, 'meta.json')
+        tmp_path = f'{meta_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'gameweeks': self.gameweeks, 'checked': self.checked, 'stats': self.stats,
+                       'capacity': self.capacity}, f, indent=4)
+        os.replace(tmp_path, meta_path)
+
+    # -- reading -----------------------------------------------------------------
+
+    def _take(self, name, ids, window):
+        """Rows for ids over the stored (optionally trailing-window) gameweeks; zeros when unknown."""
+        ids = np.asarray(ids, dtype=np.int64)
+        columns = self.gameweeks[-window:] if window else self.gameweeks
+        array = self._array(name)
+        if array is None or not columns:
+            return np.zeros((len(ids), len(columns)), dtype=np.float32)
+        known = (ids >= 0) & (ids < len(array))
+        out = np.asarray(array[np.where(known, ids, 0)][:, columns], dtype=np.float32)
+        out[~known] = 0
+        return out
+
+    def stat(self, name: str, ids, window: int | None = None) -> np.ndarray:
+        """
+        Gameweek totals of one stat, masked to gameweeks the player appeared in.
+
+        Args:
+            name: Live stat name, e.g. 'total_shots'. Unknown stats read as zero.
+            ids (Iterable[int]): FPL element IDs.
+            window (int, optional): Only the last `window` stored gameweeks.
+
+        Returns:
+            np.ndarray: Shape (len(ids), stored gameweeks).
+        """
+        return self._take(name, ids, window) * self.appeared(ids, window)
+
+    def fixture_counts(self, ids, window: int | None = None) -> np.ndarray:
+        """Finished fixtures per stored gameweek, shape (len(ids), G)."""
+        return self._take(FIXTURES, ids, window)
+
+    def appearance_counts(self, ids, window: int | None = None) -> np.ndarray:
+        """Appearances (minutes > 0) per stored gameweek, shape (len(ids), G)."""
+        return self._take(APPEARANCES, ids, window)
+
+    def appeared(self, ids, window: int | None = None) -> np.ndarray:
+        """Validity mask: finished gameweeks in which the player featured."""
+        return self.appearance_counts(ids, window) > 0
+
+    def had_fixture(self, ids, window: int | None = None) -> np.ndarray:
+        """Mask of finished gameweeks in which the player was listed for a fixture."""
+        return self.fixture_counts(ids, window) > 0
+
+    def mean_per_appearance(self, name: str, ids, window: int | None = None) -> np.ndarray:
+        """
+        Mean of a stat per appearance for every player.
+
+        Returns:
+            np.ndarray: Shape (len(ids),); 0.0 where a player has no appearances.
+        """
+        return _ratio(self.stat(name, ids, window).sum(axis=1), self.appearance_counts(ids, window).sum(axis=1))
+
+    def per_90(self, name: str, ids, window: int | None = None) -> np.ndarray:
+        """
+        Rate of a stat per 90 minutes played for every player.
+
+        Returns:
+            np.ndarray: Shape (len(ids),); 0.0 where a player has no minutes.
+        """
+        minutes = self.stat('minutes', ids, window).sum(axis=1)
+        return _ratio(self.stat(name, ids, window).sum(axis=1) * 90.0, minutes)
+
+    def proportion(self, condition: np.ndarray, ids, over: str = 'appearances', window: int | None = None) -> np.ndarray:
+        """
+        Share of gameweeks in which a boolean condition holds.
+
+        Args:
+            condition: Boolean array shaped like stat(..., ids, window).
+            ids (Iterable[int]): FPL element IDs.
+            over: 'appearances' (gameweeks the player featured in) or
+                'fixtures' (gameweeks the player was listed for a fixture).
+            window (int, optional): Only the last `window` stored gameweeks.
+
+        Returns:
+            np.ndarray: Shape (len(ids),); 0.0 where the denominator is empty.
+        """
+        mask = self.appeared(ids, window) if over == 'appearances' else self.had_fixture(ids, window)
+        return _ratio((condition & mask).sum(axis=1), mask.sum(axis=1))
+
+    def rolling_mean_per_appearance(self, name: str, ids, window: int) -> np.ndarray:
+        """
+        Per-appearance mean of a stat over a trailing window ending at each stored gameweek.
+
+        Returns:
+            np.ndarray: Shape (len(ids), stored gameweeks).
+        """
+        totals = _trailing_sum(self.stat(name, ids), window)
+        appearances = _trailing_sum(self.appearance_counts(ids), window)
+        return _ratio(totals, appearances)
+
+
+def _ratio(numerator, denominator):
+    """Elementwise numerator / denominator with 0.0 where the denominator is 0."""
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    return np.divide(numerator, denominator, out=np.zeros(np.broadcast(numerator, denominator).shape), where=denominator > 0)
+
+
+def _trailing_sum(values, window):
+    """Sum over the last `window` columns ending at each column."""
+    cumulative = np.cumsum(np.pad(values, ((0, 0), (1, 0))), axis=1, dtype=float)
+    return cumulative[:, 1:] - cumulative[:, np.maximum(np.arange(values.shape[1]) + 1 - window, 0)]
+
+
+@traced()
+def load_season_history(gameweeks: list[int] | None = None, bootstrap: dict | None = None) -> HistoryStore:
+    """
+    Open the current season's history store, appending any new finished gameweeks.
+
+    Only gameweeks missing from the store are fetched, through the shared
+    HTTP cache, so after the first run this costs one bootstrap request. A
+    finished gameweek is usable before FPL has checked its data, but one
+    stored that early is fetched again once data_checked is set, so its
+    provisional bonus and minutes are replaced by the final figures.
+
+    Args:
+        gameweeks (list[int], optional): Gameweeks that must be present.
+            Defaults to every finished gameweek in bootstrap-static.
+        bootstrap (dict, optional): Bootstrap-static payload already fetched
+            for this run (e.g. RunContext.bootstrap).
+
+    Returns:
+        HistoryStore: Store covering the requested gameweeks.
+    """
+    events = (bootstrap or fetch_bootstrap())['events']
+    if gameweeks is None:
+        gameweeks = get_finished_gameweeks(events)
+
+    store = HistoryStore(os.path.join(HISTORY_DIR, season_from_events(events)))
+    checked = set(get_completed_gameweeks(events))
+    missing = [
+        gw for gw in gameweeks
+        if gw not in store.gameweeks or (gw in checked and gw not in store.checked)
+    ]
+    if missing:
+        print(f"  Appending {len(missing)} gameweek(s) to the season history store...")
+    for gw in missing:
+        store.append_gameweek(gw, fetch_live(gw), checked=gw in checked)
+    return store
@@ -0,0 +1,412 @@
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Cache location and size bound, overridable per machine
+CACHE_DIR = os.environ.get('FPL_HTTP_CACHE_DIR', os.path.join('.cache', 'http'))
+CACHE_MAX_BYTES = int(os.environ.get('FPL_HTTP_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+
+# Seconds a cached response is served without contacting the server, matched
+# against the URL in order. Past the TTL the entry is revalidated with a
+# conditional GET, so a stale bootstrap costs a 304 rather than a re-download.
+ENDPOINT_TTLS = (
+    (re.compile(r'/bootstrap-static/'), 15 * 60),
+    (re.compile(r'/event/\d+/live/'), 5 * 60),
+    (re.compile(r'/element-summary/\d+/'), 60 * 60),
+    (re.compile(r'/entry/\d+/event/\d+/picks/'), 60 * 60),
+    (re.compile(r'/assets/[^/]+\.js$'), 24 * 60 * 60),
+)
+DEFAULT_TTL = 5 * 60
+
+# FPL hosts redirected by a client's base_url (FPL_BASE_URL for the shared
+# client), e.g. to the local stand-in served by utils/mock_api.py
+FPL_HOST_PATTERN = re.compile(r'^https?://(fplchallenge|fantasy)\.premierleague\.com')
+
+# Politeness limits for network requests (cache hits are never throttled)
+RATE_LIMIT_PER_SECOND = float(os.environ.get('FPL_HTTP_RATE', 20))
+RATE_LIMIT_BURST = 10
+POOL_SIZE = 16
+
+# Retry transient failures with exponential backoff, honouring Retry-After
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRIES = 5
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 30.0
+
+
+def rebase_url(url: str, base_url: str | None) -> str:
+    """
+    Point an FPL URL at another server, keeping its path and query.
+
+    Args:
+        url: Request URL.
+        base_url: Replacement scheme and host, e.g. 'http://127.0.0.1:8765';
+            None or '' leaves the URL unchanged.
+
+    Returns:
+        str: The rebased URL; non-FPL URLs are returned unchanged.
+    """
+    if not base_url:
+        return url
+    return FPL_HOST_PATTERN.sub(base_url.rstrip('/'), url, count=1)
+
+
+def ttl_for(url: str) -> int:
+    """
+    Look up the cache TTL for a URL from ENDPOINT_TTLS.
+
+    Args:
+        url: Request URL.
+
+    Returns:
+        int: TTL in seconds, DEFAULT_TTL when no pattern matches.
+    """
+    for pattern, ttl in ENDPOINT_TTLS:
+        if pattern.search(url):
+            return ttl
+    return DEFAULT_TTL
+
+
+class TokenBucket:
+    """
+    Thread-safe token-bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `burst`; acquire()
+    blocks until a token is available.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class CachedHttpClient:
+    """
+    Shared HTTP client with an on-disk, content-addressed response cache.
+
+    Layout under cache_dir:
+        entries/<sha256(url)>.json   URL metadata: ETag, Last-Modified,
+                                     fetch/access times and body hash
+        objects/<sha256(body)>       Response bodies, shared by identical payloads
+
+    Fresh entries (younger than their TTL) are served from disk. Stale entries
+    are revalidated with If-None-Match / If-Modified-Since and reused on 304.
+    When the total size of stored bodies exceeds max_bytes the least recently
+    used entries are evicted. One requests.Session is pooled for all calls and
+    the client is safe to share between threads. Network requests pass
+    through a token-bucket rate limiter and are retried with exponential
+    backoff on connection errors, 429 and 5xx responses. With a base_url,
+    requests to the FPL hosts go to that server instead and are cached under
+    the rewritten URL, so they never mix with real responses.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES, enabled: bool = True,
+                 rate: float = RATE_LIMIT_PER_SECOND, burst: int = RATE_LIMIT_BURST, max_retries: int = MAX_RETRIES,
+                 base_url: str | None = None):
+        self.cache_dir = cache_dir
+        self.base_url = base_url
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.max_retries = max_retries
+        self.rate_limiter = TokenBucket(rate, burst)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.stats = {
+            'hits': 0, 'revalidated': 0, 'misses': 0, 'evictions': 0, 'retries': 0, 'bytes_downloaded': 0,
+        }
+        self._lock = threading.Lock()
+        self._index = None
+
+    # -- public API ------------------------------------------------------------
+
+    def get(self, url: str, ttl: int | None = None, timeout: float = 30) -> bytes:
+        """
+        GET a URL through the cache.
+
+        Args:
+            url: Request URL.
+            ttl: Freshness in seconds; defaults to the ENDPOINT_TTLS match.
+                Zero forces a conditional GET.
+            timeout: Request timeout in seconds.
+
+        Returns:
+            bytes: Response body.
+
+        Raises:
+            requests.HTTPError: On a non-2xx, non-304 response.
+        """
+        url = rebase_url(url, self.base_url)
+        if not self.enabled:
+            response = self._request(url, {}, timeout)
+            response.raise_for_status()
+            self._count('misses', len(response.content))
+            return response.content
+
+        ttl = ttl_for(url) if ttl is None else ttl
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        entry = self._read_entry(key)
+        body = self._read_object(entry['body_hash']) if entry else None
+        now = time.time()
+
+        if body is not None and now - entry['fetched_at'] < ttl:
+            self._count('hits')
+            self._touch(key, entry, now)
+            return body
+
+        headers = {}
+        if body is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self._request(url, headers, timeout)
+        if response.status_code == 304 and body is not None:
+            self._count('revalidated')
+            entry['fetched_at'] = now
+            self._touch(key, entry, now)
+            return body
+
+        response.raise_for_status()
+        body = response.content
+        self._count('misses', len(body))
+        self._store(key, url, response, body, now)
+        return body
+
+    def _request(self, url, headers, timeout):
+        """Rate-limited GET with retry and backoff on transient failures."""
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.get(url, headers=headers, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                response = None
+
+            if response is not None and response.status_code not in RETRY_STATUSES:
+                return response
+            if attempt == self.max_retries:
+                return response
+
+            retry_after = response.headers.get('Retry-After') if response is not None else None
+            if retry_after and retry_after.isdigit():
+                delay = float(retry_after)
+            else:
+                delay = BACKOFF_BASE_SECONDS * 2 ** attempt * (1 + random.random())
+            self._count('retries')
+            time.sleep(min(delay, BACKOFF_MAX_SECONDS))
+
+    def get_json(self, url: str, ttl: int | None = None, timeout: float = 30):
+        """GET a URL through the cache and parse the body as JSON."""
+        return json.loads(self.get(url, ttl=ttl, timeout=timeout))
+
+    def report(self) -> str:
+        """Return a one-line hit/miss summary for the current process."""
+        s = self.stats
+        total = s['hits'] + s['revalidated'] + s['misses']
+        reused = s['hits'] + s['revalidated']
+        rate = reused / total * 100 if total else 0.0
+        return (
+            f"HTTP cache: {total} requests, {s['hits']} hits, {s['revalidated']} revalidated, "
+            f"{s['misses']} misses ({rate:.0f}% served from cache), "
+            f"{s['bytes_downloaded'] / 1e6:.1f} MB downloaded, {s['retries']} retries, "
+            f"{s['evictions']} evictions"
+        )
+
+    # -- storage -----------------------------------------------------------------
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, 'entries', f'{key}.json')
+
+    def _object_path(self, body_hash):
+        return os.path.join(self.cache_dir, 'objects', body_hash)
+
+    def _read_entry(self, key):
+        try:
+            with open(self._entry_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _read_object(self, body_hash):
+        try:
+            with open(self._object_path(body_hash), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_atomic(self, path, data):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _write_entry(self, key, entry):
+        self._write_atomic(self._entry_path(key), json.dumps(entry).encode('utf-8'))
+
+    def _touch(self, key, entry, now):
+        entry['accessed_at'] = now
+        self._write_entry(key, entry)
+        with self._lock:
+            index = self._load_index()
+            if key in index:
+                index[key]['accessed_at'] = now
+
+    def _store(self, key, url, response, body, now):
+        body_hash = hashlib.sha256(body).hexdigest()
+        if not os.path.exists(self._object_path(body_hash)):
+            self._write_atomic(self._object_path(body_hash), body)
+        entry = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': now,
+            'accessed_at': now,
+            'body_hash': body_hash,
+            'size': len(body),
+        }
+        self._write_entry(key, entry)
+
+        with self._lock:
+            index = self._load_index()
+            previous = index.get(key)
+            index[key] = {'accessed_at': now, 'body_hash': body_hash, 'size': len(body)}
+            # Drop the URL's superseded body unless another entry still shares it
+            if previous and previous['body_hash'] != body_hash:
+                if all(meta['body_hash'] != previous['body_hash'] for meta in index.values()):
+                    try:
+                        os.remove(self._object_path(previous['body_hash']))
+                    except OSError:
+                        pass
+            self._evict(index)
+
+    def _load_index(self):
+        """Scan entry metadata once per process; later updates are incremental. Caller holds the lock."""
+        if self._index is None:
+            self._index = {}
+            entries_dir = os.path.join(self.cache_dir, 'entries')
+            if os.path.isdir(entries_dir):
+                for name in os.listdir(entries_dir):
+                    if not name.endswith('.json'):
+                        continue
+                    entry = self._read_entry(name[:-len('.json')])
+                    if entry:
+                        self._index[name[:-len('.json')]] = {
+                            'accessed_at': entry.get('accessed_at', 0),
+                            'body_hash': entry['body_hash'],
+                            'size': entry.get('size', 0),
+                        }
+        return self._index
+
+    def _evict(self, index):
+        """Drop least recently used entries until stored bodies fit max_bytes. Caller holds the lock."""
+        sizes = {meta['body_hash']: meta['size'] for meta in index.values()}
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        refs = {}
+        for meta in index.values():
+            refs[meta['body_hash']] = refs.get(meta['body_hash'], 0) + 1
+
+        for key in sorted(index, key=lambda k: index[k]['accessed_at']):
+            if total <= self.max_bytes:
+                break
+            meta = index.pop(key)
+            try:
+                os.remove(self._entry_path(key))
+            except OSError:
+                pass
+            refs[meta['body_hash']] -= 1
+            if refs[meta['body_hash']] == 0:
+                total -= meta['size']
+                try:
+                    os.remove(self._object_path(meta['body_hash']))
+                except OSError:
+                    pass
+            self.stats['evictions'] += 1
+
+    def _count(self, stat, downloaded=0):
+        """Increment a stats counter, adding to bytes_downloaded for misses."""
+        with self._lock:
+            self.stats[stat] += 1
+            self.stats['bytes_downloaded'] += downloaded
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> CachedHttpClient:
+    """Return the process-wide cached client, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = CachedHttpClient(
+                enabled=os.environ.get('FPL_HTTP_CACHE', '1') != '0',
+                base_url=os.environ.get('FPL_BASE_URL'),
+            )
+        return _client
+
+
+def get_json(url: str, ttl: int | None = None, timeout: float = 30):
+    """
+    Fetch and parse a JSON endpoint through the shared cache.
+
+    Args:
+        url: Request URL.
+        ttl: Freshness in seconds; defaults to the ENDPOINT_TTLS match.
+        timeout: Request timeout in seconds.
+
+    Returns:
+        Parsed JSON payload.
+    """
+    return get_client().get_json(url, ttl=ttl, timeout=timeout)
+
+
+def cache_report() -> str:
+    """Return the shared client's hit/miss summary."""
+    return get_client().report()
+
+
+def request_counters() -> tuple[int, int, int]:
+    """
+    Return (requests, network requests, bytes downloaded) made so far in this process.
+
+    Cache hits count as requests but not network requests. Reads the shared
+    client's stats without creating it, so this is free when nothing has
+    been fetched yet.
+    """
+    client = _client
+    if client is None:
+        return 0, 0, 0
+    s = client.stats
+    return s['hits'] + s['revalidated'] + s['misses'], s['revalidated'] + s['misses'], s['bytes_downloaded']
@@ -0,0 +1,187 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.matching import MATCH_THRESHOLD, normalise_name, normalise_team, resolve_names, take_columns
+from utils.store import file_lock
+
+# Season directory this package belongs to, e.g. '2025-26'
+SEASON = os.path.abspath(__file__).split(os.sep)[-3]
+
+IDENTITY_PATH = os.environ.get('FPL_IDENTITY_PATH', os.path.join(SEASON, 'data', 'player_identity.csv'))
+
+# Fuzzy matches below this score are used for the current run but not stored,
+# so a player missing from one FBref table is not pinned to a lookalike
+PERSIST_THRESHOLD = 85
+
+IDENTITY_COLUMNS = ['fpl_id', 'season', 'fpl_name', 'fbref_name', 'score', 'override']
+
+# Columns record() writes; override is only ever set by hand
+MATCH_COLUMNS = ['fpl_name', 'fbref_name', 'score']
+
+
+def _read_table(path: str) -> pd.DataFrame:
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=IDENTITY_COLUMNS)
+    table = pd.read_csv(path, dtype=str, keep_default_na=False)
+    table['fpl_id'] = table['fpl_id'].astype(int)
+    return table
+
+
+def _row_index(table: pd.DataFrame) -> dict:
+    return {(int(row.fpl_id), row.season): i for i, row in enumerate(table.itertuples(index=False))}
+
+
+class IdentityMap:
+    """
+    Persistent FPL element ID -> FBref player name table.
+
+    Rows are keyed by (fpl_id, season) and stored as CSV so they can be
+    reviewed and corrected by hand. A non-empty `override` always wins over
+    the fuzzy-matched `fbref_name` and is never overwritten.
+
+    Several runs can hold a map at once (run.py's gameweek workers each load
+    their own), so save() merges the matches recorded here into the file as
+    it is on disk rather than writing this copy over it.
+    """
+
+    def __init__(self, path: str = IDENTITY_PATH, season: str = SEASON):
+        self.path = path
+        self.season = season
+        self.dirty = False
+        self.table = _read_table(path)
+        self._rows = _row_index(self.table)
+        self._recorded = set()
+
+    def lookup(self, ids) -> list[str | None]:
+        """
+        Return the stored FBref name for each FPL ID in this season.
+
+        Args:
+            ids (Iterable[int]): FPL element IDs.
+
+        Returns:
+            list[str | None]: Override if set, else the matched name; None when unknown.
+        """
+        names = []
+        for fpl_id in ids:
+            i = self._rows.get((int(fpl_id), self.season))
+            if i is None:
+                names.append(None)
+                continue
+            row = self.table.iloc[i]
+            names.append(row['override'] or row['fbref_name'] or None)
+        return names
+
+    def record(self, fpl_id: int, fpl_name: str, fbref_name: str, score: float) -> None:
+        """Store a fuzzy match, leaving any manual override in place."""
+        key = (int(fpl_id), self.season)
+        values = {'fpl_name': fpl_name, 'fbref_name': fbref_name, 'score': f'{score:.1f}'}
+        if key in self._rows:
+            for column, value in values.items():
+                self.table.iat[self._rows[key], self.table.columns.get_loc(column)] = value
+        else:
+            self._rows[key] = len(self.table)
+            self.table.loc[len(self.table)] = {'fpl_id': key[0], 'season': self.season, 'override': '', **values}
+        self._recorded.add(key)
+        self.dirty = True
+
+    def save(self) -> None:
+        """
+        Merge the matches recorded since the last save into the file, atomically.
+
+        The file is re-read under a lock and only those matches are applied
+        to it, so matches saved by other runs meanwhile and overrides edited
+        by hand are kept. The map then holds the merged table.
+        """
+        if not self.dirty:
+            return
+        with file_lock(self.path):
+            table = _read_table(self.path)
+            rows = _row_index(table)
+            keys = sorted(self._recorded)
+            recorded = self.table.iloc[[self._rows[key] for key in keys]]
+            on_disk = np.array([key in rows for key in keys], dtype=bool)
+            if on_disk.any():
+                match_columns = [table.columns.get_loc(column) for column in MATCH_COLUMNS]
+                targets = [rows[key] for key, found in zip(keys, on_disk) if found]
+                table.iloc[targets, match_columns] = recorded.loc[on_disk, MATCH_COLUMNS].to_numpy()
+            if not on_disk.all():
+                table = pd.concat([table, recorded.loc[~on_disk, IDENTITY_COLUMNS]], ignore_index=True)
+            table = table[IDENTITY_COLUMNS].sort_values(['season', 'fpl_id'], ignore_index=True)
+            tmp_path = f'{self.path}.{os.getpid()}.tmp'
+            table.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, self.path)
+        self.table = table
+        self._rows = _row_index(table)
+        self._recorded.clear()
+        self.dirty = False
+
+
+def match_player_columns(projections: pd.DataFrame, source: pd.DataFrame, columns: list[str],
+                         name_column: str = 'Player', team_column: str | None = None, fill_value=0.0,
+                         identity: IdentityMap | None = None, threshold: int = MATCH_THRESHOLD) -> pd.DataFrame:
+    """
+    Join columns of an FBref table onto projections through the identity map.
+
+    Players with a stored identity are joined on their FBref name directly
+    (within the same club when both sides have one). Only players without one
+    are fuzzy-matched, and confident matches are stored for the next run.
+
+    Args:
+        projections (pd.DataFrame): Player projections with ID, Fuzzy (or
+            Player) and optionally Team columns.
+        source (pd.DataFrame): FBref table.
+        columns (list[str]): Columns of source to bring across.
+        name_column (str, optional): Column of source holding player names.
+        team_column (str, optional): Column of source holding clubs.
+        fill_value (optional): Value for unmatched players. Defaults to 0.0.
+        identity (IdentityMap, optional): Map to use; loaded from IDENTITY_PATH by default.
+        threshold (int, optional): Minimum fuzzy score for a match.
+
+    Returns:
+        pd.DataFrame: One row per projection (default RangeIndex) holding the
+            matched values of `columns`.
+    """
+    identity = identity or IdentityMap()
+    ids = projections['ID'].to_numpy()
+    names = (projections['Fuzzy'] if 'Fuzzy' in projections else projections['Player']).to_numpy()
+    teams = projections['Team'].to_numpy() if team_column and 'Team' in projections else None
+
+    # Exact join on stored names, preferring the row for the player's club
+    source_names = [normalise_name(name) for name in source[name_column]]
+    source_teams = [normalise_team(team) for team in source[team_column]] if teams is not None else None
+    by_name, by_name_team = {}, {}
+    for j, name in enumerate(source_names):
+        by_name.setdefault(name, j)
+        if source_teams is not None:
+            by_name_team.setdefault((name, source_teams[j]), j)
+
+    indices = np.full(len(ids), -1, dtype=np.intp)
+    unknown = []
+    for i, stored in enumerate(identity.lookup(ids)):
+        if stored is None:
+            unknown.append(i)
+            continue
+        name = normalise_name(stored)
+        if teams is not None:
+            indices[i] = by_name_team.get((name, normalise_team(teams[i])), by_name.get(name, -1))
+        else:
+            indices[i] = by_name.get(name, -1)
+
+    # Fuzzy-match only the players the map has not seen
+    if unknown:
+        matched, scores = resolve_names(
+            names[unknown], source[name_column],
+            teams=teams[unknown] if teams is not None else None,
+            choice_teams=source[team_column] if teams is not None else None,
+            threshold=threshold,
+        )
+        indices[unknown] = matched
+        for i, j, score in zip(unknown, matched, scores):
+            if j >= 0 and score >= PERSIST_THRESHOLD:
+                identity.record(ids[i], names[i], source[name_column].iloc[j], score)
+        identity.save()
+
+    return take_columns(source, columns, indices, fill_value)
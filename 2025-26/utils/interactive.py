@@ -0,0 +1,48 @@
+from utils.data import save_optimal_prediction, save_prediction_pool, save_projections
+from utils.session import OptimiserSession, run_session
+from utils.trace import traced
+
+
+def problem_name(season: str, gameweek: int) -> str:
+    """Model name for a gameweek's challenge, e.g. 'fpl-202526-gw7-challenge'."""
+    return f"fpl-{season.replace('-', '')}-gw{gameweek}-challenge"
+
+
+@traced()
+def solve_and_save(season: str, gameweek: int, projections, constraints: dict, top_k: int = 0) -> bool:
+    """
+    Solve a gameweek from its script and save the lineup the user confirms.
+
+    The lineup is solved once in an OptimiserSession, which routes like
+    solve_lineup(): the exact club DP for one-player-per-club weeks and the
+    MILP otherwise. run_session() then takes bans and forces one at a time,
+    re-solving the live model after each. The projections CSV is always
+    written; the lineup only if the final solve was feasible and the user
+    confirms it. With top_k, the ranked alternatives under the same final
+    bans and forces are saved alongside the confirmed lineup.
+
+    Args:
+        season (str): Season string in YYYY-YY format (e.g. '2025-26').
+        gameweek (int): Gameweek number.
+        projections (pd.DataFrame): Adjusted projections for the gameweek.
+        constraints (dict): Gameweek block from constraints.yaml.
+        top_k (int, optional): Ranked lineups to save to predicted_pool.json;
+            0 saves no pool.
+
+    Returns:
+        bool: Whether the lineup was saved.
+    """
+    session = OptimiserSession(gameweek, projections, constraints, problem_name(season, gameweek))
+    if session.solve() == 'Optimal':
+        session.print_players_by_position()
+    run_session(session)
+
+    save_projections(projections, season, gameweek)
+    if session.status != 'Optimal':
+        print(f"GW{gameweek}: no feasible lineup with these bans/forces; nothing saved.")
+        return False
+    if not save_optimal_prediction(session.selected_players, season, gameweek):
+        return False
+    if top_k:
+        save_prediction_pool(session.solve_top_k(top_k), season, gameweek)
+    return True
@@ -0,0 +1,166 @@
+import re
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process
+from unidecode import unidecode
+
+# Minimum fuzz.ratio score (0-100) for a name to count as a match
+MATCH_THRESHOLD = 50
+
+# A same-club candidate is preferred unless another club's candidate scores
+# more than this many points higher (e.g. a player FBref still lists at an
+# old club)
+TEAM_MATCH_MARGIN = 10
+
+# Club name variants used by FBref and the FPL APIs, keyed by normalised name
+TEAM_ALIASES = {
+    'afc bournemouth': 'bournemouth',
+    'brighton and hove albion': 'brighton',
+    'brighton hove albion': 'brighton',
+    'leeds united': 'leeds',
+    'man city': 'manchester city',
+    'man utd': 'manchester utd',
+    'manchester united': 'manchester utd',
+    'newcastle united': 'newcastle',
+    'newcastle utd': 'newcastle',
+    'nott ham forest': 'nottingham forest',
+    'nott m forest': 'nottingham forest',
+    'spurs': 'tottenham',
+    'tottenham hotspur': 'tottenham',
+    'west ham united': 'west ham',
+    'wolverhampton wanderers': 'wolves',
+}
+
+_NON_ALPHANUMERIC = re.compile(r'[^a-z0-9]+')
+
+
+def normalise_name(name) -> str:
+    """
+    Normalise a player or club name for matching.
+
+    Transliterates to ASCII, lowercases, and collapses anything that is not a
+    letter or digit into single spaces, so 'Ødegaard' and 'Odegaard' or
+    "O'Brien" and 'O Brien' compare equal. Missing values become ''.
+
+    Args:
+        name: Name to normalise.
+
+    Returns:
+        str: Normalised name.
+    """
+    if name is None or (isinstance(name, float) and np.isnan(name)):
+        return ''
+    return _NON_ALPHANUMERIC.sub(' ', unidecode(str(name)).lower()).strip()
+
+
+# Aliases are looked up after normalise_name, so a key it would rewrite (an
+# apostrophe, say) could never match
+_unreachable = [name for pair in TEAM_ALIASES.items() for name in pair if normalise_name(name) != name]
+if _unreachable:
+    raise ValueError(f"TEAM_ALIASES entries are not normalised: {_unreachable}")
+
+
+def normalise_team(team) -> str:
+    """Normalise a club name and map known variants onto one key."""
+    team = normalise_name(team)
+    return TEAM_ALIASES.get(team, team)
+
+
+def resolve_names(names, choices, teams=None, choice_teams=None, threshold: int = MATCH_THRESHOLD,
+                  workers: int = -1) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Resolve every name to its closest choice in one pass.
+
+    Both sides are normalised once and the full fuzz.ratio score matrix is
+    computed with RapidFuzz's cdist across all cores. When club names are
+    given for both sides, candidates are blocked by club: a name matches
+    within its own club when the best same-club candidate reaches the
+    threshold and is within TEAM_MATCH_MARGIN of the best candidate overall,
+    and falls back to the overall best otherwise. Ties go to the earliest
+    choice, as with process.extractOne.
+
+    Args:
+        names (Iterable): Names to resolve, e.g. the projections 'Fuzzy' column.
+        choices (Iterable): Candidate names, e.g. FBref player names.
+        teams (Iterable, optional): Club of each name.
+        choice_teams (Iterable, optional): Club of each choice.
+        threshold (int, optional): Minimum score for a match. Defaults to MATCH_THRESHOLD.
+        workers (int, optional): Threads for cdist; -1 uses all cores.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Index into choices for each name (-1 when
+            unmatched) and the corresponding score (0 when unmatched).
+    """
+    queries = [normalise_name(name) for name in names]
+    candidates = [normalise_name(choice) for choice in choices]
+    if not queries or not candidates:
+        return np.full(len(queries), -1, dtype=np.intp), np.zeros(len(queries))
+
+    scores = process.cdist(queries, candidates, scorer=fuzz.ratio, workers=workers)
+    scores[[i for i, query in enumerate(queries) if not query], :] = 0
+    scores[:, [j for j, candidate in enumerate(candidates) if not candidate]] = 0
+
+    rows = np.arange(len(queries))
+    best = scores.argmax(axis=1)
+    best_scores = scores[rows, best]
+
+    if teams is not None and choice_teams is not None:
+        query_teams = np.array([normalise_team(team) for team in teams], dtype=object)
+        candidate_teams = np.array([normalise_team(team) for team in choice_teams], dtype=object)
+        same_team = (query_teams[:, None] == candidate_teams[None, :]) & (query_teams[:, None] != '')
+        blocked = np.where(same_team, scores, -1)
+        blocked_best = blocked.argmax(axis=1)
+        blocked_scores = blocked[rows, blocked_best]
+        use_blocked = (blocked_scores >= threshold) & (blocked_scores >= best_scores - TEAM_MATCH_MARGIN)
+        best = np.where(use_blocked, blocked_best, best)
+        best_scores = np.where(use_blocked, blocked_scores, best_scores)
+
+    matched = best_scores >= threshold
+    return np.where(matched, best, -1), np.where(matched, best_scores, 0.0)
+
+
+def match_columns(names, source: pd.DataFrame, columns: list[str], name_column: str = 'Player',
+                  teams=None, team_column: str | None = None, fill_value=0.0,
+                  threshold: int = MATCH_THRESHOLD) -> pd.DataFrame:
+    """
+    Fuzzy-join columns of an external table onto a list of names.
+
+    Args:
+        names (Iterable): Names to resolve, in output row order.
+        source (pd.DataFrame): External table, e.g. FBref stats.
+        columns (list[str]): Columns of source to bring across.
+        name_column (str, optional): Column of source holding player names.
+        teams (Iterable, optional): Club of each name, used for blocking.
+        team_column (str, optional): Column of source holding clubs.
+        fill_value (optional): Value for names without a match. Defaults to 0.0.
+        threshold (int, optional): Minimum score for a match.
+
+    Returns:
+        pd.DataFrame: One row per name (default RangeIndex) holding the matched
+            values of `columns`.
+    """
+    choice_teams = source[team_column] if teams is not None and team_column else None
+    indices, _ = resolve_names(names, source[name_column], teams=teams, choice_teams=choice_teams,
+                               threshold=threshold)
+    return take_columns(source, columns, indices, fill_value)
+
+
+def take_columns(source: pd.DataFrame, columns: list[str], indices, fill_value=0.0) -> pd.DataFrame:
+    """
+    Gather rows of source by position, filling where the index is -1.
+
+    Args:
+        source (pd.DataFrame): External table.
+        columns (list[str]): Columns of source to bring across.
+        indices (np.ndarray): Row position in source for each output row, -1 when unmatched.
+        fill_value (optional): Value for unmatched rows. Defaults to 0.0.
+
+    Returns:
+        pd.DataFrame: One row per index (default RangeIndex).
+    """
+    indices = np.asarray(indices)
+    matched = indices >= 0
+    result = source[columns].iloc[indices[matched]].reset_index(drop=True)
+    result.index = np.flatnonzero(matched)
+    return result.reindex(range(len(indices)), fill_value=fill_value)
@@ -0,0 +1,294 @@
+import contextlib
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.http import CACHE_DIR, FPL_HOST_PATTERN
+from utils.synthetic import (
+    synthetic_bootstrap, synthetic_bundle, synthetic_element_summary, synthetic_live, synthetic_picks,
+    synthetic_projections,
+)
+
+# Paths served, mirroring fplchallenge.premierleague.com
+ROUTES = (
+    ('bootstrap', re.compile(r'^/api/bootstrap-static/$')),
+    ('live', re.compile(r'^/api/event/(\d+)/live/$')),
+    ('element_summary', re.compile(r'^/api/element-summary/(\d+)/$')),
+    ('picks', re.compile(r'^/api/entry/(\d+)/event/(\d+)/picks/$')),
+    ('bundle', re.compile(r'^/assets/[\w.-]+\.js$')),
+)
+
+# Server counters as JSON; never delayed or throttled
+STATS_PATH = '/_stats'
+
+DEFAULT_PORT = 8765
+
+
+def snapshot_path(directory: str, path: str) -> str:
+    """
+    File holding the recorded response for a URL path.
+
+    '/api/event/3/live/' maps to {directory}/api/event/3/live.json and
+    '/assets/index-abc.js' to {directory}/assets/index-abc.js.
+    """
+    relative = path.split('?', 1)[0].strip('/')
+    if not os.path.splitext(relative)[1]:
+        relative += '.json'
+    return os.path.join(directory, *relative.split('/'))
+
+
+class SnapshotSource:
+    """Responses recorded from the real API, one file per path (see snapshot_path)."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def get(self, route: str, path: str, args: tuple) -> bytes | None:
+        try:
+            with open(snapshot_path(self.directory, path), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+
+class SyntheticSource:
+    """
+    Responses generated by utils.synthetic for a pool of `size` players.
+
+    Payloads are built on first request and reused, so every response for a
+    path is identical for the life of the server.
+    """
+
+    def __init__(self, size: int = 700, finished: int = 20, seed: int = 0):
+        self.finished = finished
+        self.seed = seed
+        self.projections = synthetic_projections(size, seed)
+        self._bodies = {}
+        self._live_payloads = {}
+
+    def get(self, route: str, path: str, args: tuple) -> bytes | None:
+        if route == 'element_summary' and not 1 <= args[0] <= len(self.projections):
+            return None
+        if route in ('live', 'picks') and not 1 <= args[-1] <= 38:
+            return None
+        key = (route, args)
+        if key not in self._bodies:
+            if route == 'bundle':
+                self._bodies[key] = synthetic_bundle().encode('utf-8')
+            else:
+                self._bodies[key] = json.dumps(self._payload(route, args)).encode('utf-8')
+        return self._bodies[key]
+
+    def _payload(self, route, args):
+        if route == 'bootstrap':
+            return synthetic_bootstrap(self.projections, self.finished, self.seed)
+        if route == 'live':
+            return self._live(args[0])
+        if route == 'element_summary':
+            live = {gw: self._live(gw) for gw in range(1, self.finished + 1)}
+            return synthetic_element_summary(live, args[0])
+        entry_id, gameweek = args
+        return synthetic_picks(self.projections, self._live(gameweek), gameweek, seed=self.seed + entry_id)
+
+    def _live(self, gameweek):
+        if gameweek not in self._live_payloads:
+            self._live_payloads[gameweek] = synthetic_live(self.projections, gameweek, self.seed)
+        return self._live_payloads[gameweek]
+
+
+class MockFPLServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the FPL Challenge API.
+
+    Serves bootstrap-static, event/{gw}/live, element-summary/{id},
+    entry/{id}/event/{gw}/picks and the JS bundle from the first source that
+    has the path. Responses carry an ETag and honour If-None-Match, so the
+    HTTP cache's revalidation can be exercised. Every request can be delayed
+    and throttled:
+
+        latency      seconds added to each response, plus up to `jitter` more
+        rate         requests per second served before answering 429
+        error_rate   share of requests answered 429 regardless of rate
+
+    A 429 carries `Retry-After: retry_after`. GET /_stats returns counters.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int] = ('127.0.0.1', DEFAULT_PORT), sources: list | None = None,
+                 latency: float = 0.0, jitter: float = 0.0, rate: float | None = None, error_rate: float = 0.0,
+                 retry_after: int = 1, seed: int = 0, verbose: bool = False):
+        """
+        Args:
+            address (tuple[str, int], optional): Host and port; port 0 picks a free one.
+            sources (list, optional): SnapshotSource / SyntheticSource objects,
+                tried in order. Defaults to a SyntheticSource.
+            latency (float, optional): Seconds added to every response.
+            jitter (float, optional): Maximum extra random seconds per response.
+            rate (float, optional): Requests per second before 429s; unlimited when None.
+            error_rate (float, optional): Probability of a spurious 429.
+            retry_after (int, optional): Retry-After seconds sent with a 429.
+            seed (int, optional): Seed for jitter and spurious 429s.
+            verbose (bool, optional): Log each request to stderr.
+        """
+        super().__init__(address, _Handler)
+        self.sources = sources if sources is not None else [SyntheticSource(seed=seed)]
+        self.latency = latency
+        self.jitter = jitter
+        self.rate = rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.verbose = verbose
+        self.stats = {'requests': 0, 'ok': 0, 'not_modified': 0, 'throttled': 0, 'not_found': 0, 'bytes_sent': 0}
+        self._random = random.Random(seed)
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as FPL_BASE_URL."""
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def throttled(self) -> bool:
+        """Count a request against the rate limit and decide whether to refuse it."""
+        with self._lock:
+            now = time.monotonic()
+            if self.error_rate and self._random.random() < self.error_rate:
+                return True
+            if self.rate is None:
+                return False
+            while self._recent and now - self._recent[0] >= 1.0:
+                self._recent.popleft()
+            if len(self._recent) >= self.rate:
+                return True
+            self._recent.append(now)
+            return False
+
+    def delay(self) -> float:
+        with self._lock:
+            return self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def lookup(self, path: str) -> bytes | None:
+        """Body for a path from the first source that has it, None if no route or source matches."""
+        for route, pattern in ROUTES:
+            match = pattern.match(path.split('?', 1)[0])
+            if match:
+                args = tuple(int(group) for group in match.groups())
+                for source in self.sources:
+                    body = source.get(route, path, args)
+                    if body is not None:
+                        return body
+                return None
+        return None
+
+    def count(self, stat: str, sent: int = 0) -> None:
+        with self._lock:
+            self.stats['requests'] += 1
+            self.stats[stat] += 1
+            self.stats['bytes_sent'] += sent
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockFPLServer
+
+    def do_GET(self):
+        server = self.server
+        if self.path == STATS_PATH:
+            with server._lock:
+                body = json.dumps(server.stats).encode('utf-8')
+            return self._send(200, body, 'application/json')
+
+        time.sleep(server.delay())
+        if server.throttled():
+            server.count('throttled')
+            return self._send(429, b'{"detail": "Too many requests"}', 'application/json',
+                              {'Retry-After': str(server.retry_after)})
+
+        body = server.lookup(self.path)
+        if body is None:
+            server.count('not_found')
+            return self._send(404, b'{"detail": "Not found."}', 'application/json')
+
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        if self.headers.get('If-None-Match') == etag:
+            server.count('not_modified')
+            return self._send(304, b'', None, {'ETag': etag})
+
+        server.count('ok', len(body))
+        content_type = 'application/javascript' if self.path.endswith('.js') else 'application/json'
+        self._send(200, body, content_type, {'ETag': etag})
+
+    def _send(self, status, body, content_type, headers=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+@contextlib.contextmanager
+def serve(**kwargs):
+    """
+    Run a MockFPLServer on a background thread for the duration of a block.
+
+        with serve(latency=0.05, rate=20) as server:
+            client = CachedHttpClient(base_url=server.url)
+
+    Args:
+        **kwargs: MockFPLServer arguments; address defaults to a free local port.
+
+    Yields:
+        MockFPLServer: The running server.
+    """
+    kwargs.setdefault('address', ('127.0.0.1', 0))
+    server = MockFPLServer(**kwargs)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def record_snapshots(directory: str, cache_dir: str = CACHE_DIR) -> int:
+    """
+    Copy every FPL response held in the HTTP cache into a snapshot directory.
+
+    Args:
+        directory (str): Snapshot directory for SnapshotSource.
+        cache_dir (str, optional): HTTP cache to read. Defaults to CACHE_DIR.
+
+    Returns:
+        int: Responses written.
+    """
+    entries_dir = os.path.join(cache_dir, 'entries')
+    written = 0
+    for name in sorted(os.listdir(entries_dir)) if os.path.isdir(entries_dir) else []:
+        with open(os.path.join(entries_dir, name), 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        match = FPL_HOST_PATTERN.match(entry['url'])
+        object_path = os.path.join(cache_dir, 'objects', entry['body_hash'])
+        if not match or not os.path.exists(object_path):
+            continue
+        path = snapshot_path(directory, entry['url'][match.end():])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(object_path, 'rb') as src, open(path, 'wb') as dst:
+            dst.write(src.read())
+        written += 1
+    return written
@@ -0,0 +1,76 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Integer thresholds up to this value use the cached 1/k! table instead of scipy
+MAX_TABLE_THRESHOLD = 20
+
+
+@lru_cache(maxsize=None)
+def _poisson_cdf_coefficients(n: int) -> np.ndarray:
+    """Return the cached coefficients 1/k! for k = 0..n-1."""
+    coefficients = np.ones(n)
+    for k in range(1, n):
+        coefficients[k] = coefficients[k - 1] / k
+    coefficients.setflags(write=False)
+    return coefficients
+
+
+def _poisson_at_least_table(lambdas: np.ndarray, n: int) -> np.ndarray:
+    """P(X >= n) for one integer n via the cached 1/k! table (Horner evaluation)."""
+    if n <= 0:
+        return np.ones_like(lambdas)
+    cdf = np.exp(-lambdas) * np.polynomial.polynomial.polyval(lambdas, _poisson_cdf_coefficients(n))
+    return 1.0 - cdf
+
+
+def poisson_at_least(lambdas, n) -> np.ndarray:
+    """
+    Calculate P(X >= n) for X ~ Poisson(lambda) over whole arrays.
+
+    Common small integer thresholds are evaluated from a cached table of 1/k!
+    coefficients, one pass per distinct threshold; anything else goes through
+    scipy's vectorised poisson.sf. Non-positive or NaN rates give 0.0.
+
+    Args:
+        lambdas (array-like): Poisson rates (expected number of events).
+        n (int | array-like): Minimum count threshold, scalar or broadcastable
+            against lambdas.
+
+    Returns:
+        np.ndarray: Probabilities in [0.0, 1.0], shaped like the broadcast inputs.
+    """
+    lambdas, n = np.broadcast_arrays(np.asarray(lambdas, dtype=float), np.asarray(n))
+    valid = lambdas > 0
+    safe_lambdas = np.where(valid, lambdas, 0.0)
+
+    thresholds = np.unique(n)
+    if np.issubdtype(n.dtype, np.integer) and thresholds.max(initial=0) <= MAX_TABLE_THRESHOLD:
+        result = np.empty(lambdas.shape)
+        for threshold in thresholds:
+            mask = n == threshold
+            result[mask] = _poisson_at_least_table(safe_lambdas[mask], int(threshold))
+    else:
+        # scipy.stats costs most of a second to import, so load it only here
+        from scipy.stats import poisson
+
+        result = poisson.sf(np.ceil(n) - 1, safe_lambdas)
+
+    return np.where(valid, np.clip(result, 0.0, 1.0), 0.0)
+
+
+def binomial_at_least(k, n, p) -> np.ndarray:
+    """
+    Calculate P(X >= k) for X ~ Binomial(n, p) over whole arrays.
+
+    Args:
+        k (array-like): Minimum number of successes.
+        n (array-like): Number of trials (integers).
+        p (array-like): Success probability per trial.
+
+    Returns:
+        np.ndarray: Probabilities shaped like the broadcast inputs.
+    """
+    from scipy.stats import binom
+
+    return binom.sf(np.asarray(k) - 1, np.asarray(n), np.asarray(p, dtype=float))
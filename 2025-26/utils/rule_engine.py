@@ -0,0 +1,315 @@
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from utils.context import RunContext
+from utils.history import load_season_history
+from utils.probability import poisson_at_least
+
+# Season directory this package belongs to, e.g. '2025-26'
+SEASON = os.path.abspath(__file__).split(os.sep)[-3]
+
+RULES_PATH = os.environ.get('FPL_RULES_PATH', os.path.join(SEASON, 'data', 'rules.yaml'))
+
+# Step kind -> required keys besides the kind itself
+STEP_KINDS = {
+    'multiply': set(),
+    'per_90': {'points'},
+    'per_appearance': {'points'},
+    'poisson_at_least': {'threshold', 'points'},
+    'team_value': {'points'},
+}
+
+# Steps whose event rate is scaled by projected minutes, so need xMins
+RATE_KINDS = {'per_90', 'per_appearance', 'poisson_at_least'}
+
+# `where` condition -> projection columns it reads
+CONDITION_COLUMNS = {
+    'team': {'Team'},
+    'position': {'Position'},
+    'min_cost': {'Cost'},
+    'max_cost': {'Cost'},
+    'home': {'Opponent'},
+    'joined_after': {'ID'},
+    'max_age': {'ID'},
+    'age_on': set(),
+}
+
+
+class CompiledRule:
+    """
+    One gameweek's rule spec, validated and ready to evaluate.
+
+    Every step contributes either to a per-player multiplier or to an additive
+    bonus, so a whole week is evaluated as
+
+        Predicted_Points = Predicted_Points * multiplier + bonus
+
+    in one pass over the projection arrays, optionally rounded. Bootstrap
+    fields and season history are each gathered once, however many steps
+    read them.
+    """
+
+    def __init__(self, gameweek: int, spec: dict):
+        """
+        Args:
+            gameweek (int): Gameweek the spec belongs to, used in error messages.
+            spec (dict): The GW{n} entry of rules.yaml.
+        """
+        self.gameweek = gameweek
+        self.round = spec.get('round')
+        self.steps = []
+        self.columns = {'Predicted_Points'}
+        self.element_fields = set()
+        self.history_stats = set()
+
+        for step in spec.get('steps', []):
+            kinds = STEP_KINDS.keys() & step.keys()
+            if len(kinds) != 1:
+                raise ValueError(f"GW{gameweek}: each step needs exactly one of {sorted(STEP_KINDS)}, got {step}")
+            kind = kinds.pop()
+            missing = STEP_KINDS[kind] - step.keys()
+            if missing:
+                raise ValueError(f"GW{gameweek}: {kind} step is missing {sorted(missing)}")
+
+            where = step.get('where', {})
+            unknown = where.keys() - CONDITION_COLUMNS.keys()
+            if unknown:
+                raise ValueError(f"GW{gameweek}: unknown where conditions {sorted(unknown)}")
+            if 'max_age' in where and 'age_on' not in where:
+                raise ValueError(f"GW{gameweek}: max_age needs an age_on date")
+            for condition in where:
+                self.columns |= CONDITION_COLUMNS[condition]
+            if 'joined_after' in where:
+                self.element_fields.add('team_join_date')
+            if 'max_age' in where:
+                self.element_fields.add('birth_date')
+
+            if kind in RATE_KINDS:
+                # A missing xMins must fail loudly, not be read as 90 minutes for everyone
+                self.columns.add('xMins')
+            if kind == 'per_90':
+                self.columns.add('ID')
+                self.element_fields |= {step['per_90'], 'minutes'}
+            elif kind in ('per_appearance', 'poisson_at_least'):
+                self.columns.add('ID')
+                self.history_stats.add(step[kind])
+            if isinstance(step.get('points'), dict):
+                self.columns.add('Position')
+            if kind == 'team_value':
+                self.columns.add('Team')
+
+            self.steps.append((kind, step))
+
+    def evaluate(self, projections: pd.DataFrame, context: RunContext | None = None) -> np.ndarray:
+        """
+        Compute the adjusted Predicted_Points for every projection row.
+
+        Args:
+            projections (pd.DataFrame): Player projections.
+            context (RunContext, optional): Shared run context for bootstrap
+                and history lookups; created when needed and omitted.
+
+        Returns:
+            np.ndarray: New Predicted_Points in row order.
+        """
+        multiplier, bonuses = self.components(projections, context)
+        points = pd.to_numeric(projections['Predicted_Points'], errors='coerce').to_numpy(dtype=float)
+        bonus = np.zeros(len(points))
+        if any(step['kind'] in RATE_KINDS for step in bonuses):
+            scale = projections['xMins'].to_numpy(dtype=float) / 90.0
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for step in bonuses:
+                if step['kind'] == 'team_value':
+                    value = step['value']
+                elif step['kind'] == 'poisson_at_least':
+                    value = poisson_at_least(step['rate'] * scale, step['threshold'])
+                else:
+                    value = step['rate'] * scale
+                value = value * step['points']
+                bonus = bonus + (value if step['mask'] is None else np.where(step['mask'], value, 0.0))
+
+        result = points * multiplier + bonus
+        if self.round is not None:
+            result = np.round(result, self.round)
+        return result
+
+    def apply(self, projections: pd.DataFrame, context: RunContext | None = None) -> pd.DataFrame:
+        """Return a copy of projections with Predicted_Points replaced by evaluate()."""
+        result = self.evaluate(projections, context)
+        projections = projections.copy()
+        projections['Predicted_Points'] = result
+        return projections
+
+    def components(self, projections: pd.DataFrame, context: RunContext | None = None) -> tuple[np.ndarray, list[dict]]:
+        """
+        Split the week into a multiplier and per-step bonus inputs.
+
+        evaluate() combines these with xMins; simulation.py samples them.
+
+        Args:
+            projections (pd.DataFrame): Player projections before this rule.
+            context (RunContext, optional): Shared run context, as for evaluate().
+
+        Returns:
+            tuple[np.ndarray, list[dict]]: The per-player multiplier on
+                Predicted_Points, and one dict per bonus step with 'kind',
+                'points' (per row), 'mask' (per row, or None) and either
+                'rate' (full-game event rate; plus 'threshold' for
+                poisson_at_least) or 'value' (team_value probability per row).
+
+        Raises:
+            ValueError: If a column the steps read is missing, including
+                xMins for per_90, per_appearance and poisson_at_least steps.
+        """
+        missing = self.columns - set(projections.columns)
+        if missing:
+            raise ValueError(f"GW{self.gameweek}: missing required columns: {sorted(missing)}")
+
+        elements, history = None, None
+        if self.element_fields or self.history_stats:
+            context = context or RunContext()
+        if self.element_fields:
+            elements = context.element_columns(projections['ID'], sorted(self.element_fields))
+        if self.history_stats:
+            history = load_season_history(bootstrap=context.bootstrap)
+
+        multiplier = np.ones(len(projections))
+        bonuses = []
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for kind, step in self.steps:
+                mask = self._where(step.get('where', {}), projections, elements)
+                if kind == 'multiply':
+                    factor = float(step['multiply'])
+                    multiplier = multiplier * factor if mask is None else np.where(mask, multiplier * factor, multiplier)
+                    continue
+                bonus = {'kind': kind, 'points': np.broadcast_to(_points(step['points'], projections),
+                                                                 len(projections)), 'mask': mask}
+                if kind == 'team_value':
+                    bonus['value'] = projections['Team'].map(step['team_value']).fillna(0).to_numpy(dtype=float)
+                else:
+                    bonus['rate'] = self._rate(kind, step, projections, elements, history)
+                    if kind == 'poisson_at_least':
+                        bonus['threshold'] = step['threshold']
+                bonuses.append(bonus)
+        return multiplier, bonuses
+
+    @staticmethod
+    def _rate(kind: str, step: dict, projections: pd.DataFrame, elements: pd.DataFrame | None,
+              history) -> np.ndarray:
+        """Full-game event rate a count step is based on, before scaling by xMins."""
+        if kind == 'per_90':
+            minutes = elements['minutes'].to_numpy(dtype=float)
+            stat = elements[step['per_90']].to_numpy(dtype=float)
+            eligible = (minutes >= step.get('min_minutes', 0)) & (minutes > 0)
+            return np.where(eligible, stat / minutes * 90, 0)
+        return history.mean_per_appearance(step[kind], projections['ID'].to_numpy())
+
+    @staticmethod
+    def _where(where: dict, projections: pd.DataFrame, elements: pd.DataFrame | None) -> np.ndarray | None:
+        """Combine a step's conditions into one boolean mask; None when unconditional."""
+        mask = None
+
+        def narrow(condition):
+            nonlocal mask
+            condition = np.asarray(condition, dtype=bool)
+            mask = condition if mask is None else mask & condition
+
+        if 'team' in where:
+            narrow(projections['Team'].isin(where['team']))
+        if 'position' in where:
+            narrow(projections['Position'].isin(where['position']))
+        if 'min_cost' in where:
+            narrow(projections['Cost'] >= where['min_cost'])
+        if 'max_cost' in where:
+            narrow(projections['Cost'] <= where['max_cost'])
+        if 'home' in where:
+            is_home = projections['Opponent'].astype(str).str.contains('(H)', regex=False, na=False)
+            narrow(is_home == bool(where['home']))
+        if 'joined_after' in where:
+            joined = pd.to_datetime(elements['team_join_date'], errors='coerce')
+            narrow(joined > pd.Timestamp(where['joined_after']))
+        if 'max_age' in where:
+            narrow(_age_on(elements['birth_date'], pd.Timestamp(where['age_on'])) <= where['max_age'])
+        return mask
+
+
+def _points(points, projections: pd.DataFrame):
+    """A scalar, or a per-row array from a {position: points} map (0 for unlisted positions)."""
+    if isinstance(points, dict):
+        return projections['Position'].map(points).fillna(0).to_numpy(dtype=float)
+    return float(points)
+
+
+def _age_on(birth_dates: pd.Series, ref_date: pd.Timestamp) -> pd.Series:
+    """Age in whole years on ref_date; NaN where the birth date is unknown."""
+    birth_date = pd.to_datetime(birth_dates, errors='coerce')
+    birthday_pending = (
+        (birth_date.dt.month > ref_date.month)
+        | ((birth_date.dt.month == ref_date.month) & (birth_date.dt.day > ref_date.day))
+    )
+    return ref_date.year - birth_date.dt.year - birthday_pending
+
+
+@lru_cache(maxsize=None)
+def load_rule_specs(path: str = RULES_PATH) -> dict:
+    """
+    Load every gameweek's rule spec from YAML.
+
+    Args:
+        path (str, optional): Spec file. Defaults to RULES_PATH.
+
+    Returns:
+        dict: 'GW{n}' -> spec. Empty if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return yaml.safe_load(f) or {}
+
+
+def has_rule_spec(gameweek: int, path: str = RULES_PATH) -> bool:
+    """Whether rules.yaml defines the given gameweek."""
+    return f'GW{gameweek}' in load_rule_specs(path)
+
+
+@lru_cache(maxsize=None)
+def compile_rule(gameweek: int, path: str = RULES_PATH) -> CompiledRule:
+    """
+    Compile one gameweek's spec, caching the result.
+
+    Args:
+        gameweek (int): Gameweek number.
+        path (str, optional): Spec file. Defaults to RULES_PATH.
+
+    Returns:
+        CompiledRule: The validated rule.
+    """
+    specs = load_rule_specs(path)
+    try:
+        spec = specs[f'GW{gameweek}']
+    except KeyError:
+        raise KeyError(f"No rule spec for GW{gameweek} in {path}") from None
+    return CompiledRule(gameweek, spec)
+
+
+def apply_rule_spec(gameweek: int, projections: pd.DataFrame, context: RunContext | None = None,
+                    path: str = RULES_PATH) -> pd.DataFrame:
+    """
+    Apply a gameweek's declarative rules to player projections.
+
+    Args:
+        gameweek (int): Gameweek number, matching a GW{n} entry in rules.yaml.
+        projections (pd.DataFrame): Player projections.
+        context (RunContext, optional): Shared run context for rules that read
+            bootstrap fields or season history.
+        path (str, optional): Spec file. Defaults to RULES_PATH.
+
+    Returns:
+        pd.DataFrame: Copy of projections with updated Predicted_Points.
+    """
+    return compile_rule(gameweek, path).apply(projections, context)
@@ -0,0 +1,137 @@
+import importlib
+import inspect
+import os
+import subprocess
+import sys
+
+from utils.trace import span
+
+# Directory holding the hand-written gw{n}.py rule modules
+RULES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Season directory (e.g. '2025-26'), put on sys.path of import-report subprocesses
+SEASON_DIR = os.path.dirname(os.path.dirname(RULES_DIR))
+
+_rules = {}
+
+
+def rule_module_name(gameweek: int) -> str | None:
+    """Dotted name of a gameweek's hand-written module, or None if it has none."""
+    if os.path.exists(os.path.join(RULES_DIR, f'gw{gameweek}.py')):
+        return f'utils.rules.gw{gameweek}'
+    return None
+
+
+def get_rule(gameweek: int):
+    """
+    Return a gameweek's rule, importing it on first use.
+
+    Nothing is imported until a gameweek is asked for, so a run only pays for
+    the rule it applies and that rule's own dependencies (e.g. FBref scraping
+    for GW3). A hand-written gw{n}.py module wins; otherwise the GW{n} entry
+    of data/rules.yaml is used.
+
+    Args:
+        gameweek (int): Gameweek number.
+
+    Returns:
+        Callable[[pd.DataFrame, RunContext | None], pd.DataFrame]: The rule,
+            accepting a context whether or not the underlying function does.
+
+    Raises:
+        KeyError: If the gameweek has neither a module nor a spec.
+    """
+    if gameweek in _rules:
+        return _rules[gameweek]
+
+    module_name = rule_module_name(gameweek)
+    if module_name is not None:
+        rule = getattr(importlib.import_module(module_name), f'gw{gameweek}_rules')
+        if 'context' not in inspect.signature(rule).parameters:
+            rule = _ignore_context(rule)
+    else:
+        from utils.rule_engine import compile_rule
+        rule = compile_rule(gameweek).apply
+
+    _rules[gameweek] = rule
+    return rule
+
+
+def _ignore_context(rule):
+    def apply(projections, context=None):
+        return rule(projections)
+    apply.__doc__ = rule.__doc__
+    return apply
+
+
+def apply_rules(gameweek: int, projections, context=None):
+    """
+    Apply a gameweek's challenge rules to player projections.
+
+    Args:
+        gameweek (int): Gameweek number.
+        projections (pd.DataFrame): Player projections.
+        context (RunContext, optional): Shared run context; only used by rules
+            that read bootstrap fields or season history.
+
+    Returns:
+        pd.DataFrame: Adjusted projections.
+    """
+    with span(f'rules.gw{gameweek}'):
+        return get_rule(gameweek)(projections, context)
+
+
+def import_costs(gameweek: int) -> dict[str, float]:
+    """
+    Measure the cold import cost of one gameweek's rule.
+
+    Runs `get_rule(gameweek)` in a fresh interpreter under `-X importtime`
+    and attributes each module's own import time to its top-level package.
+
+    Args:
+        gameweek (int): Gameweek number.
+
+    Returns:
+        dict[str, float]: Top-level package -> milliseconds, most expensive first.
+
+    Raises:
+        RuntimeError: If the rule cannot be imported (e.g. a missing optional
+            dependency).
+    """
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [SEASON_DIR, os.environ.get('PYTHONPATH')]))}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'from utils.rules import get_rule; get_rule({gameweek})'],
+        capture_output=True, text=True, env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    costs = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, _, name = (field.strip() for field in line.split(':', 1)[1].split('|'))
+        if not self_us.isdigit():
+            continue  # header row
+        package = name.split('.')[0]
+        costs[package] = costs.get(package, 0.0) + int(self_us) / 1000
+    return dict(sorted(costs.items(), key=lambda item: item[1], reverse=True))
+
+
+def print_import_report(gameweeks: list[int], top: int = 5) -> None:
+    """
+    Print the cold import cost of each gameweek's rule and its heaviest packages.
+
+    Args:
+        gameweeks (list[int]): Gameweeks to measure, each in its own interpreter.
+        top (int, optional): Packages listed per gameweek. Defaults to 5.
+    """
+    print(f"{'GW':>4}  {'import ms':>9}  heaviest packages")
+    for gameweek in gameweeks:
+        try:
+            costs = import_costs(gameweek)
+        except RuntimeError as e:
+            print(f"{gameweek:>4}  {'failed':>9}  {e}")
+            continue
+        heaviest = ', '.join(f"{package} {ms:.0f}" for package, ms in list(costs.items())[:top])
+        print(f"{gameweek:>4}  {sum(costs.values()):>9.0f}  {heaviest}")
@@ -1,7 +1,8 @@
 import pandas as pd
-import soccerdata as sd
 import numpy as np
-from fuzzywuzzy import fuzz, process
+
+from utils.fbref import load_stats
+from utils.identity import match_player_columns
 
 def gw10_rules(projections: pd.DataFrame) -> pd.DataFrame:
     """
@@ -62,21 +63,15 @@ def gw10_rules(projections: pd.DataFrame) -> pd.DataFrame:
         Returns:
             pd.DataFrame: DataFrame with columns 'Player' and 'xG_per90'.
         """
-        fbref = sd.FBref(leagues=["ENG-Premier League"], seasons=[season])
+        # Standard stats for Minutes and shooting stats for xG, loaded together
+        stats = load_stats(["standard", "shooting"], season=season)
         
-        # Get standard player stats for Minutes
-        player_stats = fbref.read_player_season_stats(stat_type="standard")
-        player_stats = player_stats.reset_index()
-        minutes_data = player_stats[[("player", ""), ("Playing Time", "Min")]].copy()
+        minutes_data = stats["standard"][["player", "Playing Time_Min"]].copy()
         minutes_data.columns = ["Player", "Minutes"]
         
-        # Get shooting player stats for xG
-        shooting_stats = fbref.read_player_season_stats(stat_type="shooting")
-        shooting_stats = shooting_stats.reset_index()
-        
         # Access xG column
         try:
-            xg_data = shooting_stats[[("player", ""), ("Expected", "xG")]].copy()
+            xg_data = stats["shooting"][["player", "Expected_xG"]].copy()
         except KeyError:
             # Fallback if the multi-index structure is different
             raise ValueError("FBref 'Expected xG' column not found.")
@@ -95,38 +90,13 @@ def gw10_rules(projections: pd.DataFrame) -> pd.DataFrame:
         
         return combined_data[['Player', 'xG_per90']]
     
-    def find_best_match(name: str, choices: list[str], threshold: int = 50) -> tuple[str | None, int]:
-        """
-        Uses fuzzy string matching to find the best match for a name.
-
-        Args:
-            name (str): The name to match.
-            choices (list[str]): The list of possible names.
-            threshold (int): Minimum fuzzy score required for a match.
-
-        Returns:
-            tuple[str | None, int]: The best matching name and its score.
-        """
-        if pd.isna(name):
-            return None, 0
-        match = process.extractOne(name, choices, scorer=fuzz.ratio)
-        if match and match[1] >= threshold:
-            return match[0], match[1]
-        return None, 0
-    
     # 1. Fetch and merge player xG rate
     xg_data = get_player_xg_rate()
     enhanced_projections = projections.copy()
-    fbref_players = xg_data['Player'].tolist()
-    enhanced_projections['fbref_xG_per90'] = 0.0
     
-    # Iterate and fuzzy-match to populate xG rate
-    for idx, row in enhanced_projections.iterrows():
-        fuzzy_name = row['Fuzzy']
-        best_match, score = find_best_match(fuzzy_name, fbref_players)
-        if best_match:
-            fbref_row = xg_data[xg_data['Player'] == best_match].iloc[0]
-            enhanced_projections.at[idx, 'fbref_xG_per90'] = fbref_row['xG_per90']
+    # Join xG rate through the identity map, fuzzy-matching only new players
+    matched = match_player_columns(enhanced_projections, xg_data, ['xG_per90'])
+    enhanced_projections['fbref_xG_per90'] = matched['xG_per90'].to_numpy()
     
     # 2. Calculate Expected Goals (E_goals)
     
@@ -1,8 +1,9 @@
 import pandas as pd
-import soccerdata as sd
 import numpy as np
-from scipy.stats import binom
-from fuzzywuzzy import fuzz, process
+
+from utils.fbref import load_stats
+from utils.identity import match_player_columns
+from utils.probability import binomial_at_least
 
 def gw12_rules(projections: pd.DataFrame) -> pd.DataFrame:
     """
@@ -13,7 +14,7 @@ def gw12_rules(projections: pd.DataFrame) -> pd.DataFrame:
         - Calculates historical pass completion rate (p) and attempts per 90.
         - Derives expected pass attempts (n) based on projected minutes (xMins).
         - Models the probability of achieving >= 90% accuracy using the 
-          Binomial Survival Function (1 - CDF).
+          Binomial Survival Function (1 - CDF), vectorised over all players.
         - Adds Expected Points (xPts) = 6 * Probability.
 
     Args:
@@ -24,59 +25,30 @@ def gw12_rules(projections: pd.DataFrame) -> pd.DataFrame:
     """
     passing_data = get_passing_data_with_minutes()
     
-    # Helper to find matches
-    def find_best_match(name: str, choices: list[str], threshold: int = 50) -> tuple[str | None, int]:
-        if pd.isna(name):
-            return None, 0
-        match = process.extractOne(name, choices, scorer=fuzz.ratio)
-        if match and match[1] >= threshold:
-            return match[0], match[1]
-        return None, 0
-
     enhanced_projections = projections.copy()
-    fbref_players = passing_data['Player'].tolist()
-    
-    # Initialize mapping columns
-    enhanced_projections['hist_completion_rate'] = 0.0
-    enhanced_projections['hist_att_per_90'] = 0.0
 
     # Map FBRef data to projections
-    for idx, row in enhanced_projections.iterrows():
-        fuzzy_name = row.get('Fuzzy', row.get('Player')) # Fallback to Player if Fuzzy missing
-        best_match, score = find_best_match(fuzzy_name, fbref_players)
-        
-        if best_match:
-            stats = passing_data[passing_data['Player'] == best_match].iloc[0]
-            enhanced_projections.at[idx, 'hist_completion_rate'] = stats['Completion_Rate']
-            enhanced_projections.at[idx, 'hist_att_per_90'] = stats['Att_Per_90']
+    matched = match_player_columns(enhanced_projections, passing_data, ['Completion_Rate', 'Att_Per_90'])
+    enhanced_projections['hist_completion_rate'] = matched['Completion_Rate'].to_numpy()
+    enhanced_projections['hist_att_per_90'] = matched['Att_Per_90'].to_numpy()
 
     # Calculate expected attempts for the specific gameweek
     enhanced_projections['expected_att_gw'] = (
         enhanced_projections['hist_att_per_90'] * (enhanced_projections['xMins'] / 90)
     )
 
-    def calculate_challenge_probability(row):
-        n = row['expected_att_gw']
-        p = row['hist_completion_rate']
-        
-        # Rule constraint: Minimum 30 passes attempted
-        # If expected attempts are significantly below 30, probability approaches 0
-        if n < 30:
-            return 0.0
-            
-        # Calculate required successes (k) to hit 90%
-        k_target = np.ceil(0.90 * n)
-        
-        # Binomial Survival Function: P(X >= k) given n trials and probability p
-        # We use integer casting for n as binomial is discrete
-        prob = binom.sf(k_target - 1, int(n), p)
-        return prob
-
-    # Apply probability model
-    enhanced_projections['challenge_prob'] = enhanced_projections.apply(
-        calculate_challenge_probability, axis=1
+    # Rule constraint: minimum 30 passes attempted. If expected attempts are
+    # below 30, probability is taken as 0. Otherwise P(X >= k) for k = 90% of
+    # n attempts, using integer n as the binomial is discrete.
+    n = enhanced_projections['expected_att_gw'].to_numpy(dtype=float)
+    p = enhanced_projections['hist_completion_rate'].to_numpy(dtype=float)
+    eligible = n >= 30
+    trials = np.where(eligible, n, 0).astype(int)
+    k_target = np.ceil(0.90 * n)
+    enhanced_projections['challenge_prob'] = np.where(
+        eligible, binomial_at_least(k_target, trials, p), 0.0
     )
-    
+
     # Calculate and apply expected points
     enhanced_projections['possession_xpts'] = enhanced_projections['challenge_prob'] * 6
     
@@ -93,24 +65,18 @@ def gw12_rules(projections: pd.DataFrame) -> pd.DataFrame:
 
     return enhanced_projections
 
-def get_passing_data():
+def get_passing_data(passing: pd.DataFrame):
     """
-    Fetches passing statistics from FBRef via Soccerdata.
+    Extracts total passing statistics from FBRef 'passing' stats.
     
+    Args:
+        passing (pd.DataFrame): Flattened FBRef passing stats (utils.fbref).
+
     Returns:
         pd.DataFrame: DataFrame with 'Player', 'Total_Att', 'Total_Cmp'.
     """
-    fbref = sd.FBref(leagues=["ENG-Premier League"], seasons=["2526"], no_cache=True)
-    
-    # Stat type 'passing' returns MultiIndex columns (Total, Short, Medium, Long)
-    passing = fbref.read_player_season_stats(stat_type="passing")
-    
-    # Flatten columns or extract specific tuples
-    # Standard structure: ('Total', 'Cmp'), ('Total', 'Att')
-    passing = passing.loc[:, [('Total', 'Cmp'), ('Total', 'Att')]]
-    passing.columns = ['Total_Cmp', 'Total_Att']
-    
-    passing = passing.reset_index()
+    # Flattened columns of ('Total', 'Cmp') and ('Total', 'Att')
+    passing = passing[['league', 'season', 'team', 'player', 'Total_Cmp', 'Total_Att']].copy()
     
     # Clean player names
     passing['player'] = passing['player'].str.replace(r'\s\(pen\)$', '', regex=True)
@@ -118,18 +84,17 @@ def get_passing_data():
     
     return passing
 
-def get_minutes_played():
+def get_minutes_played(stats: pd.DataFrame):
     """
-    Fetches minutes played data from FBRef.
+    Extracts minutes played from FBRef 'standard' stats.
     
+    Args:
+        stats (pd.DataFrame): Flattened FBRef standard stats (utils.fbref).
+
     Returns:
         pd.DataFrame: DataFrame with 'Player' and 'Minutes'.
     """
-    fbref = sd.FBref(leagues=["ENG-Premier League"], seasons=["2526"], no_cache=True)
-    stats = fbref.read_player_season_stats(stat_type="standard")
-    
-    stats = stats.reset_index()
-    stats = stats[[("player", ""), ("Playing Time", "Min")]]
+    stats = stats[["player", "Playing Time_Min"]].copy()
     stats.columns = ["Player", "Minutes"]
     
     # Clean player names
@@ -144,8 +109,9 @@ def get_passing_data_with_minutes():
     Returns:
         pd.DataFrame: merged data with 'Att_Per_90' and 'Completion_Rate'.
     """
-    passing = get_passing_data()
-    minutes = get_minutes_played()
+    stats = load_stats(["passing", "standard"])
+    passing = get_passing_data(stats["passing"])
+    minutes = get_minutes_played(stats["standard"])
     
     combined = passing.merge(minutes, on='Player', how='left')
     combined['Minutes'] = combined['Minutes'].fillna(0)
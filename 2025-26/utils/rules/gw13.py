@@ -1,7 +1,8 @@
 import pandas as pd
-import soccerdata as sd
 import numpy as np
-from fuzzywuzzy import fuzz, process
+
+from utils.fbref import load_stats
+from utils.identity import match_player_columns
 
 def gw13_rules(projections: pd.DataFrame) -> pd.DataFrame:
     """
@@ -22,29 +23,11 @@ def gw13_rules(projections: pd.DataFrame) -> pd.DataFrame:
     """
     recovery_data = get_recovery_data_with_minutes()
     
-    # Helper to find matches
-    def find_best_match(name: str, choices: list[str], threshold: int = 50) -> tuple[str | None, int]:
-        if pd.isna(name):
-            return None, 0
-        match = process.extractOne(name, choices, scorer=fuzz.ratio)
-        if match and match[1] >= threshold:
-            return match[0], match[1]
-        return None, 0
-
     enhanced_projections = projections.copy()
-    fbref_players = recovery_data['Player'].tolist()
-    
-    # Initialize mapping column
-    enhanced_projections['hist_recov_per_90'] = 0.0
 
     # Map FBRef data to projections
-    for idx, row in enhanced_projections.iterrows():
-        fuzzy_name = row.get('Fuzzy', row.get('Player'))
-        best_match, score = find_best_match(fuzzy_name, fbref_players)
-        
-        if best_match:
-            stats = recovery_data[recovery_data['Player'] == best_match].iloc[0]
-            enhanced_projections.at[idx, 'hist_recov_per_90'] = stats['Recov_Per_90']
+    matched = match_player_columns(enhanced_projections, recovery_data, ['Recov_Per_90'])
+    enhanced_projections['hist_recov_per_90'] = matched['Recov_Per_90'].to_numpy()
 
     # Calculate expected recoveries for the specific gameweek
     # Formula: (Recoveries/90) * (xMins/90) * 90 -> (Recoveries/90) * xMins
@@ -66,29 +49,23 @@ def gw13_rules(projections: pd.DataFrame) -> pd.DataFrame:
 
     return enhanced_projections
 
-def get_recovery_data():
+def get_recovery_data(misc: pd.DataFrame):
     """
-    Fetches miscellaneous statistics (including recoveries) from FBRef via Soccerdata.
+    Extracts recoveries from FBRef miscellaneous statistics.
     
+    Args:
+        misc (pd.DataFrame): Flattened FBRef misc stats (utils.fbref).
+
     Returns:
         pd.DataFrame: DataFrame with 'Player' and 'Recov'.
     """
-    fbref = sd.FBref(leagues=["ENG-Premier League"], seasons=["2526"], no_cache=True)
-    
-    # Stat type 'misc' contains the 'Recov' column under 'Performance'
-    misc = fbref.read_player_season_stats(stat_type="misc")
-    
-    # Extract specific column: ('Performance', 'Recov')
-    # Use column intersection to avoid errors if structure varies slightly
-    if ('Performance', 'Recov') in misc.columns:
-        misc = misc.loc[:, [('Performance', 'Recov')]]
-        misc.columns = ['Recov']
+    # Stat type 'misc' contains the 'Recov' column under 'Performance'.
+    # Fall back to any '<group>_Recov' column if the structure differs.
+    if 'Performance_Recov' in misc.columns:
+        recov_col = 'Performance_Recov'
     else:
-        # Fallback search if MultiIndex structure differs
-        misc = misc.xs('Recov', level=1, axis=1, drop_level=False)
-        misc.columns = ['Recov']
-    
-    misc = misc.reset_index()
+        recov_col = next(col for col in misc.columns if col.endswith('_Recov'))
+    misc = misc[['league', 'season', 'team', 'player', recov_col]].rename(columns={recov_col: 'Recov'})
     
     # Clean player names
     misc['player'] = misc['player'].str.replace(r'\s\(pen\)$', '', regex=True)
@@ -96,18 +73,17 @@ def get_recovery_data():
     
     return misc
 
-def get_minutes_played():
+def get_minutes_played(stats: pd.DataFrame):
     """
-    Fetches minutes played data from FBRef.
+    Extracts minutes played from FBRef 'standard' stats.
     
+    Args:
+        stats (pd.DataFrame): Flattened FBRef standard stats (utils.fbref).
+
     Returns:
         pd.DataFrame: DataFrame with 'Player' and 'Minutes'.
     """
-    fbref = sd.FBref(leagues=["ENG-Premier League"], seasons=["2526"], no_cache=True)
-    stats = fbref.read_player_season_stats(stat_type="standard")
-    
-    stats = stats.reset_index()
-    stats = stats[[("player", ""), ("Playing Time", "Min")]]
+    stats = stats[["player", "Playing Time_Min"]].copy()
     stats.columns = ["Player", "Minutes"]
     
     # Clean player names
@@ -122,8 +98,9 @@ def get_recovery_data_with_minutes():
     Returns:
         pd.DataFrame: merged data with 'Recov_Per_90'.
     """
-    recoveries = get_recovery_data()
-    minutes = get_minutes_played()
+    stats = load_stats(["misc", "standard"])
+    recoveries = get_recovery_data(stats["misc"])
+    minutes = get_minutes_played(stats["standard"])
     
     combined = recoveries.merge(minutes, on='Player', how='left')
     combined['Minutes'] = combined['Minutes'].fillna(0)
@@ -1,5 +1,8 @@
 import pandas as pd
 
+from utils.rule_engine import apply_rule_spec
+
+
 def gw14_rules(projections: pd.DataFrame) -> pd.DataFrame:
     """
     Apply Gameweek 14 "Value Creators" rules to player projections.
@@ -7,6 +10,9 @@ def gw14_rules(projections: pd.DataFrame) -> pd.DataFrame:
     Rules:
         - Double Points for Midfielders priced at 7m or under.
 
+    The scoring is declared under GW14 in data/rules.yaml and evaluated by
+    utils.rule_engine.
+
     Args:
         projections (pd.DataFrame): DataFrame of player projections containing
                                     'Position', 'Cost', and 'Predicted_Points' columns.
@@ -14,15 +20,4 @@ def gw14_rules(projections: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Updated DataFrame with modified 'Predicted_Points'.
     """
-
-    # Define the criteria for the bonus
-    is_midfielder = projections["Position"] == "Midfielder"
-    is_cost_eligible = projections["Cost"] <= 7.0
-
-    # Combine criteria to find the players who should have their points doubled
-    players_to_double = is_midfielder & is_cost_eligible
-
-    # Apply the double points multiplier
-    projections.loc[players_to_double, "Predicted_Points"] *= 2
-
-    return projections
\ No newline at end of file
+    return apply_rule_spec(14, projections)
@@ -1,5 +1,8 @@
 import pandas as pd
 
+from utils.rule_engine import apply_rule_spec
+
+
 def gw16_rules(projections: pd.DataFrame) -> pd.DataFrame:
     """
     Apply Gameweek 16 "Striker Deal" rules to player projections.
@@ -14,19 +17,4 @@ def gw16_rules(projections: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: New DataFrame with updated 'Predicted_Points'.
     """
-    required_cols = {"Position", "Cost", "Predicted_Points"}
-    if not required_cols.issubset(projections.columns):
-        missing = required_cols - set(projections.columns)
-        raise ValueError(f"Missing required columns: {missing}")
-
-    # Avoid in-place modification to preserve original projections.
-    proj = projections.copy()
-
-    # Hardcoded cost column 'Cost' to reflect deadline prices.
-    is_forward = proj["Position"] == "Forward"
-    is_cost_eligible = proj["Cost"] <= 7.5
-    eligible = is_forward & is_cost_eligible
-
-    proj.loc[eligible, "Predicted_Points"] *= 2
-
-    return proj
+    return apply_rule_spec(16, projections)
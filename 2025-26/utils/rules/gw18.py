@@ -1,9 +1,10 @@
-import requests
 import pandas as pd
 
+from utils.context import RunContext
+
 def gw18_rules(
     projections: pd.DataFrame, 
-    api_url: str = "https://fplchallenge.premierleague.com/api/bootstrap-static/",
+    context: RunContext | None = None,
     min_minutes: int = 300
 ) -> pd.DataFrame:
     """
@@ -14,31 +15,22 @@ def gw18_rules(
 
     Args:
         projections (pd.DataFrame): DataFrame of player projections.
-        api_url (str, optional): API endpoint for player data.
-            Defaults to Premier League bootstrap-static.
+        context (RunContext, optional): Shared run context holding the
+            bootstrap-static elements; a new one is created when omitted.
         min_minutes (int, optional): Minimum historical minutes required to 
             calculate a valid rate. Defaults to 300.
 
     Returns:
         pd.DataFrame: Updated DataFrame with modified Predicted_Points.
     """
-    response = requests.get(api_url)
-    response.raise_for_status()
-    elements = response.json()["elements"]
-
-    stats_df = pd.DataFrame(elements)[["id", "minutes", "big_chances_created"]]
+    context = context or RunContext()
+    stats_df = context.element_columns(projections["ID"], ["minutes", "big_chances_created"])
 
-    # Initialise rate to zero to handle players below the minutes threshold
-    stats_df["bc_rate"] = 0.0
-    
-    # Calculate rate only for players with sufficient data to avoid sample size bias
+    # Calculate rate only for players with sufficient data to avoid sample size bias;
+    # players below the minutes threshold (or unknown to the API) get zero
     eligible_mask = stats_df["minutes"] >= min_minutes
-    stats_df.loc[eligible_mask, "bc_rate"] = (
-        stats_df.loc[eligible_mask, "big_chances_created"] / stats_df.loc[eligible_mask, "minutes"]
-    )
-
-    rate_mapping = stats_df.set_index("id")["bc_rate"]
-    projections["temp_bc_rate"] = projections["ID"].map(rate_mapping).fillna(0).round(2)
+    bc_rate = (stats_df["big_chances_created"] / stats_df["minutes"]).where(eligible_mask, 0.0)
+    projections["temp_bc_rate"] = bc_rate.fillna(0).round(2)
 
     # Apply +6 points for every expected Big Chance Created
     # Expected Big Chances = (Historical Rate) * (Projected Minutes)
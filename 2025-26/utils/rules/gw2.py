@@ -1,5 +1,8 @@
 import pandas as pd
 
+from utils.rule_engine import apply_rule_spec
+
+
 def gw2_rules(projections: pd.DataFrame) -> pd.DataFrame:
     """
     Apply Gameweek 2 rules to player projections.
@@ -7,12 +10,13 @@ def gw2_rules(projections: pd.DataFrame) -> pd.DataFrame:
     Rules:
         - If a player belongs to a promoted team, double their Predicted_Points.
 
+    The scoring is declared under GW2 in data/rules.yaml and evaluated by
+    utils.rule_engine.
+
     Args:
         projections (pd.DataFrame): DataFrame of player projections.
 
     Returns:
         pd.DataFrame: Updated DataFrame with modified Predicted_Points.
     """
-    promoted_teams = ["Sunderland", "Leeds", "Burnley"]
-    projections.loc[projections["Team"].isin(promoted_teams), "Predicted_Points"] *= 2
-    return projections
+    return apply_rule_spec(2, projections)
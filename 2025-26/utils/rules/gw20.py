@@ -1,7 +1,10 @@
 import pandas as pd
-import requests
 
-def gw20_rules(projections: pd.DataFrame, min_minutes: int = 300) -> pd.DataFrame:
+from utils.context import RunContext
+from utils.rule_engine import apply_rule_spec
+
+
+def gw20_rules(projections: pd.DataFrame, context: RunContext | None = None) -> pd.DataFrame:
     """
     Apply Gameweek 20 'Clean Start' rules to player projections.
 
@@ -16,59 +19,16 @@ def gw20_rules(projections: pd.DataFrame, min_minutes: int = 300) -> pd.DataFram
     - Midfielder Clean Sheet: 1 pt -> Extra 1 pt
     - Forward Clean Sheet: 0 pts -> Extra 0 pts
 
+    The scoring is declared under GW20 in data/rules.yaml and evaluated by
+    utils.rule_engine.
+
     Args:
         projections (pd.DataFrame): DataFrame of player projections containing
             'ID', 'xMins', 'Position', and 'Predicted_Points'.
-        min_minutes (int, optional): Minimum historical minutes required to 
-            calculate a valid rate. Defaults to 300.
+        context (RunContext, optional): Shared run context holding the
+            bootstrap-static elements; a new one is created when omitted.
 
     Returns:
         pd.DataFrame: Updated DataFrame with modified Predicted_Points.
     """
-    # Fetch bootstrap static data to get clean sheets
-    url = "https://fantasy.premierleague.com/api/bootstrap-static/"
-    response = requests.get(url)
-    response.raise_for_status()
-    data = response.json()
-    
-    elements_df = pd.DataFrame(data['elements'])
-    stats_df = elements_df[['id', 'clean_sheets', 'minutes']].copy()
-    stats_df.rename(columns={'id': 'ID'}, inplace=True)
-
-    # Merge stats into projections
-    projections = projections.merge(stats_df, on='ID', how='left')
-
-    # Calculate per-90 rates, handling division by zero and minimum minutes threshold
-    # If minutes are below threshold, the rate is 0 to avoid small sample size bias
-    projections['clean_sheets_per_90'] = projections.apply(
-        lambda row: (row['clean_sheets'] / row['minutes'] * 90) if row['minutes'] >= min_minutes else 0, axis=1
-    )
-
-    # Estimate expected clean sheets for the upcoming gameweek based on xMins
-    projections['estimated_clean_sheets'] = projections['clean_sheets_per_90'] * (projections['xMins'] / 90)
-
-    # Define clean sheet points by position
-    cs_points = {
-        "Goalkeeper": 4,
-        "Defender": 4,
-        "Midfielder": 1,
-        "Forward": 0
-    }
-    
-    # Map position to clean sheet points value
-    projections["cs_value"] = projections["Position"].map(cs_points).fillna(0)
-
-    # Calculate extra points: (Estimated Clean Sheets * Clean Sheet Points)
-    extra_points = projections["estimated_clean_sheets"] * projections["cs_value"]
-
-    projections["Predicted_Points"] += extra_points
-    
-    # Round Predicted_Points to 2 decimal places for consistency
-    projections["Predicted_Points"] = projections["Predicted_Points"].round(2)
-
-    # Clean up temporary columns
-    cols_to_drop = [
-        "clean_sheets", "minutes", "clean_sheets_per_90", 
-        "estimated_clean_sheets", "cs_value"
-    ]
-    return projections.drop(columns=cols_to_drop, errors='ignore')
+    return apply_rule_spec(20, projections, context)
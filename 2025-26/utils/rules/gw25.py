@@ -1,5 +1,8 @@
 import pandas as pd
 
+from utils.rule_engine import apply_rule_spec
+
+
 def gw25_rules(projections: pd.DataFrame) -> pd.DataFrame:
     """
     Apply Gameweek 25 rules to player projections.
@@ -7,13 +10,13 @@ def gw25_rules(projections: pd.DataFrame) -> pd.DataFrame:
     Rules:
         - Double Points for Brighton and Crystal Palace players.
 
+    The scoring is declared under GW25 in data/rules.yaml and evaluated by
+    utils.rule_engine.
+
     Args:
         projections (pd.DataFrame): DataFrame of player projections.
 
     Returns:
         pd.DataFrame: Updated DataFrame with modified Predicted_Points.
     """
-    rivalry_teams = ["Brighton", "Crystal Palace"]
-    projections.loc[projections["Team"].isin(rivalry_teams), "Predicted_Points"] *= 2
-
-    return projections
+    return apply_rule_spec(25, projections)
@@ -1,5 +1,8 @@
 import pandas as pd
 
+from utils.rule_engine import apply_rule_spec
+
+
 def gw27_rules(projections: pd.DataFrame) -> pd.DataFrame:
     """
     Apply Gameweek 27 rules to player projections.
@@ -8,14 +11,13 @@ def gw27_rules(projections: pd.DataFrame) -> pd.DataFrame:
         - Double points for Nottingham Forest and Liverpool players.
         - Note: Constraints for budget and max players per club must be handled by the optimiser.
 
+    The scoring is declared under GW27 in data/rules.yaml and evaluated by
+    utils.rule_engine.
+
     Args:
         projections (pd.DataFrame): DataFrame of player projections.
 
     Returns:
         pd.DataFrame: Updated DataFrame with modified Predicted_Points.
     """
-    # Target teams for the 'Old Foes' challenge multiplier
-    rivalry_teams = ["Nott'm Forest", "Liverpool"]
-    projections.loc[projections["Team"].isin(rivalry_teams), "Predicted_Points"] *= 2
-
-    return projections
+    return apply_rule_spec(27, projections)
@@ -1,5 +1,7 @@
 import pandas as pd
 
+from utils.rule_engine import apply_rule_spec
+
 
 def gw28_rules(projections: pd.DataFrame) -> pd.DataFrame:
     """
@@ -10,14 +12,13 @@ def gw28_rules(projections: pd.DataFrame) -> pd.DataFrame:
         - Up to 3 players per club (enforced by the optimiser via max_per_team constraint).
         - Unlimited budget (no budget constraint applied).
 
+    The scoring is declared under GW28 in data/rules.yaml and evaluated by
+    utils.rule_engine.
+
     Args:
         projections (pd.DataFrame): DataFrame of player projections.
 
     Returns:
         pd.DataFrame: Updated DataFrame with modified Predicted_Points.
     """
-    # Target teams for the 'Midlands Clash' challenge multiplier
-    midlands_teams = ["Wolves", "Aston Villa"]
-    projections.loc[projections["Team"].isin(midlands_teams), "Predicted_Points"] *= 2
-
-    return projections
+    return apply_rule_spec(28, projections)
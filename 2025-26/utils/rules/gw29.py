@@ -1,70 +1,43 @@
-import logging
-import time
-
+import numpy as np
 import pandas as pd
-import requests
 
-logger = logging.getLogger(__name__)
+from utils.context import RunContext
+from utils.history import HistoryStore, load_season_history
 
-ELEMENT_SUMMARY_URL = "https://fplchallenge.premierleague.com/api/element-summary/{id}/"
 BONUS_POINTS_FOR_90 = 6
-REQUEST_DELAY_SECONDS = 1.0
-
-
-def fetch_player_history(player_id: int) -> list[dict]:
-    """
-    Fetch the season match history for a single player from the FPL Challenge API.
-
-    Args:
-        player_id (int): The player's FPL element ID.
-
-    Returns:
-        list[dict]: List of historical match records; empty list on any request failure.
-    """
-    url = ELEMENT_SUMMARY_URL.format(id=player_id)
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.json().get("history", [])
-    except requests.RequestException as exc:
-        logger.warning("Failed to fetch element summary for player %d: %s", player_id, exc)
-        return []
 
 
-def calculate_90min_probability(history: list[dict]) -> float:
+def calculate_90min_probability(history: HistoryStore, player_ids) -> np.ndarray:
     """
-    Estimate the empirical probability of a player completing a full 90 minutes.
+    Estimate the empirical probability of each player completing a full 90 minutes.
 
-    Considers only games that have been played (team_h_score is not None) as the sample
-    space. A qualifying 90-minute appearance satisfies all three conditions:
+    Considers every finished gameweek in which the player's team had a fixture
+    as the sample space. A qualifying 90-minute gameweek satisfies all three
+    conditions:
         - minutes >= 90
         - red_cards == 0
         - substitutions_off == 0
 
-    Returns 0.0 for players with no recorded appearances, as no evidence exists
+    Returns 0.0 for players with no recorded fixtures, as no evidence exists
     to support a non-zero estimate.
 
     Args:
-        history (list[dict]): Historical match records from the element summary API.
+        history (HistoryStore): Season history store.
+        player_ids (Iterable[int]): FPL element IDs to compute the probability for.
 
     Returns:
-        float: Empirical probability in [0.0, 1.0].
+        np.ndarray: Empirical probability in [0.0, 1.0] per player.
     """
-    appearances = [g for g in history if g.get("team_h_score") is not None]
-    if not appearances:
-        return 0.0
-
-    full_90_count = sum(
-        1 for g in appearances
-        if g.get("minutes", 0) >= 90
-        and g.get("red_cards", 0) == 0
-        and g.get("substitutions_off", 0) == 0
+    return history.proportion(
+        (history.stat("minutes", player_ids) >= 90)
+        & (history.stat("red_cards", player_ids) == 0)
+        & (history.stat("substitutions_off", player_ids) == 0),
+        player_ids,
+        over="fixtures",
     )
 
-    return full_90_count / len(appearances)
 
-
-def gw29_rules(projections: pd.DataFrame) -> pd.DataFrame:
+def gw29_rules(projections: pd.DataFrame, context: RunContext | None = None) -> pd.DataFrame:
     """
     Apply Gameweek 29 '90 Minutes' challenge rules to player projections.
 
@@ -73,11 +46,10 @@ def gw29_rules(projections: pd.DataFrame) -> pd.DataFrame:
         substituted off or receiving a red card.
 
     Implementation:
-        For each player, the season-to-date match history is retrieved
-        sequentially from the FPL Challenge element summary API with a
-        1-second delay between requests. The empirical probability of
-        completing a full 90 minutes is computed from that history, then
-        the expected bonus is calculated as::
+        The season-to-date history of every player is rebuilt from the FPL
+        Challenge event live payloads (one request per gameweek). The empirical
+        probability of completing a full 90 minutes is computed from that
+        history, then the expected bonus is calculated as::
             expected_bonus = P(completes 90 mins) * 6
 
         This value is added directly to Predicted_Points.
@@ -86,30 +58,21 @@ def gw29_rules(projections: pd.DataFrame) -> pd.DataFrame:
         projections (pd.DataFrame): Player projections DataFrame. Must contain
             an 'ID' column of integer FPL element IDs and a 'Predicted_Points'
             column of floats.
+        context (RunContext, optional): Shared run context; a new one is
+            created when omitted.
 
     Returns:
         pd.DataFrame: Copy of the input DataFrame with updated Predicted_Points.
     """
-    player_ids: list[int] = projections["ID"].tolist()
-    total = len(player_ids)
-    history_map: dict[int, list[dict]] = {}
-
-    print(f"  Fetching element summaries for {total} players ({REQUEST_DELAY_SECONDS}s delay between requests)...")
-
-    for i, pid in enumerate(player_ids, start=1):
-        history_map[pid] = fetch_player_history(pid)
-        if i % 50 == 0 or i == total:
-            print(f"  Progress: {i}/{total} players fetched.")
-        if i < total:
-            time.sleep(REQUEST_DELAY_SECONDS)
+    player_ids = projections["ID"].to_numpy()
+    context = context or RunContext()
+    history = load_season_history(bootstrap=context.bootstrap)
 
-    def expected_bonus(row: pd.Series) -> float:
-        history = history_map.get(int(row["ID"]), [])
-        return calculate_90min_probability(history) * BONUS_POINTS_FOR_90
+    expected_bonus = calculate_90min_probability(history, player_ids) * BONUS_POINTS_FOR_90
 
     projections = projections.copy()
     projections["Predicted_Points"] = (
-        projections["Predicted_Points"] + projections.apply(expected_bonus, axis=1)
+        projections["Predicted_Points"] + expected_bonus
     ).round(2)
 
     return projections
@@ -1,17 +1,19 @@
+import numpy as np
 import pandas as pd
-import soccerdata as sd
-from fuzzywuzzy import fuzz, process
-from scipy.stats import poisson
+
+from utils.fbref import load_stats
+from utils.identity import match_player_columns
+from utils.probability import poisson_at_least
 
 def gw3_rules(projections: pd.DataFrame) -> pd.DataFrame:
     """
     Apply Gameweek 3 rules to player projections.
 
     Rules:
-        - Retrieve FBref defensive stats for Premier League season 25-26.
-        - Match players using fuzzy string matching.
+        - Retrieve FBref defensive stats for Premier League season 24-25 via the shared FBref cache.
+        - Match players through the persistent identity map (utils.identity).
         - Calculate defensive actions per 90 by position.
-        - Use Poisson distribution to assign expected defensive challenge points (xDCpts).
+        - Use Poisson tail probabilities (utils.probability) to assign expected defensive challenge points (xDCpts).
         - Add xDCpts to existing Predicted_Points.
 
     Args:
@@ -21,19 +23,10 @@ def gw3_rules(projections: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: Updated DataFrame with modified Predicted_Points.
     """
 
-    leagues = "ENG-Premier League"
-    season = "24-25"
-    fbref = sd.FBref(leagues=leagues, seasons=season)
-
-    # Load defense and misc stats
-    df_defense = fbref.read_player_season_stats(stat_type="defense")
-    df_misc = fbref.read_player_season_stats(stat_type="misc")
-
-    # Flatten indices and column names
-    df_defense_reset = df_defense.reset_index()
-    df_misc_reset = df_misc.reset_index()
-    df_defense_reset.columns = ["_".join(col).strip("_") for col in df_defense_reset.columns]
-    df_misc_reset.columns = ["_".join(col).strip("_") for col in df_misc_reset.columns]
+    # Load defense and misc stats (already flattened)
+    stats = load_stats(["defense", "misc"], season="24-25")
+    df_defense_reset = stats["defense"]
+    df_misc_reset = stats["misc"]
 
     # Select defense stats
     defense_cols = ["league", "season", "team", "player"]
@@ -83,71 +76,28 @@ def gw3_rules(projections: pd.DataFrame) -> pd.DataFrame:
     result_df = result_df.rename(columns=column_mapping)
 
     # Final columns of interest
-    final_columns = ["player", "90s", "TklW", "Int", "Recov", "Blocks", "Clr"]
+    final_columns = ["player", "team", "90s", "TklW", "Int", "Recov", "Blocks", "Clr"]
     filtered_df = result_df[final_columns]
 
-    def find_best_match(name: str, choices: list[str], threshold: int = 50) -> tuple[str | None, int]:
-        """Return the closest fuzzy match above threshold."""
-        if pd.isna(name):
-            return None, 0
-        match = process.extractOne(name, choices, scorer=fuzz.ratio)
-        if match and match[1] >= threshold:
-            return match[0], match[1]
-        return None, 0
-
-    # Copy projections and prepare columns
+    # Match players (blocked by club) and join their stats
     enhanced_projections = projections.copy()
-    fbref_players = filtered_df["player"].tolist()
-    for col in ["90s", "TklW", "Int", "Recov", "Blocks", "Clr"]:
-        enhanced_projections[f"fbref_{col}"] = None
-
-    # Match players
-    for idx, row in enhanced_projections.iterrows():
-        fuzzy_name = row["Fuzzy"]
-        best_match, score = find_best_match(fuzzy_name, fbref_players)
-        if best_match:
-            fbref_row = filtered_df[filtered_df["player"] == best_match].iloc[0]
-            enhanced_projections.at[idx, "fbref_90s"] = fbref_row["90s"]
-            enhanced_projections.at[idx, "fbref_TklW"] = fbref_row["TklW"]
-            enhanced_projections.at[idx, "fbref_Int"] = fbref_row["Int"]
-            enhanced_projections.at[idx, "fbref_Recov"] = fbref_row["Recov"]
-            enhanced_projections.at[idx, "fbref_Blocks"] = fbref_row["Blocks"]
-            enhanced_projections.at[idx, "fbref_Clr"] = fbref_row["Clr"]
-
-    # Fill missing values
-    fbref_stat_columns = [
-        "fbref_90s",
-        "fbref_TklW",
-        "fbref_Int",
-        "fbref_Recov",
-        "fbref_Blocks",
-        "fbref_Clr",
-    ]
+    stat_columns = ["90s", "TklW", "Int", "Recov", "Blocks", "Clr"]
+    matched = match_player_columns(
+        enhanced_projections, filtered_df, stat_columns, name_column="player", team_column="team"
+    )
+    fbref_stat_columns = [f"fbref_{col}" for col in stat_columns]
+    enhanced_projections[fbref_stat_columns] = matched.to_numpy()
     enhanced_projections[fbref_stat_columns] = enhanced_projections[fbref_stat_columns].fillna(0)
 
-    def calculate_defensive_actions(row) -> float:
-        """Return total defensive actions per 90 adjusted by position."""
-        if row["Position"] == "Goalkeeper":
-            return 0
-        if row["fbref_90s"] == 0:
-            return 0
-        # Don't include players <= 5 games worth of data as prone to variance
-        if row["fbref_90s"] <= 5.00:
-            return 0
-
-        tackles_per_90 = row["fbref_TklW"] / row["fbref_90s"]
-        int_per_90 = row["fbref_Int"] / row["fbref_90s"]
-        clr_per_90 = row["fbref_Clr"] / row["fbref_90s"]
-        blocks_per_90 = row["fbref_Blocks"] / row["fbref_90s"]
-
-        if row["Position"] == "Defender":
-            return tackles_per_90 + int_per_90 + clr_per_90 + blocks_per_90
-        recov_per_90 = row["fbref_Recov"] / row["fbref_90s"]
-        return tackles_per_90 + int_per_90 + clr_per_90 + blocks_per_90 + recov_per_90
-
-    # Calculate defensive actions per 90
-    enhanced_projections["defensive_actions_per_90"] = enhanced_projections.apply(
-        calculate_defensive_actions, axis=1
+    # Defensive actions per 90 by position; goalkeepers and players with
+    # <= 5 games worth of data (prone to variance) score nothing
+    position = enhanced_projections["Position"]
+    nineties = enhanced_projections["fbref_90s"].astype(float)
+    actions = enhanced_projections[["fbref_TklW", "fbref_Int", "fbref_Clr", "fbref_Blocks"]].astype(float).sum(axis=1)
+    actions = actions + np.where(position == "Defender", 0.0, enhanced_projections["fbref_Recov"].astype(float))
+    eligible = (position != "Goalkeeper") & (nineties > 5.00)
+    enhanced_projections["defensive_actions_per_90"] = np.where(
+        eligible, actions / nineties.where(eligible, 1.0), 0.0
     )
 
     # Drop temporary fbref columns
@@ -159,24 +109,13 @@ def gw3_rules(projections: pd.DataFrame) -> pd.DataFrame:
         enhanced_projections["defensive_actions_per_90"] * (enhanced_projections["xMins"] / 90)
     )
 
-    def calculate_challenge_xpts(row) -> float:
-        """Return expected defensive challenge points using Poisson probabilities."""
-        lambda_val = row["expected_defensive_actions"]
-        if lambda_val <= 0:
-            return 0
-
-        position = row["Position"]
-        if position == "Defender":
-            prob_reaching_threshold = 1 - poisson.cdf(9, lambda_val)
-        elif position in ["Midfielder", "Forward"]:
-            prob_reaching_threshold = 1 - poisson.cdf(11, lambda_val)
-        else:
-            prob_reaching_threshold = 0
-
-        return prob_reaching_threshold * 10
-
-    # Apply expected points calculation
-    enhanced_projections["xDCpts"] = enhanced_projections.apply(calculate_challenge_xpts, axis=1)
+    # Expected defensive challenge points: P(reaching threshold) x 10, with
+    # thresholds of 10 actions for defenders and 12 for midfielders/forwards
+    thresholds = np.select(
+        [position == "Defender", position.isin(["Midfielder", "Forward"])], [10, 12], default=0
+    )
+    prob_reaching_threshold = poisson_at_least(enhanced_projections["expected_defensive_actions"], thresholds)
+    enhanced_projections["xDCpts"] = np.where(thresholds > 0, prob_reaching_threshold, 0.0) * 10
 
     # Update predicted points
     if "Predicted_Points" in enhanced_projections.columns:
@@ -1,7 +1,8 @@
 import pandas as pd
-import soccerdata as sd
 import numpy as np
-from fuzzywuzzy import fuzz, process
+
+from utils.fbref import SHOT_EVENTS, load_stats
+from utils.identity import match_player_columns
 
 def gw8_rules(projections: pd.DataFrame) -> pd.DataFrame:
     """
@@ -10,7 +11,7 @@ def gw8_rules(projections: pd.DataFrame) -> pd.DataFrame:
     Rules:
         - 6 Additional points for every expected 'big chance scored' by a player.
         - Uses big chance xG per 90 minutes multiplied by expected minutes.
-        - Matches players using fuzzy string matching.
+        - Matches players through the persistent identity map (utils.identity).
 
     Args:
         projections (pd.DataFrame): DataFrame of player projections.
@@ -27,26 +28,11 @@ def gw8_rules(projections: pd.DataFrame) -> pd.DataFrame:
         0
     )
     
-    def find_best_match(name: str, choices: list[str], threshold: int = 50) -> tuple[str | None, int]:
-        """Return the closest fuzzy match above threshold."""
-        if pd.isna(name):
-            return None, 0
-        match = process.extractOne(name, choices, scorer=fuzz.ratio)
-        if match and match[1] >= threshold:
-            return match[0], match[1]
-        return None, 0
-    
     enhanced_projections = projections.copy()
-    fbref_players = shot_data['Player'].tolist()
-    enhanced_projections['fbref_big_chance_xG_per90'] = 0.0
-    
+
     # Match each player to fbref data and populate big chance xG rate
-    for idx, row in enhanced_projections.iterrows():
-        fuzzy_name = row['Fuzzy']
-        best_match, score = find_best_match(fuzzy_name, fbref_players)
-        if best_match:
-            fbref_row = shot_data[shot_data['Player'] == best_match].iloc[0]
-            enhanced_projections.at[idx, 'fbref_big_chance_xG_per90'] = fbref_row['big_chance_xG_per90']
+    matched = match_player_columns(enhanced_projections, shot_data, ['big_chance_xG_per90'])
+    enhanced_projections['fbref_big_chance_xG_per90'] = matched['big_chance_xG_per90'].to_numpy()
     
     # Calculate expected big chance xG for this gameweek based on expected minutes
     enhanced_projections['expected_big_chance_xG_gw'] = (
@@ -70,21 +56,20 @@ def gw8_rules(projections: pd.DataFrame) -> pd.DataFrame:
     
     return enhanced_projections
 
-def get_shot_data():
+def get_shot_data(shots: pd.DataFrame):
     """
-    Gets the shot data for the season from fbref via the Soccerdata library.
-    Transforms the data into player-level statistics including total shots, xG,
-    goals scored, big chances, and big chances scored.
+    Transforms the season's fbref shot events into player-level statistics
+    including total shots, xG, goals scored, big chances, and big chances scored.
     
+    Args:
+        shots (pd.DataFrame): Flattened fbref shot events (utils.fbref).
+
     Returns:
         pd.DataFrame: DataFrame with columns: player, Total_Shots, Total_xG, 
                       Total_Scored, Total_Big_Chances, Total_Big_Chances_Scored,
                       Total_Big_Chance_xG, Avg_Big_Chance_xG.
     """
-    fbref = sd.FBref(leagues=["ENG-Premier League"], seasons=["2526"])
-    shots = fbref.read_shot_events()
-
-    shots.columns = shots.columns.droplevel(1)
+    shots = shots.copy()
 
     # Remove (pen) if present from player name
     shots['player'] = shots['player'].str.replace(r'\s\(pen\)$', '', regex=True)
@@ -117,19 +102,18 @@ def get_shot_data():
     
     return player_stats
 
-def get_minutes_played():
+def get_minutes_played(player_stats: pd.DataFrame):
     """
-    Gets the minutes played data for the season from fbref via the Soccerdata library.
+    Gets the minutes played data from the season's fbref standard stats.
     
+    Args:
+        player_stats (pd.DataFrame): Flattened fbref standard stats (utils.fbref).
+
     Returns:
         pd.DataFrame: DataFrame with minutes played data.
     """
-    fbref = sd.FBref(leagues=["ENG-Premier League"], seasons=["2526"])
-    player_stats = fbref.read_player_season_stats(stat_type="standard")
-
-    player_stats = player_stats.reset_index()
     # Extract only player name and minutes played columns
-    player_stats = player_stats[[("player", ""), ("Playing Time", "Min")]]
+    player_stats = player_stats[["player", "Playing Time_Min"]].copy()
     player_stats.columns = ["Player", "Minutes"]
 
     return player_stats
@@ -141,8 +125,9 @@ def get_shot_data_with_minutes():
     Returns:
         pd.DataFrame: DataFrame with shot statistics and minutes played combined.
     """
-    shot_data = get_shot_data()
-    minutes_data = get_minutes_played()
+    stats = load_stats([SHOT_EVENTS, "standard"])
+    shot_data = get_shot_data(stats[SHOT_EVENTS])
+    minutes_data = get_minutes_played(stats["standard"])
     
     # Merge shot statistics with minutes played on player name
     combined_data = shot_data.merge(minutes_data, on='Player', how='left')
@@ -1,7 +1,8 @@
-import requests
 import pandas as pd
 
-def gw9_rules(projections: pd.DataFrame, api_url: str = "https://fplchallenge.premierleague.com/api/bootstrap-static/") -> pd.DataFrame:
+from utils.context import RunContext
+
+def gw9_rules(projections: pd.DataFrame, context: RunContext | None = None) -> pd.DataFrame:
     """
     Apply Gameweek 9 rules to player projections.
 
@@ -12,22 +13,19 @@ def gw9_rules(projections: pd.DataFrame, api_url: str = "https://fplchallenge.pr
 
     Args:
         projections (pd.DataFrame): DataFrame of player projections.
-        api_url (str, optional): API endpoint for player data.
-            Defaults to Premier League bootstrap-static.
+        context (RunContext, optional): Shared run context holding the
+            bootstrap-static elements; a new one is created when omitted.
 
     Returns:
         pd.DataFrame: Updated DataFrame with modified Predicted_Points.
     """
 
-    response = requests.get(api_url)
-    data = response.json()["elements"]
-
-    # Create a mapping of player IDs to their join date and team ID
-    id_to_join_date = {p["id"]: p["team_join_date"] for p in data}
-    id_to_team = {p["id"]: p["team"] for p in data}
+    context = context or RunContext()
 
-    projections["team_join_date"] = projections["ID"].map(id_to_join_date)
-    projections["TeamID"] = projections["ID"].map(id_to_team)
+    # Attach each player's join date and team ID
+    elements = context.element_columns(projections["ID"], ["team_join_date", "team"])
+    projections["team_join_date"] = elements["team_join_date"]
+    projections["TeamID"] = elements["team"]
 
     # Convert join date to datetime objects
     projections["team_join_date"] = pd.to_datetime(projections["team_join_date"])
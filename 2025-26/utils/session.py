@@ -0,0 +1,204 @@
+import pulp as plp
+
+from utils.club_dp import ClubDPOptimiser
+from utils.decisions import select_player
+from utils.solver import FPLChallengeOptimiser
+from utils.trace import traced
+
+
+class OptimiserSession:
+    """
+    Long-lived optimiser for iterating on bans, forces and bounds.
+
+    The MILP is built once. Bans and forces are the solver's named
+    exclude_{i} / force_{i} constraints, so adding or removing one only
+    touches that row, and bound changes replace the named constraints they
+    own. While the constraints fit the one-player-per-club shape, solve()
+    uses the exact club DP instead, which re-solves in milliseconds; the
+    MILP is kept in step so it takes over as soon as they stop fitting, and
+    for solve_top_k(). On CBC, MILP re-solves are warm-started from the
+    previous incumbent; the default HiGHS backend re-solves from scratch,
+    which is still faster for a model this size.
+
+    Typical use from Python:
+
+        session = OptimiserSession(gw, projections, constraints, 'fpl-gw35')
+        session.solve()
+        session.ban(12)
+        session.force(87)
+        session.solve()
+    """
+
+    def __init__(self, gameweek, projections_data, constraints, problem_name, backend='highs',
+                 exclude_ids=(), force_ids=()):
+        """
+        Args:
+            gameweek (int): Gameweek being solved.
+            projections_data (pd.DataFrame): Player projections.
+            constraints (dict): Gameweek block from constraints.yaml. Copied, so
+                bound changes never leak back into the caller's dict.
+            problem_name (str): PuLP model name.
+            backend (str): 'highs' (default, lowest latency per re-solve) or 'cbc'.
+            exclude_ids (Iterable[int]): Initial banned row positions.
+            force_ids (Iterable[int]): Initial forced row positions.
+        """
+        self.projections_data = projections_data
+        self.constraints = {
+            **constraints,
+            'position_constraints': {
+                position: dict(counts)
+                for position, counts in constraints.get('position_constraints', {}).items()
+            },
+        }
+        self.ban_ids = set()
+        self.force_ids = set()
+        self.solved = False
+
+        self.club_dp = ClubDPOptimiser(gameweek, projections_data)
+        self.engine = None
+        self.solver = FPLChallengeOptimiser(gameweek, projections_data, backend=backend)
+        self.solver.setup_problem(problem_name)
+        self.solver.apply_constraints(self.constraints)
+        for i in exclude_ids:
+            self.ban(i)
+        for i in force_ids:
+            self.force(i)
+
+    def ban(self, i):
+        """Exclude a player (row position), lifting any force on them."""
+        self.unforce(i)
+        self.solver.exclude_players_constraint([i])
+        self.ban_ids.add(i)
+
+    def unban(self, i):
+        """Remove a player's exclusion."""
+        self.solver.remove_constraint(f'exclude_{i}')
+        self.ban_ids.discard(i)
+
+    def force(self, i):
+        """Force a player (row position) into the lineup, lifting any ban on them."""
+        self.unban(i)
+        self.solver.force_players_constraint([i])
+        self.force_ids.add(i)
+
+    def unforce(self, i):
+        """Remove a player's force."""
+        self.solver.remove_constraint(f'force_{i}')
+        self.force_ids.discard(i)
+
+    def set_position_bounds(self, position, min_count=None, max_count=None):
+        """
+        Replace the min/max count for a position. None removes that bound.
+
+        Args:
+            position (str): Position name, e.g. 'Defender'.
+            min_count (int, optional): New minimum number of players.
+            max_count (int, optional): New maximum number of players.
+        """
+        self.solver.remove_constraint(f'position_min_{position}')
+        self.solver.remove_constraint(f'position_max_{position}')
+        counts = {'min_count': min_count, 'max_count': max_count}
+        self.constraints['position_constraints'][position] = counts
+        self.solver.position_count_constraints({position: counts})
+
+    def set_max_per_team(self, max_per_team):
+        """Replace the per-club player limit."""
+        self.constraints['max_per_team'] = max_per_team
+        self.solver.max_players_from_same_team_constraint(max_per_team)
+
+    def set_budget(self, budget_max=None, budget_min=0):
+        """Replace the budget bounds. A budget_max of None removes the budget."""
+        self.constraints['budget_max'] = budget_max
+        self.constraints['budget_min'] = budget_min
+        self.solver.remove_constraint('budget_max')
+        self.solver.remove_constraint('budget_min')
+        if budget_max is not None:
+            self.solver.budget_constraint(budget_max, budget_min)
+
+    def solve(self):
+        """
+        Re-solve with the club DP when the constraints fit, otherwise the MILP.
+
+        Returns:
+            str: Status string, e.g. 'Optimal' or 'Infeasible'.
+        """
+        if self.club_dp.supports(self.constraints):
+            self.club_dp.solve(self.constraints, self.ban_ids, self.force_ids)
+            self.engine = self.club_dp
+            print(f"Status: {self.status} (club DP)")
+            return self.status
+
+        self.solver.solve(warm_start=self.solved)
+        self.solved = self.solver.model.status == plp.LpStatusOptimal
+        self.engine = self.solver
+        return self.status
+
+    def solve_top_k(self, k):
+        """
+        Rank the k best distinct lineups under the session's current constraints.
+
+        The pool comes from the MILP, which carries every ban, force and bound
+        change even while the club DP serves solve(). The engine's
+        selected_players, the lineup last printed, are left untouched.
+
+        Args:
+            k (int): Maximum number of lineups to return.
+
+        Returns:
+            list[dict]: Ranked lineups, as from FPLChallengeOptimiser.solve_top_k.
+        """
+        return self.solver.solve_top_k(k)
+
+    @property
+    def status(self):
+        return (self.engine or self.solver).status
+
+    def print_players_by_position(self):
+        self.engine.print_players_by_position()
+
+    @property
+    def selected_players(self):
+        return self.engine.selected_players
+
+
+@traced()
+def run_session(session):
+    """
+    Interactive loop for refining a solved lineup.
+
+    Accepts commands of the form 'ban <name>', 'unban <name>', 'force <name>'
+    and 'unforce <name>'. Names are resolved with the same fuzzy matching as
+    run_ban_force. Every change re-solves and prints the new lineup; pressing
+    enter accepts the current lineup.
+
+    Args:
+        session (OptimiserSession): A session that has already been solved once.
+    """
+    df = session.projections_data
+    actions = {
+        'ban': session.ban,
+        'unban': session.unban,
+        'force': session.force,
+        'unforce': session.unforce,
+    }
+    while True:
+        command = input("\nban/unban/force/unforce <name> (or press enter to accept): ").strip()
+        if command == '':
+            break
+
+        action, _, search_name = command.partition(' ')
+        action = action.lower()
+        if action not in actions or not search_name.strip():
+            print("Invalid command. Use e.g. 'ban Salah' or 'unforce Haaland'.")
+            continue
+
+        selected_index = select_player(df, search_name.strip(), action)
+        if selected_index is None:
+            continue
+        actions[action](df.index.get_loc(selected_index))
+        print(f"{action.capitalize()}: {df.loc[selected_index, 'Name']} (ID: {df.loc[selected_index, 'ID']}, Index: {selected_index})")
+
+        if session.solve() == 'Optimal':
+            session.print_players_by_position()
+        else:
+            print("No feasible lineup with these bans/forces. Undo a change to continue.")
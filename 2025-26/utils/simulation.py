@@ -0,0 +1,229 @@
+import numpy as np
+import pandas as pd
+
+from utils.context import RunContext
+from utils.rule_engine import compile_rule, has_rule_spec
+
+# Scenarios drawn by default, and per batch so memory stays flat however many are asked for
+DEFAULT_SCENARIOS = 100_000
+BATCH_SIZE = 25_000
+
+DEFAULT_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+class ScoreDistribution:
+    """Simulated lineup totals and their summaries."""
+
+    def __init__(self, scores: np.ndarray):
+        """
+        Args:
+            scores (np.ndarray): One simulated lineup total per scenario.
+        """
+        self.scores = np.sort(np.asarray(scores, dtype=float))
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    @property
+    def mean(self) -> float:
+        return float(self.scores.mean())
+
+    @property
+    def std(self) -> float:
+        return float(self.scores.std())
+
+    def quantiles(self, qs=DEFAULT_QUANTILES) -> dict:
+        """Quantile -> score for each of qs."""
+        return dict(zip(qs, np.quantile(self.scores, qs).tolist()))
+
+    def prob_at_least(self, x):
+        """
+        P(score ≥ x), for a single threshold or an array of them.
+
+        Args:
+            x (float | array-like): Score threshold(s).
+
+        Returns:
+            float | np.ndarray: Share of scenarios scoring at least x.
+        """
+        below = np.searchsorted(self.scores, x, side='left')
+        result = 1 - below / len(self.scores)
+        return float(result) if np.ndim(result) == 0 else result
+
+    def histogram(self, bins: int = 20) -> tuple[np.ndarray, np.ndarray]:
+        """Scenario counts and bin edges, as from np.histogram."""
+        return np.histogram(self.scores, bins=bins)
+
+
+class ScoreModel:
+    """
+    Per-player point distributions for one gameweek.
+
+    Each scenario draws every player's points independently, except that
+    teammates share team_value events:
+
+        plays   ~ Bernoulli(xMins / 90)
+        base    ~ Poisson(Predicted_Points / P(plays)) * multiplier
+        per_90, per_appearance  ~ Poisson(rate) * points
+        poisson_at_least        ~ [Poisson(rate) >= threshold] * points
+        team_value              ~ Bernoulli(value, one draw per club) * points
+
+    with every term zero when the player does not play. Dividing the base
+    by P(plays) keeps its expectation equal to Predicted_Points, and the
+    count steps see the full-game rate rather than the xMins-scaled one, so
+    the model's mean matches the (unrounded) rule engine except for
+    poisson_at_least steps, where the engine thresholds the xMins-scaled
+    rate instead of mixing over whether the player plays.
+    """
+
+    def __init__(self, projections: pd.DataFrame, multiplier: np.ndarray | None = None, bonuses: list[dict] = ()):
+        """
+        Args:
+            projections (pd.DataFrame): Player projections with ID, Team,
+                Predicted_Points and xMins.
+            multiplier (np.ndarray, optional): Per-row factor on the base
+                points, from CompiledRule.components().
+            bonuses (list[dict], optional): Bonus steps from
+                CompiledRule.components().
+
+        Raises:
+            ValueError: If projections has no xMins column, which the
+                minutes model cannot do without.
+        """
+        if 'xMins' not in projections.columns:
+            raise ValueError("Missing required columns: ['xMins']")
+        self.ids = projections['ID'].to_numpy()
+        self.rows = {player_id: row for row, player_id in enumerate(self.ids)}
+        self.play = np.clip(pd.to_numeric(projections['xMins'], errors='coerce').fillna(0).to_numpy(dtype=float) / 90.0, 0, 1)
+        points = pd.to_numeric(projections['Predicted_Points'], errors='coerce').fillna(0).to_numpy(dtype=float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.base_rate = np.where(self.play > 0, np.clip(points, 0, None) / self.play, 0)
+        self.multiplier = np.ones(len(projections)) if multiplier is None else np.asarray(multiplier, dtype=float)
+        self.teams = pd.factorize(projections['Team'])[0] if bonuses else None
+        # A step's where mask is folded into its points, and unknown rates
+        # score nothing, so sample() only sees finite rates and points
+        self.bonuses = []
+        for bonus in bonuses:
+            bonus = {**bonus, 'points': bonus['points'] if bonus['mask'] is None
+                     else np.where(bonus['mask'], bonus['points'], 0.0)}
+            if 'rate' in bonus:
+                bonus['rate'] = np.nan_to_num(bonus['rate'])
+            self.bonuses.append(bonus)
+
+    @classmethod
+    def for_gameweek(cls, gameweek: int, projections: pd.DataFrame, context: RunContext | None = None,
+                     raw: pd.DataFrame | None = None) -> 'ScoreModel':
+        """
+        Build the model for a gameweek.
+
+        When the week is declared in rules.yaml and the projections from
+        before the rule are given, each step is simulated separately.
+        Otherwise the adjusted Predicted_Points the solver used are the base.
+
+        Args:
+            gameweek (int): Gameweek number.
+            projections (pd.DataFrame): Adjusted projections the lineup was
+                solved from.
+            context (RunContext, optional): Shared run context for the rule's
+                bootstrap and history lookups.
+            raw (pd.DataFrame, optional): The same projections before the
+                gameweek's rule was applied.
+
+        Returns:
+            ScoreModel: The gameweek's model.
+        """
+        if raw is not None and has_rule_spec(gameweek):
+            multiplier, bonuses = compile_rule(gameweek).components(raw, context)
+            return cls(raw, multiplier, bonuses)
+        return cls(projections)
+
+    def lineup_rows(self, selected_players: dict) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Projection rows and score weights (2 for a captain) of a solver lineup.
+
+        Args:
+            selected_players (dict): Position -> list of player dicts with ID
+                and Captain keys, as from build_selected_players.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: Row positions and weights.
+
+        Raises:
+            ValueError: If a player is not in the projections.
+        """
+        rows, weights = [], []
+        for players in selected_players.values():
+            for player in players:
+                if player['ID'] not in self.rows:
+                    raise ValueError(f"Player {player['ID']} is not in the projections")
+                rows.append(self.rows[player['ID']])
+                weights.append(2.0 if player.get('Captain') else 1.0)
+        return np.array(rows, dtype=int), np.array(weights)
+
+    def sample(self, rows: np.ndarray, n: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        Draw n scenarios of points for the given rows.
+
+        Args:
+            rows (np.ndarray): Projection row positions.
+            n (int): Scenarios to draw.
+            rng (np.random.Generator): Random source.
+
+        Returns:
+            np.ndarray: (n, len(rows)) points per scenario and player.
+        """
+        plays = rng.random((n, len(rows))) < self.play[rows]
+        points = rng.poisson(self.base_rate[rows], (n, len(rows))) * self.multiplier[rows]
+        for bonus in self.bonuses:
+            step_points = bonus['points'][rows]
+            if not step_points.any():
+                continue
+            if bonus['kind'] == 'team_value':
+                # One draw per club, so teammates keep or lose a clean sheet together
+                clubs, club_index = np.unique(self.teams[rows], return_inverse=True)
+                events = rng.random((n, len(clubs)))[:, club_index] < bonus['value'][rows]
+            else:
+                events = rng.poisson(bonus['rate'][rows], (n, len(rows)))
+                if bonus['kind'] == 'poisson_at_least':
+                    events = events >= bonus['threshold']
+            points += events * step_points
+        return np.where(plays, points, 0.0)
+
+    def simulate(self, selected_players: dict, n: int = DEFAULT_SCENARIOS, seed: int | None = None,
+                 batch_size: int = BATCH_SIZE) -> ScoreDistribution:
+        """
+        Simulate a lineup's total, doubling the captain.
+
+        Args:
+            selected_players (dict): Position -> list of player dicts with ID
+                and Captain keys, as from build_selected_players.
+            n (int, optional): Scenarios to draw.
+            seed (int, optional): Seed for a reproducible distribution.
+            batch_size (int, optional): Scenarios drawn at a time.
+
+        Returns:
+            ScoreDistribution: The lineup's simulated totals.
+        """
+        rows, weights = self.lineup_rows(selected_players)
+        rng = np.random.default_rng(seed)
+        scores = np.empty(n)
+        for start in range(0, n, batch_size):
+            stop = min(start + batch_size, n)
+            scores[start:stop] = self.sample(rows, stop - start, rng) @ weights
+        return ScoreDistribution(scores)
+
+
+def print_score_distribution(distribution: ScoreDistribution, thresholds=()) -> None:
+    """
+    Print a simulated lineup's mean, spread, quantiles and target probabilities.
+
+    Args:
+        distribution (ScoreDistribution): Simulated totals.
+        thresholds (Iterable[float], optional): Scores to print P(score ≥ x) for.
+    """
+    print(f"\nSimulated Points ({len(distribution):,} scenarios): "
+          f"mean {distribution.mean:.2f}, std {distribution.std:.2f}")
+    quantiles = distribution.quantiles()
+    print('  ' + ', '.join(f"p{round(q * 100)}: {value:.0f}" for q, value in quantiles.items()))
+    for threshold in thresholds:
+        print(f"  P(score ≥ {threshold:g}): {distribution.prob_at_least(threshold):.1%}")
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import os
+
+# Site data format version; main.js falls back to the per-file JSON if it does not recognise it
+SITE_VERSION = 2
+
+INDEX_NAME = 'index.json'
+
+# Per-gameweek shards, named {gameweek}.{content hash}.json, under site/data/{season}/
+SHARD_DIR = 'gw'
+SHARD_HASH_LENGTH = 12
+
+# Season files the bundle is built from, keyed by the name used in the bundle
+SITE_FILES = {
+    'challenges': 'challenges.json',
+    'predicted': 'predicted_optimal.json',
+    'actual': 'actual_optimal.json',
+    'outcome': 'actual_outcome.json',
+    'pool': 'predicted_pool.json',
+}
+
+POSITION_ORDER = ('Goalkeeper', 'Defender', 'Midfielder', 'Forward')
+
+
+def site_dir(season: str) -> str:
+    return os.path.join('site', 'data', season)
+
+
+def player_ids(lineup: dict) -> set:
+    """IDs of every player in a stored lineup record."""
+    return {p['ID'] for pos in POSITION_ORDER for p in lineup['Players'].get(pos, [])}
+
+
+def lineup_overlap(predicted: dict, actual: dict) -> dict:
+    """Players shared by two lineups, as shown on the challenge cards."""
+    predicted_ids, actual_ids = player_ids(predicted), player_ids(actual)
+    shared = len(predicted_ids & actual_ids)
+    total = max(len(predicted_ids), len(actual_ids))
+    return {'shared': shared, 'total': total, 'pct': shared / total if total else 0}
+
+
+def gameweek_status(key: str, predicted: dict, actual: dict) -> str:
+    if key in predicted and key in actual:
+        return 'complete'
+    if key in predicted:
+        return 'predicted'
+    if key in actual:
+        return 'actual'
+    return 'pending'
+
+
+def summarise_season(challenges: dict, predicted: dict, actual: dict, outcome: dict | None) -> dict:
+    """
+    Precompute everything the site derives from the lineups.
+
+    Mirrors the aggregation main.js otherwise does on each render: card
+    status, player overlap, points captured against the hindsight optimum,
+    the stats strip and the standing chart series.
+
+    Args:
+        challenges (dict): challenges.json contents.
+        predicted (dict): predicted_optimal.json contents.
+        actual (dict): actual_optimal.json contents.
+        outcome (dict | None): actual_outcome.json contents, if any.
+
+    Returns:
+        dict: 'gameweeks' (per challenge key), 'stats' and 'standing'
+            (None without outcome data).
+    """
+    outcome = outcome or {}
+    gameweeks = {}
+    complete = in_progress = 0
+    captured = []
+    for key in challenges:
+        status = gameweek_status(key, predicted, actual)
+        scored = outcome.get(key, {}).get('Total_Points')
+        optimal = actual.get(key, {}).get('Total_Points')
+        entry = {'status': status}
+        if status == 'complete':
+            complete += 1
+            entry['overlap'] = lineup_overlap(predicted[key], actual[key])
+            if scored is not None:
+                entry['vs_predicted'] = scored - predicted[key]['Total_Points']
+        elif status == 'predicted':
+            in_progress += 1
+        if scored is not None and optimal is not None and optimal > 0:
+            # Share of the hindsight-optimal points actually scored
+            entry['captured'] = scored / optimal
+            if status == 'complete':
+                captured.append(entry['captured'])
+        gameweeks[key] = entry
+
+    return {
+        'gameweeks': gameweeks,
+        'stats': {
+            'challenges': len(challenges),
+            'complete': complete,
+            'in_progress': in_progress,
+            'avg_captured': sum(captured) / len(captured) if captured else None,
+        },
+        'standing': standing_series(outcome),
+    }
+
+
+def standing_series(outcome: dict) -> dict | None:
+    """Overall-rank series for the standing banner and chart, None without ranked gameweeks."""
+    keys = sorted(int(k) for k in outcome if k.lstrip('-').isdigit())
+    if not keys:
+        return None
+    total_players = outcome.get('total_players')
+    return {
+        'gameweeks': keys,
+        'overall_ranks': [(outcome[str(k)].get('Ranks') or {}).get('overall_rank') for k in keys],
+        'points': [outcome[str(k)].get('Total_Points') for k in keys],
+        'total_players': total_players if isinstance(total_players, int) else None,
+    }
+
+
+def _without_players(lineups: dict) -> dict:
+    """Lineup records reduced to their totals (and ranks); the players live in the shards."""
+    return {
+        key: {k: v for k, v in record.items() if k != 'Players'} if key.lstrip('-').isdigit() else record
+        for key, record in lineups.items()
+    }
+
+
+def build_season_site(season: str) -> tuple[dict, dict] | None:
+    """
+    Split a season's site/data files into the index and per-gameweek shards.
+
+    The index carries the challenges, every lineup's totals and the
+    precomputed summary: everything the grid, stats strip and standing chart
+    need. Each shard carries one gameweek's full predicted, actual-optimal
+    and outcome lineups and its top-k pool, which only the detail modal uses.
+
+    Args:
+        season (str): Season string in YYYY-YY format (e.g. '2025-26').
+
+    Returns:
+        tuple[dict, dict] | None: (index without shard names, gameweek key ->
+            shard), or None if the season has no challenges.json.
+    """
+    data = {}
+    for name, filename in SITE_FILES.items():
+        path = os.path.join(site_dir(season), filename)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data[name] = json.load(f)
+        else:
+            data[name] = None
+    if data['challenges'] is None:
+        return None
+
+    predicted, actual, pool = data['predicted'] or {}, data['actual'] or {}, data['pool'] or {}
+    outcome = data['outcome']
+    index = {
+        'version': SITE_VERSION,
+        'season': season,
+        'challenges': data['challenges'],
+        'predicted': _without_players(predicted),
+        'actual': _without_players(actual),
+        'outcome': _without_players(outcome) if outcome is not None else None,
+        'summary': summarise_season(data['challenges'], predicted, actual, outcome),
+    }
+
+    shards = {}
+    gameweeks = set(predicted) | set(actual) | set(pool) | {k for k in outcome or {} if k.lstrip('-').isdigit()}
+    for key in sorted(gameweeks, key=int):
+        shards[key] = {
+            'predicted': predicted.get(key),
+            'actual': actual.get(key),
+            'outcome': (outcome or {}).get(key),
+            'pool': pool.get(key, []),
+        }
+    return index, shards
+
+
+def _minified(data) -> bytes:
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _write_bytes_atomic(path: str, body: bytes) -> None:
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(body)
+    os.replace(tmp_path, path)
+
+
+def write_season_site(season: str, force: bool = False) -> str | None:
+    """
+    Write site/data/{season}/index.json and its content-hashed gameweek shards.
+
+    Shards are named gw/{gameweek}.{hash}.json after their content, so a
+    shard's URL never changes meaning and it can be cached indefinitely;
+    only the small index, which lists the current shard names, needs
+    revalidating. Every file is minified and written atomically; GitHub
+    Pages compresses responses itself. Shards no longer listed by the index
+    are removed after it is written. Nothing is written if the index is
+    unchanged.
+
+    Args:
+        season (str): Season string in YYYY-YY format (e.g. '2025-26').
+        force (bool, optional): Rewrite even if unchanged.
+
+    Returns:
+        str | None: Path of index.json if it was written, else None.
+    """
+    built = build_season_site(season)
+    if built is None:
+        return None
+    index, shards = built
+
+    shard_dir = os.path.join(site_dir(season), SHARD_DIR)
+    os.makedirs(shard_dir, exist_ok=True)
+    index['shards'] = {}
+    for key, shard in shards.items():
+        body = _minified(shard)
+        name = f'{key}.{hashlib.sha256(body).hexdigest()[:SHARD_HASH_LENGTH]}.json'
+        path = os.path.join(shard_dir, name)
+        if force or not os.path.exists(path):
+            _write_bytes_atomic(path, body)
+        index['shards'][key] = f'{SHARD_DIR}/{name}'
+
+    body = _minified(index)
+    path = os.path.join(site_dir(season), INDEX_NAME)
+    if not force and os.path.exists(path):
+        with open(path, 'rb') as f:
+            if f.read() == body:
+                return None
+    _write_bytes_atomic(path, body)
+    print(f"Site index written to {path} ({len(body) / 1024:.0f} KB, {len(shards)} gameweek shards)")
+
+    # Only after the new index is in place, so a reader never sees a missing shard
+    current = {os.path.basename(name) for name in index['shards'].values()}
+    for name in os.listdir(shard_dir):
+        if name.split('.json')[0] + '.json' not in current:
+            os.remove(os.path.join(shard_dir, name))
+    return path
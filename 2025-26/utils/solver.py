@@ -1,99 +1,380 @@
 import pulp as plp
 from pulp import PULP_CBC_CMD
 from collections import defaultdict
+import numpy as np
 import pandas as pd
+from utils.trace import traced
+
+# Supported values for the optimiser's backend argument
+SOLVER_BACKENDS = ('cbc', 'highs')
+
+# scipy.optimize.milp status codes mapped onto PuLP's status constants
+HIGHS_STATUS_MAP = {
+    0: plp.LpStatusOptimal,
+    2: plp.LpStatusInfeasible,
+    3: plp.LpStatusUnbounded,
+}
 
 class FPLChallengeOptimiser:
-    def __init__(self, gameweek, projections_data):
+    def __init__(self, gameweek, projections_data, backend='cbc'):
+        if backend not in SOLVER_BACKENDS:
+            raise ValueError(f"Unknown solver backend '{backend}'. Expected one of {SOLVER_BACKENDS}.")
         self.gameweek = gameweek
         self.projections_data = projections_data
+        self.backend = backend
 
+    @traced()
     def setup_problem(self, problem_name, objective=plp.LpMaximize):
         self.player_ids = self.projections_data['ID'].tolist()
         self.player_count = len(self.player_ids)
 
+        # Pull everything the model needs out of the DataFrame once. Constraint
+        # methods below only ever touch these arrays and group indices, never
+        # per-player .loc lookups.
+        self.points = self.projections_data['Predicted_Points'].to_numpy(dtype=float)
+        self.costs = self.projections_data['Cost'].to_numpy(dtype=float)
+        self.position_groups = self._group_indices('Position')
+        self.team_groups = self._group_indices('Team')
+
         print(f"Setting up problem with name: {problem_name}.")
         self.model = plp.LpProblem(problem_name, objective)
 
         # Setup the decision variables
         self.lineup = [plp.LpVariable(f"lineup_{i}", lowBound=0, upBound=1, cat="Integer") for i in self.player_ids]
         self.captain = [plp.LpVariable(f"captain_{i}", lowBound=0, upBound=1, cat="Integer") for i in self.player_ids]
-    
+
         # Set the objective function (the number of points scored by the team, with captain's points doubled)
-        self.model +=  plp.lpSum([self.lineup[i] * self.projections_data.loc[i, 'Predicted_Points'] for i in range(self.player_count)]) + \
-                    plp.lpSum([self.captain[i] * self.projections_data.loc[i, 'Predicted_Points'] for i in range(self.player_count)])
+        points = self.points.tolist()
+        self.model += plp.LpAffineExpression(zip(self.lineup + self.captain, points + points))
+
+    def _group_indices(self, column):
+        """
+        Group row positions by the values of a column in a single pass.
+
+        Args:
+            column (str): Column of projections_data to group on.
+
+        Returns:
+            dict: Mapping of column value to a NumPy array of row positions.
+        """
+        codes, labels = pd.factorize(self.projections_data[column])
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+        return {label: order[bounds[k]:bounds[k + 1]] for k, label in enumerate(labels)}
+
+    def _lineup_sum(self, indices, coefficients=None):
+        """Build sum(coefficient * lineup[i]) over the given row positions."""
+        variables = [self.lineup[i] for i in indices]
+        if coefficients is None:
+            return plp.LpAffineExpression((var, 1) for var in variables)
+        return plp.LpAffineExpression(zip(variables, np.asarray(coefficients, dtype=float).tolist()))
+
+    def _add_constraint(self, constraint, name):
+        """Add a named constraint, replacing any existing constraint of the same name."""
+        self.model.constraints.pop(name, None)
+        self.model += constraint, name
+
+    def _add_constraints(self, rows):
+        """
+        Add named constraints in bulk, replacing any existing ones of the same names.
+
+        Args:
+            rows (dict): Constraint name -> LpConstraint.
+        """
+        for name in rows.keys() & self.model.constraints.keys():
+            self.model.constraints.pop(name)
+        for name, constraint in rows.items():
+            constraint.name = name
+            self.model.addConstraint(constraint)
+
+    def remove_constraint(self, name):
+        """Remove a named constraint if present. Returns True if it existed."""
+        return self.model.constraints.pop(name, None) is not None
+
+    @traced()
+    def apply_constraints(self, constraints):
+        """
+        Apply a full constraints.yaml gameweek block to the model.
 
+        Args:
+            constraints (dict): Gameweek block with total_players, captain_count,
+                position_constraints, max_per_team and optional budget_max /
+                budget_min keys.
+        """
+        self.total_players_constraint(constraints['total_players'])
+        self.captain_count_constraint(constraints['captain_count'])
+        self.position_count_constraints(constraints['position_constraints'])
+        self.max_players_from_same_team_constraint(constraints['max_per_team'])
+        if constraints.get('budget_max') is not None:
+            self.budget_constraint(constraints['budget_max'], constraints.get('budget_min', 0))
+
+    @traced()
     def total_players_constraint(self, total_players):
-        self.model += plp.lpSum(self.lineup) == total_players
-    
+        self._add_constraint(plp.lpSum(self.lineup) == total_players, 'total_players')
+
+    @traced()
     def exclude_players_constraint(self, exclude_id_list):
         for id in exclude_id_list:
-            self.model += self.lineup[id] == 0
+            self._add_constraint(self.lineup[id] == 0, f'exclude_{id}')
 
+    @traced()
     def force_players_constraint(self, force_id_list):
         for id in force_id_list:
-            self.model += self.lineup[id] == 1
-    
+            self._add_constraint(self.lineup[id] == 1, f'force_{id}')
+
+    @traced()
     def captain_count_constraint(self, captain_count):
-        self.model += plp.lpSum(self.captain) == captain_count
+        self._add_constraint(plp.lpSum(self.captain) == captain_count, 'captain_count')
 
-        # Constraint that all captains must be in the lineup
-        for i in range(self.player_count):
-            self.model += self.captain[i] <= self.lineup[i]
+        # Constraint that all captains must be in the lineup: captain_i - lineup_i <= 0.
+        # Each row needs its own constraint, so build them directly from
+        # coefficient pairs rather than through PuLP's operator overloading.
+        self._add_constraints({
+            f'captain_in_lineup_{i}': plp.LpConstraint(
+                plp.LpAffineExpression(((captain, 1), (lineup, -1))), plp.LpConstraintLE,
+            )
+            for i, (captain, lineup) in enumerate(zip(self.captain, self.lineup))
+        })
 
+    @traced()
     def position_count_constraints(self, position_counts):
+        empty = np.array([], dtype=int)
         for position, counts in position_counts.items():
             min_count = counts.get("min_count")
             max_count = counts.get("max_count")
 
+            # Build the position sum once and share it between both bounds
+            position_sum = self._lineup_sum(self.position_groups.get(position, empty))
+
             # Apply minimum constraint if specified
             if min_count is not None:
-                self.model += plp.lpSum(
-                    [self.lineup[i] for i in range(self.player_count) if self.projections_data.loc[i, 'Position'] == position]
-                ) >= min_count
+                self._add_constraint(position_sum >= min_count, f'position_min_{position}')
 
             # Apply maximum constraint if specified
             if max_count is not None:
-                self.model += plp.lpSum(
-                    [self.lineup[i] for i in range(self.player_count) if self.projections_data.loc[i, 'Position'] == position]
-                ) <= max_count
-    
+                self._add_constraint(position_sum <= max_count, f'position_max_{position}')
+
+    @traced()
     def budget_constraint(self, budget_max, budget_min=0):
-        self.model += plp.lpSum([self.lineup[i] * self.projections_data.loc[i, 'Cost'] for i in range(self.player_count)]) <= budget_max
-        self.model += plp.lpSum([self.lineup[i] * self.projections_data.loc[i, 'Cost'] for i in range(self.player_count)]) >= budget_min
+        spend = self._lineup_sum(range(self.player_count), self.costs)
+        self._add_constraint(spend <= budget_max, 'budget_max')
+        self._add_constraint(spend >= budget_min, 'budget_min')
 
+    @traced()
     def max_players_from_same_team_constraint(self, max_players_per_team):
-        for team in self.projections_data['Team'].unique():
-            self.model += plp.lpSum([self.lineup[i] for i in range(self.player_count) if self.projections_data.loc[i, 'Team'] == team]) <= max_players_per_team
+        for k, indices in enumerate(self.team_groups.values()):
+            self._add_constraint(self._lineup_sum(indices) <= max_players_per_team, f'max_per_team_{k}')
+
+    @traced()
+    def solve(self, warm_start=False):
+        """
+        Solve the model with the configured backend.
+
+        Args:
+            warm_start (bool): Pass the current variable values to CBC as an
+                initial incumbent. Ignored by the HiGHS backend, which
+                scipy.optimize.milp cannot warm-start.
+        """
+        if self.backend == 'highs':
+            self._solve_highs()
+        else:
+            self.model.solve(PULP_CBC_CMD(msg=0, warmStart=warm_start))
+        print(f"Status: {self.status}")
+
+    @property
+    def status(self):
+        """PuLP status string of the last solve, e.g. 'Optimal' or 'Infeasible'."""
+        return plp.LpStatus[self.model.status]
+
+    def _compile_sparse(self):
+        """
+        Compile the current PuLP model into scipy.optimize.milp inputs.
+
+        Every constraint present on the model (lineup, captain, position, team,
+        budget, exclude/force and anything added later) becomes one row of a
+        sparse matrix over the [lineup | captain] variable vector, so the
+        HiGHS backend always solves exactly the model CBC would.
+
+        Returns:
+            tuple: (c, constraints, integrality, bounds) ready for milp().
+        """
+        # scipy is only needed by the HiGHS backend, so it is imported on first use
+        from scipy.optimize import Bounds, LinearConstraint
+        from scipy.sparse import csr_array
+
+        variables = self.lineup + self.captain
+        column = {var: j for j, var in enumerate(variables)}
 
-    def solve(self):
-        self.model.solve(PULP_CBC_CMD(msg=0))
-        print(f"Status: {plp.LpStatus[self.model.status]}")
+        rows, cols, values = [], [], []
+        lower = np.full(len(self.model.constraints), -np.inf)
+        upper = np.full(len(self.model.constraints), np.inf)
+        for r, constraint in enumerate(self.model.constraints.values()):
+            for var, coef in constraint.items():
+                rows.append(r)
+                cols.append(column[var])
+                values.append(coef)
+            rhs = -constraint.constant
+            if constraint.sense != plp.LpConstraintGE:
+                upper[r] = rhs
+            if constraint.sense != plp.LpConstraintLE:
+                lower[r] = rhs
+
+        A = csr_array((values, (rows, cols)), shape=(len(lower), len(variables)))
+
+        # milp always minimises, so flip the sign for maximisation problems
+        c = np.zeros(len(variables))
+        for var, coef in self.model.objective.items():
+            c[column[var]] = coef
+        if self.model.sense == plp.LpMaximize:
+            c = -c
+
+        bounds = Bounds(
+            [var.lowBound if var.lowBound is not None else -np.inf for var in variables],
+            [var.upBound if var.upBound is not None else np.inf for var in variables],
+        )
+        integrality = np.ones(len(variables))
+        return c, LinearConstraint(A, lower, upper), integrality, bounds
+
+    def _solve_highs(self):
+        """
+        Solve the model in-process with HiGHS via scipy.optimize.milp.
+
+        Writes the solution back onto the PuLP variables and model status so
+        print_players_by_position and callers see the same shape as a CBC solve.
+        """
+        from scipy.optimize import milp
+
+        c, constraints, integrality, bounds = self._compile_sparse()
+        # HiGHS presolve costs several times more than the branch-and-bound
+        # itself on these small, tightly bounded lineup models, so skip it
+        result = milp(
+            c,
+            constraints=constraints,
+            integrality=integrality,
+            bounds=bounds,
+            options={'presolve': False},
+        )
+
+        self.model.status = HIGHS_STATUS_MAP.get(result.status, plp.LpStatusNotSolved)
+        solution = np.round(result.x) if result.x is not None else [None] * len(c)
+        for var, value in zip(self.lineup + self.captain, solution):
+            var.varValue = value
+
+    @traced()
+    def solve_top_k(self, k, max_gap=None):
+        """
+        Enumerate the k best distinct lineups by re-solving with no-good cuts.
+
+        The built model is reused: after each solve a cut excluding exactly that
+        set of players is added, and all cuts are removed again before returning,
+        so the model is left as it was and the variables hold the best lineup.
+        Lineups are distinct by player set; each comes with its best captain.
+
+        Args:
+            k (int): Maximum number of lineups to return.
+            max_gap (float, optional): Stop once a lineup scores more than this
+                many points below the best one.
+
+        Returns:
+            list[dict]: Ranked lineups with Rank, Players (position-keyed, as in
+                selected_players), Total_Points and Total_Cost keys.
+        """
+        pool = []
+        solutions = []
+        cut_names = []
+        for rank in range(1, k + 1):
+            self.solve()
+            if self.model.status != plp.LpStatusOptimal:
+                break
+            lineup_rows, captain_rows = self._selected_rows()
+            objective = float(self.points[lineup_rows].sum() + self.points[list(captain_rows)].sum())
+            if pool and max_gap is not None and pool[0]['Total_Points'] - objective > max_gap:
+                break
+
+            selected_players = build_selected_players(self.projections_data, lineup_rows, captain_rows)
+            pool.append({
+                'Rank': rank,
+                'Players': selected_players,
+                'Total_Points': objective,
+                'Total_Cost': float(self.costs[lineup_rows].sum()),
+            })
+            solutions.append([var.varValue for var in self.lineup + self.captain])
+
+            # No-good cut: at most len(lineup) - 1 of these players together again
+            cut_name = f'top_k_cut_{rank}'
+            self._add_constraint(self._lineup_sum(lineup_rows) <= len(lineup_rows) - 1, cut_name)
+            cut_names.append(cut_name)
+
+        for name in cut_names:
+            self.model.constraints.pop(name, None)
+
+        # Restore the best lineup so print_players_by_position reports it
+        if solutions:
+            for var, value in zip(self.lineup + self.captain, solutions[0]):
+                var.varValue = value
+            self.model.status = plp.LpStatusOptimal
+        return pool
+
+    def _selected_rows(self):
+        """Return the selected lineup row positions and the set of captain rows."""
+        lineup_rows = [i for i in range(self.player_count) if self.lineup[i].value() == 1]
+        captain_rows = {i for i in range(self.player_count) if self.captain[i].value() == 1}
+        return lineup_rows, captain_rows
 
     def print_players_by_position(self):
-        self.selected_players = defaultdict(list)
-        for i in range(self.player_count):
-            if self.lineup[i].value() == 1:
-                player = self.projections_data.loc[i]
-                self.selected_players[player['Position']].append({
-                    'ID': player['ID'],
-                    'Name': player['Name'],
-                    'Team': player['Team'],
-                    'Cost': player['Cost'],
-                    'Predicted_Points': player['Predicted_Points'],
-                    'Captain': self.captain[i].value() == 1
-                })
-
-        self.total_points = 0
-        self.total_cost = 0
-        for position in ['Goalkeeper', 'Defender', 'Midfielder', 'Forward']:
-            if position in self.selected_players:
-                print(f"\n{position}:")
-                for player in self.selected_players[position]:
-                    captain_str = " (C)" if player['Captain'] else ""
-                    points = player['Predicted_Points'] * (2 if player['Captain'] else 1)
-                    print(f"  {player['Name']}{captain_str} - {player['Team']} - Cost: {player['Cost']}m - Predicted Points: {points}")
-                    self.total_points += points
-                    self.total_cost += player['Cost']
-        print(f"\nTotal Predicted Points: {round(self.total_points, 2)}")
-        print(f"Total Cost: {round(self.total_cost, 2)}m")
\ No newline at end of file
+        lineup_rows, captain_rows = self._selected_rows()
+        self.selected_players = build_selected_players(self.projections_data, lineup_rows, captain_rows)
+        self.total_points, self.total_cost = print_selected_players(self.selected_players)
+
+
+def build_selected_players(projections_data, lineup_rows, captain_rows):
+    """
+    Build the position-keyed lineup structure shared by every solver engine.
+
+    Args:
+        projections_data (pd.DataFrame): Player projections the lineup was chosen from.
+        lineup_rows (Iterable[int]): Index labels of the selected players.
+        captain_rows (Container[int]): Index labels of the selected captain(s).
+
+    Returns:
+        defaultdict: Position name -> list of player dicts with ID, Name, Team,
+            Cost, Predicted_Points and Captain keys.
+    """
+    selected_players = defaultdict(list)
+    for i in lineup_rows:
+        player = projections_data.loc[i]
+        selected_players[player['Position']].append({
+            'ID': player['ID'],
+            'Name': player['Name'],
+            'Team': player['Team'],
+            'Cost': player['Cost'],
+            'Predicted_Points': player['Predicted_Points'],
+            'Captain': i in captain_rows
+        })
+    return selected_players
+
+
+def print_selected_players(selected_players):
+    """
+    Print a lineup grouped by position, doubling the captain's points.
+
+    Args:
+        selected_players (dict): Position-keyed lineup from build_selected_players.
+
+    Returns:
+        tuple[float, float]: Total predicted points and total cost of the lineup.
+    """
+    total_points = 0
+    total_cost = 0
+    for position in ['Goalkeeper', 'Defender', 'Midfielder', 'Forward']:
+        if position in selected_players:
+            print(f"\n{position}:")
+            for player in selected_players[position]:
+                captain_str = " (C)" if player['Captain'] else ""
+                points = player['Predicted_Points'] * (2 if player['Captain'] else 1)
+                print(f"  {player['Name']}{captain_str} - {player['Team']} - Cost: {player['Cost']}m - Predicted Points: {points}")
+                total_points += points
+                total_cost += player['Cost']
+    print(f"\nTotal Predicted Points: {round(total_points, 2)}")
+    print(f"Total Cost: {round(total_cost, 2)}m")
+    return total_points, total_cost
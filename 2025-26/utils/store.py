@@ -0,0 +1,331 @@
+import contextlib
+import fcntl
+import json
+import os
+import sqlite3
+import time
+
+# Lineup files kept in the store; each is a table keyed by gameweek
+LINEUP_FILES = ('predicted_optimal.json', 'predicted_pool.json', 'actual_optimal.json', 'actual_outcome.json')
+
+# Seasons listed on the site; shared by every season's store
+SEASONS_REGISTRY = os.path.join('site', 'data', 'seasons.json')
+
+# Seconds a writer waits for another process's transaction before giving up
+BUSY_TIMEOUT = 30
+
+
+def store_path(season: str) -> str:
+    """SQLite file for a season's lineups, overridable with FPL_LINEUP_STORE."""
+    return os.environ.get('FPL_LINEUP_STORE') or os.path.join(season, 'data', 'lineups', 'lineups.db')
+
+
+def _table(filename: str) -> str:
+    if filename not in LINEUP_FILES:
+        raise ValueError(f"Unknown lineups file {filename!r}; expected one of {', '.join(LINEUP_FILES)}")
+    return filename.removesuffix('.json')
+
+
+def _file_stat(path: str) -> tuple[int, int] | None:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@contextlib.contextmanager
+def file_lock(path: str):
+    """
+    Hold an exclusive lock for a read-modify-write of a file shared between runs.
+
+    The lock is an flock on a {path}.lock sidecar, so it covers writers in
+    every process, whatever else they have locked.
+
+    Args:
+        path (str): File about to be read and rewritten.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(f'{path}.lock', 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write_text_atomic(path: str, text: str) -> None:
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+class LineupStore:
+    """
+    Transactional store for a season's lineups.
+
+    Each lineups file ({season}/data/lineups/{name}.json) is a table with one
+    row per gameweek, so saving a gameweek touches one row instead of
+    rewriting the season. Top-level keys that are not gameweeks, such as
+    actual_outcome's total_players, live in a side table.
+
+    The JSON files remain the published form: export() regenerates a file
+    and its site/data mirror only when the table changed since it was last
+    written. If a file changes outside the store (a git pull, a hand edit),
+    the store re-imports it on open, so the JSON in the repository always
+    wins over a stale local database.
+
+    The database runs in WAL mode and every write, including an export,
+    takes the write lock up front with BEGIN IMMEDIATE, so concurrent runs
+    queue instead of overwriting each other's gameweeks. site/data/seasons.json
+    is shared by every season, so adding the season to it also takes a
+    registry-wide file lock, and every export re-checks it, so a season is
+    listed as soon as it has any lineups.
+
+        with LineupStore('2025-26') as store:
+            store.put('predicted_optimal.json', {7: record})
+            store.export()
+    """
+
+    def __init__(self, season: str, path: str | None = None):
+        """
+        Args:
+            season (str): Season string in YYYY-YY format (e.g. '2025-26').
+            path (str, optional): Database file. Defaults to store_path(season).
+        """
+        self.season = season
+        self.path = path or store_path(season)
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        with self._transaction():
+            self._create_schema()
+            for filename in LINEUP_FILES:
+                self._sync_from_file(filename)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        self._conn.execute('COMMIT')
+
+    def _create_schema(self) -> None:
+        for filename in LINEUP_FILES:
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {_table(filename)} ('
+                'gameweek INTEGER PRIMARY KEY, record TEXT NOT NULL, updated_at REAL NOT NULL)'
+            )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS extras ('
+            'name TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (name, key))'
+        )
+        # revision counts changes to a table; exported_* describe the file last written from it
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS revisions ('
+            'name TEXT PRIMARY KEY, revision INTEGER NOT NULL DEFAULT 0, '
+            'exported_revision INTEGER, exported_mtime_ns INTEGER, exported_size INTEGER)'
+        )
+        self._conn.executemany(
+            'INSERT OR IGNORE INTO revisions (name) VALUES (?)', [(_table(f),) for f in LINEUP_FILES]
+        )
+
+    def season_path(self, filename: str) -> str:
+        return os.path.join(self.season, 'data', 'lineups', filename)
+
+    def site_path(self, filename: str) -> str:
+        return os.path.join('site', 'data', self.season, filename)
+
+    def _sync_from_file(self, filename: str) -> None:
+        """Import a lineups file that differs from the one this store last wrote."""
+        name = _table(filename)
+        path = self.season_path(filename)
+        stat = _file_stat(path)
+        exported = self._conn.execute(
+            'SELECT exported_mtime_ns, exported_size FROM revisions WHERE name = ?', (name,)
+        ).fetchone()
+        if stat is None or stat == exported:
+            return
+
+        with open(path, 'r', encoding='utf-8') as f:
+            data: dict = json.load(f)
+        self._conn.execute(f'DELETE FROM {name}')
+        self._conn.execute('DELETE FROM extras WHERE name = ?', (name,))
+        now = time.time()
+        for key, value in data.items():
+            if key.lstrip('-').isdigit():
+                self._conn.execute(
+                    f'INSERT INTO {name} (gameweek, record, updated_at) VALUES (?, ?, ?)',
+                    (int(key), json.dumps(value, ensure_ascii=False), now),
+                )
+            else:
+                self._conn.execute(
+                    'INSERT INTO extras (name, key, value) VALUES (?, ?, ?)',
+                    (name, key, json.dumps(value, ensure_ascii=False)),
+                )
+        # The file now matches the table; only the site mirror may need refreshing
+        self._conn.execute(
+            'UPDATE revisions SET revision = revision + 1, exported_mtime_ns = ?, exported_size = ? WHERE name = ?',
+            (*stat, name),
+        )
+        self._conn.execute(
+            'UPDATE revisions SET exported_revision = revision WHERE name = ?', (name,)
+        )
+        if _file_stat(self.site_path(filename)) is None:
+            self._conn.execute('UPDATE revisions SET exported_revision = NULL WHERE name = ?', (name,))
+
+    def put(self, filename: str, records: dict, extras: dict | None = None) -> int:
+        """
+        Store gameweek records in one transaction.
+
+        Args:
+            filename (str): Lineups file, one of LINEUP_FILES.
+            records (dict): Gameweek -> JSON-serialisable record.
+            extras (dict, optional): Top-level keys written after the gameweeks;
+                a None value leaves the stored value unchanged.
+
+        Returns:
+            int: Rows whose content changed.
+        """
+        name = _table(filename)
+        now = time.time()
+        with self._transaction():
+            before = self._conn.total_changes
+            self._conn.executemany(
+                f'INSERT INTO {name} (gameweek, record, updated_at) VALUES (?, ?, ?) '
+                'ON CONFLICT (gameweek) DO UPDATE SET record = excluded.record, updated_at = excluded.updated_at '
+                'WHERE record != excluded.record',
+                [(int(gw), json.dumps(record, ensure_ascii=False), now) for gw, record in records.items()],
+            )
+            self._conn.executemany(
+                'INSERT INTO extras (name, key, value) VALUES (?, ?, ?) '
+                'ON CONFLICT (name, key) DO UPDATE SET value = excluded.value WHERE value != excluded.value',
+                [(name, key, json.dumps(value, ensure_ascii=False)) for key, value in (extras or {}).items() if value is not None],
+            )
+            changed = self._conn.total_changes - before
+            if changed:
+                self._conn.execute('UPDATE revisions SET revision = revision + 1 WHERE name = ?', (name,))
+        return changed
+
+    def get(self, filename: str) -> dict:
+        """
+        Contents of a lineups file as the JSON export would write them.
+
+        Args:
+            filename (str): Lineups file, one of LINEUP_FILES.
+
+        Returns:
+            dict: Gameweek strings in gameweek order, then any extra keys.
+        """
+        return self._render(filename)
+
+    def gameweeks(self, filename: str) -> set[int]:
+        """Gameweeks stored for a lineups file."""
+        rows = self._conn.execute(f'SELECT gameweek FROM {_table(filename)}')
+        return {gameweek for (gameweek,) in rows}
+
+    def _render(self, filename: str) -> dict:
+        name = _table(filename)
+        data = {
+            str(gameweek): json.loads(record)
+            for gameweek, record in self._conn.execute(f'SELECT gameweek, record FROM {name} ORDER BY gameweek')
+        }
+        for key, value in self._conn.execute('SELECT key, value FROM extras WHERE name = ? ORDER BY key', (name,)):
+            data[key] = json.loads(value)
+        return data
+
+    def export(self, filenames: tuple[str, ...] = LINEUP_FILES, force: bool = False) -> list[str]:
+        """
+        Regenerate lineups JSON and its site/data mirror where the store has changed.
+
+        A file is rewritten when its table changed since the last export or
+        either copy is missing. Empty tables are skipped. Runs under the
+        write lock, so concurrent exports cannot publish an older state over
+        a newer one.
+
+        Args:
+            filenames (tuple[str, ...], optional): Files to consider. Defaults to all.
+            force (bool, optional): Rewrite regardless of revisions.
+
+        Returns:
+            list[str]: Files rewritten.
+        """
+        written = []
+        with self._transaction():
+            for filename in filenames:
+                name = _table(filename)
+                revision, exported_revision = self._conn.execute(
+                    'SELECT revision, exported_revision FROM revisions WHERE name = ?', (name,)
+                ).fetchone()
+                season_path, site_path = self.season_path(filename), self.site_path(filename)
+                up_to_date = (
+                    revision == exported_revision
+                    and os.path.exists(season_path) and os.path.exists(site_path)
+                )
+                if up_to_date and not force:
+                    continue
+                data = self._render(filename)
+                if not data:
+                    continue
+
+                text = json.dumps(data, indent=4, ensure_ascii=False)
+                _write_text_atomic(season_path, text)
+                print(f"{filename} updated at {season_path}")
+                _write_text_atomic(site_path, text)
+                print(f"{filename} mirrored to {site_path}")
+
+                self._conn.execute(
+                    'UPDATE revisions SET exported_revision = ?, exported_mtime_ns = ?, exported_size = ? '
+                    'WHERE name = ?',
+                    (revision, *_file_stat(season_path), name),
+                )
+                written.append(filename)
+            if self._has_records():
+                self._register_season()
+        return written
+
+    def register_season(self) -> bool:
+        """
+        List this season in site/data/seasons.json, under the registry lock.
+
+        Returns:
+            bool: Whether the season was added.
+        """
+        with self._transaction():
+            return self._register_season()
+
+    def _register_season(self) -> bool:
+        """Read-modify-write of the registry under the registry-wide lock."""
+        # Shared by every season's store, so their own write locks do not cover it
+        with file_lock(SEASONS_REGISTRY):
+            seasons = []
+            if os.path.exists(SEASONS_REGISTRY):
+                with open(SEASONS_REGISTRY, 'r', encoding='utf-8') as f:
+                    raw = f.read().strip()
+                seasons = json.loads(raw) if raw else []
+            if self.season in seasons:
+                return False
+            _write_text_atomic(SEASONS_REGISTRY, json.dumps(sorted({*seasons, self.season}), indent=4, ensure_ascii=False))
+        print(f"Season {self.season} added to {SEASONS_REGISTRY}")
+        return True
+
+    def _has_records(self) -> bool:
+        return any(
+            self._conn.execute(f'SELECT 1 FROM {_table(filename)} LIMIT 1').fetchone()
+            for filename in LINEUP_FILES
+        )
@@ -0,0 +1,372 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.history import HistoryStore, season_from_events
+
+# Club names as they appear in projections and rules.yaml
+TEAMS = [
+    'Arsenal', 'Aston Villa', 'Bournemouth', 'Brentford', 'Brighton', 'Burnley', 'Chelsea',
+    'Crystal Palace', 'Everton', 'Fulham', 'Leeds', 'Liverpool', 'Man City', 'Man Utd',
+    'Newcastle', "Nott'm Forest", 'Spurs', 'Sunderland', 'West Ham', 'Wolves',
+]
+
+# FBref spellings of the clubs that differ from FPL's
+FBREF_TEAMS = {
+    'Man City': 'Manchester City',
+    'Man Utd': 'Manchester Utd',
+    'Newcastle': 'Newcastle Utd',
+    "Nott'm Forest": "Nott'ham Forest",
+    'Spurs': 'Tottenham',
+}
+
+POSITIONS = ['Goalkeeper', 'Defender', 'Midfielder', 'Forward']
+
+# Roughly the real squad mix: 1 goalkeeper for every 3 defenders, 4 midfielders, 1.5 forwards
+POSITION_WEIGHTS = [0.11, 0.33, 0.40, 0.16]
+
+# Price range (in millions) per position
+COST_RANGES = {'Goalkeeper': (4.0, 6.0), 'Defender': (4.0, 7.0), 'Midfielder': (4.5, 13.0), 'Forward': (4.5, 15.0)}
+
+FIRST_NAMES = [
+    'Alex', 'Ben', 'Bruno', 'Cole', 'Dan', 'Declan', 'Diogo', 'Eddie', 'Emile', 'Erling', 'Gabriel',
+    'Jack', 'James', 'Jarrod', 'João', 'Jordan', 'Kai', 'Luis', 'Marc', 'Martin', 'Mohamed', 'Morgan',
+    'Nicolas', 'Ollie', 'Pedro', 'Rodrigo', 'Ryan', 'Son', 'Virgil', 'William', 'Yoane', 'Łukasz',
+]
+
+# Surnames are built from two or three of these, giving tens of thousands of distinct names
+SURNAME_SYLLABLES = [
+    'al', 'ber', 'bo', 'ca', 'da', 'del', 'do', 'ek', 'fer', 'ga', 'gaard', 'ha', 'kel', 'ki', 'la',
+    'lan', 'ma', 'mi', 'na', 'nez', 'ni', 'o', 'ra', 'ri', 'ro', 'sa', 'son', 'ta', 'ton', 'vi', 'wa', 'zé',
+]
+
+# Stats in every synthetic live payload: FPL's standard set plus those the challenge rules read
+LIVE_STATS = [
+    'minutes', 'goals_scored', 'assists', 'clean_sheets', 'goals_conceded', 'own_goals', 'penalties_saved',
+    'penalties_missed', 'yellow_cards', 'red_cards', 'saves', 'bonus', 'bps', 'total_shots', 'key_passes',
+    'attempts_obox', 'fouls_won', 'penalties_won', 'substitutions_off', 'tackles', 'big_chances_created',
+    'dribbles', 'total_headed_attempts',
+]
+
+# Season-to-date counters on bootstrap elements read by per-90 rules
+ELEMENT_STATS = [
+    'goals_scored', 'assists', 'clean_sheets', 'bonus', 'tackles', 'big_chances_created', 'dribbles',
+    'total_headed_attempts',
+]
+
+# Shots per FBref player for the shot events table
+SHOTS_PER_PLAYER = 4
+
+# FBref tables list every player once; real ones hold ~600, so larger pools are capped
+FBREF_MAX_ROWS = 1000
+
+
+def synthetic_projections(size: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Generate player projections with the schema of the real projection CSVs.
+
+    Args:
+        size (int): Number of players; IDs run from 1 to size.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: ID, Name, Team, Position, Cost, Predicted_Points, xMins,
+            Fuzzy and Opponent columns, one row per player.
+    """
+    rng = np.random.default_rng(seed)
+    first = rng.choice(FIRST_NAMES, size)
+    surname = [
+        ''.join(rng.choice(SURNAME_SYLLABLES, k)).capitalize()
+        for k in rng.integers(2, 4, size)
+    ]
+    team = rng.choice(TEAMS, size)
+    position = rng.choice(POSITIONS, size, p=POSITION_WEIGHTS)
+
+    low = np.array([COST_RANGES[p][0] for p in position])
+    high = np.array([COST_RANGES[p][1] for p in position])
+    cost = np.round(low + (high - low) * rng.beta(1.5, 4, size) * 2, 1).clip(low, high)
+
+    # Starters play most minutes; a tail of squad players barely features
+    x_mins = np.where(rng.random(size) < 0.6, rng.uniform(60, 90, size), rng.uniform(0, 30, size)).round(1)
+    points = (x_mins / 90 * (1.5 + cost * rng.uniform(0.2, 0.6, size))).round(2)
+
+    # Each club plays a different club, half of them at home
+    opponents = dict(zip(TEAMS, np.roll(TEAMS, len(TEAMS) // 2)))
+    home = {club: i % 2 == 0 for i, club in enumerate(TEAMS)}
+    opponent = [f"{opponents[club]} ({'H' if home[club] else 'A'})" for club in team]
+
+    return pd.DataFrame({
+        'ID': np.arange(1, size + 1),
+        'Name': surname,
+        'Team': team,
+        'Position': position,
+        'Cost': cost,
+        'Predicted_Points': points,
+        'xMins': x_mins,
+        'Fuzzy': [f'{f} {s}' for f, s in zip(first, surname)],
+        'Opponent': opponent,
+    })
+
+
+def synthetic_bootstrap(projections: pd.DataFrame, finished: int = 20, seed: int = 0) -> dict:
+    """
+    Generate a bootstrap-static payload matching a set of synthetic projections.
+
+    Args:
+        projections (pd.DataFrame): Output of synthetic_projections.
+        finished (int, optional): Gameweeks marked finished. Defaults to 20.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        dict: Payload with elements, teams and events (38 gameweeks of the
+            2025-26 season).
+    """
+    rng = np.random.default_rng(seed)
+    size = len(projections)
+    team_ids = {club: i + 1 for i, club in enumerate(TEAMS)}
+    minutes = (projections['xMins'].to_numpy() * finished * rng.uniform(0.5, 1.0, size)).astype(int)
+    nineties = minutes / 90
+
+    birth_dates = pd.Timestamp('1990-01-01') + pd.to_timedelta(rng.integers(0, 17 * 365, size), unit='D')
+    join_dates = pd.Timestamp('2015-07-01') + pd.to_timedelta(rng.integers(0, 10 * 365 + 60, size), unit='D')
+
+    elements = pd.DataFrame({
+        'id': projections['ID'].to_numpy(),
+        'web_name': projections['Name'].to_numpy(),
+        'team': projections['Team'].map(team_ids).to_numpy(),
+        'element_type': projections['Position'].map({p: i + 1 for i, p in enumerate(POSITIONS)}).to_numpy(),
+        'now_cost': (projections['Cost'].to_numpy() * 10).round().astype(int),
+        'minutes': minutes,
+        'birth_date': birth_dates.strftime('%Y-%m-%d'),
+        'team_join_date': join_dates.strftime('%Y-%m-%d'),
+    })
+    for stat in ELEMENT_STATS:
+        elements[stat] = rng.poisson(nineties * rng.uniform(0.02, 0.8)).astype(int)
+
+    events = [
+        {
+            'id': gw,
+            'name': f'Gameweek {gw}',
+            'deadline_time': (pd.Timestamp('2025-08-15T17:30:00Z') + pd.Timedelta(weeks=gw - 1)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'finished': gw <= finished,
+            'data_checked': gw <= finished,
+        }
+        for gw in range(1, 39)
+    ]
+    teams = [{'id': i, 'name': club, 'short_name': club[:3].upper()} for club, i in team_ids.items()]
+    return {
+        'elements': elements.to_dict('records'),
+        'teams': teams,
+        'events': events,
+        'total_players': int(rng.integers(50_000, 150_000)),
+    }
+
+
+def synthetic_live(projections: pd.DataFrame, gameweek: int, seed: int = 0) -> dict:
+    """
+    Generate an event/{gw}/live payload for a set of synthetic projections.
+
+    Every player has one fixture; about a third do not play in it.
+
+    Args:
+        projections (pd.DataFrame): Output of synthetic_projections.
+        gameweek (int): Gameweek number, used to vary the seed.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        dict: Payload with an elements list of id, stats and explain entries.
+    """
+    rng = np.random.default_rng([seed, gameweek])
+    size = len(projections)
+    played = rng.random(size) < np.clip(projections['xMins'].to_numpy() / 90 + 0.2, 0, 1)
+    minutes = np.where(played, np.where(rng.random(size) < 0.7, 90, rng.integers(1, 90, size)), 0)
+    share = minutes / 90
+
+    stats = {'minutes': minutes}
+    for stat in LIVE_STATS[1:]:
+        stats[stat] = np.where(played, rng.poisson(share * rng.uniform(0.05, 1.5)), 0)
+    stats['bonus'] = np.minimum(stats['bonus'], 3)
+    stats['red_cards'] = np.minimum(stats['red_cards'], 1)
+    stats['substitutions_off'] = ((minutes > 0) & (minutes < 90)).astype(int)
+    stats['total_points'] = (
+        np.where(minutes >= 60, 2, np.where(minutes > 0, 1, 0))
+        + stats['goals_scored'] * 5 + stats['assists'] * 3 + stats['bonus']
+        - stats['yellow_cards'] - stats['red_cards'] * 3
+    )
+
+    elements = []
+    for r, player_id in enumerate(projections['ID'].to_numpy()):
+        row = {stat: int(values[r]) for stat, values in stats.items()}
+        elements.append({
+            'id': int(player_id),
+            'stats': row,
+            'explain': [{'fixture': gameweek, 'stats': [{'identifier': 'minutes', 'points': 2, 'value': row['minutes']}]}],
+        })
+    return {'elements': elements}
+
+
+def synthetic_element_summary(live_payloads: dict[int, dict], player_id: int) -> dict:
+    """
+    Build an element-summary/{id} payload from synthetic live payloads.
+
+    Args:
+        live_payloads (dict[int, dict]): Gameweek -> synthetic_live payload for
+            every finished gameweek.
+        player_id (int): FPL element ID (1-based row of the projections).
+
+    Returns:
+        dict: Payload with one history entry per gameweek and no fixtures.
+    """
+    history = []
+    for gameweek, payload in sorted(live_payloads.items()):
+        element = payload['elements'][player_id - 1]
+        history.append({'element': player_id, 'fixture': gameweek, 'round': gameweek, **element['stats']})
+    return {'fixtures': [], 'history': history}
+
+
+def synthetic_picks(projections: pd.DataFrame, live_payload: dict, gameweek: int, seed: int = 0) -> dict:
+    """
+    Generate an entry/{id}/event/{gw}/picks payload: six picks and a captain.
+
+    Args:
+        projections (pd.DataFrame): Output of synthetic_projections.
+        live_payload (dict): synthetic_live payload for the gameweek.
+        gameweek (int): Gameweek number.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        dict: Payload with picks and entry_history (points and ranks).
+    """
+    rng = np.random.default_rng([seed, gameweek, 1])
+    rows = rng.choice(len(projections), 6, replace=False)
+    picks = [
+        {'element': int(projections['ID'].iat[row]), 'position': i + 1, 'multiplier': 2 if i == 0 else 1,
+         'is_captain': i == 0, 'is_vice_captain': i == 1}
+        for i, row in enumerate(rows)
+    ]
+    points = sum(live_payload['elements'][pick['element'] - 1]['stats']['total_points'] * pick['multiplier']
+                 for pick in picks)
+    rank = int(rng.integers(1, 100_000))
+    return {
+        'active_chip': None,
+        'automatic_subs': [],
+        'entry_history': {
+            'event': gameweek, 'points': int(points), 'rank': rank, 'overall_rank': rank,
+            'percentile_rank': max(1, rank // 1000), 'event_transfers': 0, 'value': 1000, 'bank': 0,
+        },
+        'picks': picks,
+    }
+
+
+def synthetic_bundle(gameweeks: int = 38) -> str:
+    """
+    Generate a minified JS bundle holding challenge copy in the form utils.challenges parses.
+
+    Args:
+        gameweeks (int, optional): Challenges to include. Defaults to 38.
+
+    Returns:
+        str: Bundle text.
+    """
+    challenges = ','.join(
+        f'{gw}:{{copy:{{description:"Synthetic challenge {gw} rules.",shortDescription:"",title:"Challenge {gw}"}}}}'
+        for gw in range(1, gameweeks + 1)
+    )
+    return f'(function(){{const e={{{challenges}}};window.__challenges=e}})();'
+
+
+def synthetic_history(projections: pd.DataFrame, path: str, gameweeks: list[int], seed: int = 0) -> HistoryStore:
+    """
+    Build a history store at `path` from synthetic live payloads.
+
+    Point HISTORY_DIR at the parent of `path` (named after the season, e.g.
+    '2025-26') and load_season_history finds every gameweek already stored.
+
+    Args:
+        projections (pd.DataFrame): Output of synthetic_projections.
+        path (str): Store directory.
+        gameweeks (list[int]): Gameweeks to append.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        HistoryStore: The populated store.
+    """
+    store = HistoryStore(path)
+    for gameweek in gameweeks:
+        store.append_gameweek(gameweek, synthetic_live(projections, gameweek, seed))
+    return store
+
+
+def _fbref_name(name: str, rng) -> str:
+    """FBref's spelling of a name: usually identical, sometimes accented differently or with a typo."""
+    roll = rng.random()
+    if roll < 0.1 and len(name) > 4:
+        i = int(rng.integers(1, len(name) - 1))
+        return name[:i] + name[i + 1:]
+    if roll < 0.2:
+        return name.replace('o', 'ø', 1).replace('e', 'é', 1)
+    return name
+
+
+def synthetic_fbref(projections: pd.DataFrame, stat_types: list[str], season: str = '2526',
+                    seed: int = 0) -> dict[str, pd.DataFrame]:
+    """
+    Generate flattened FBref tables in the shape utils.fbref.load_stats returns.
+
+    Players are a sample of the projections (at most FBREF_MAX_ROWS) under
+    FBref's spelling of their name and club, so matching has real work to do.
+
+    Args:
+        projections (pd.DataFrame): Output of synthetic_projections.
+        stat_types (list[str]): Any of 'standard', 'shooting', 'passing',
+            'misc', 'defense' and 'shot_events'.
+        season (str, optional): Value of the season column. Defaults to '2526'.
+        seed (int, optional): Random seed. Defaults to 0.
+
+    Returns:
+        dict[str, pd.DataFrame]: Stat type -> table.
+    """
+    rng = np.random.default_rng(seed)
+    sample = projections.sample(min(len(projections), FBREF_MAX_ROWS), random_state=seed)
+    rows = len(sample)
+    base = pd.DataFrame({
+        'league': 'ENG-Premier League',
+        'season': season,
+        'team': sample['Team'].map(lambda club: FBREF_TEAMS.get(club, club)).to_numpy(),
+        'player': [_fbref_name(name, rng) for name in sample['Fuzzy']],
+    })
+    minutes = (sample['xMins'].to_numpy() * rng.uniform(10, 38, rows)).round()
+    nineties = minutes / 90
+
+    def per_90(low, high):
+        return rng.poisson(nineties * rng.uniform(low, high, rows))
+
+    def passing(attempts):
+        return base.assign(Total_Cmp=(attempts * rng.uniform(0.6, 0.95, rows)).astype(int), Total_Att=attempts)
+
+    tables = {
+        'standard': lambda: base.assign(**{'Playing Time_Min': minutes, 'Playing Time_90s': nineties.round(1)}),
+        'shooting': lambda: base.assign(Expected_xG=(nineties * rng.uniform(0, 0.6, rows)).round(1)),
+        'passing': lambda: passing(per_90(10, 70)),
+        'misc': lambda: base.assign(Performance_Recov=per_90(2, 9), Performance_Int=per_90(0, 2)),
+        'defense': lambda: base.assign(**{
+            '90s': nineties.round(1), 'Tackles_TklW': per_90(0.2, 2.5), 'Int': per_90(0.1, 1.8),
+            'Blocks_Blocks': per_90(0.1, 1.5), 'Clr': per_90(0.1, 5),
+        }),
+        'shot_events': lambda: pd.DataFrame({
+            'player': np.repeat(base['player'].to_numpy(), SHOTS_PER_PLAYER),
+            'xG': rng.beta(0.6, 4, rows * SHOTS_PER_PLAYER).round(2),
+            'outcome': rng.choice(['Goal', 'Saved', 'Off Target', 'Blocked'], rows * SHOTS_PER_PLAYER,
+                                  p=[0.11, 0.3, 0.35, 0.24]),
+        }),
+    }
+    unknown = set(stat_types) - set(tables)
+    if unknown:
+        raise ValueError(f"No synthetic FBref table for {sorted(unknown)}")
+    return {stat_type: tables[stat_type]() for stat_type in stat_types}
+
+
+def season_history_path(history_dir: str, bootstrap: dict) -> str:
+    """Store directory load_season_history uses for a bootstrap under a given HISTORY_DIR."""
+    return os.path.join(history_dir, season_from_events(bootstrap['events']))
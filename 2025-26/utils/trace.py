@@ -0,0 +1,221 @@
+import functools
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+# Set FPL_TRACE=0 to disable tracing; spans then cost a single global lookup
+TRACE_ENABLED = os.environ.get('FPL_TRACE', '1') != '0'
+
+# Traces are written to {season}/data/lineups/TRACE_DIRNAME/{name}.json
+TRACE_DIRNAME = 'traces'
+
+_trace = None
+
+
+def _http_counters() -> tuple[int, int, int]:
+    """Process-wide (requests, network requests, bytes) from utils.http, zero if it was never imported."""
+    http = sys.modules.get('utils.http')
+    return http.request_counters() if http is not None else (0, 0, 0)
+
+
+class Span:
+    """
+    One timed stage of a run.
+
+    Records wall time, process CPU time (all threads) and the HTTP requests
+    and bytes made while it was open. HTTP and CPU figures are process-wide,
+    so spans open at the same time in different threads share them.
+    """
+
+    def __init__(self, trace, name: str, attrs: dict):
+        self.trace = trace
+        self.name = name
+        self.attrs = attrs
+        self.children = []
+        self.error = None
+
+    def begin(self) -> None:
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        self._http = _http_counters()
+
+    def end(self, error: str | None = None) -> None:
+        self.wall_ms = (time.perf_counter() - self._wall) * 1000
+        self.cpu_ms = (time.process_time() - self._cpu) * 1000
+        self.http = tuple(after - before for after, before in zip(_http_counters(), self._http))
+        self.error = error
+
+    def __enter__(self):
+        stack = self.trace.stack()
+        with self.trace.lock:
+            stack[-1].children.append(self)
+        stack.append(self)
+        self.begin()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end(exc_type.__name__ if exc_type else None)
+        self.trace.stack().pop()
+        return False
+
+    def to_dict(self, origin: float) -> dict:
+        record = {
+            'name': self.name,
+            'start_ms': round((self._wall - origin) * 1000, 3),
+            'wall_ms': round(self.wall_ms, 3),
+            'cpu_ms': round(self.cpu_ms, 3),
+            'http_requests': self.http[0],
+            'http_network_requests': self.http[1],
+            'http_bytes': self.http[2],
+        }
+        if self.attrs:
+            record['attrs'] = self.attrs
+        if self.error:
+            record['error'] = self.error
+        if self.children:
+            record['children'] = [
+                child if isinstance(child, dict) else child.to_dict(origin) for child in self.children
+            ]
+        return record
+
+
+class Trace:
+    """A tree of spans rooted at one run; each thread nests its own spans under the root."""
+
+    def __init__(self, name: str, attrs: dict):
+        self.started_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self.root = Span(self, name, attrs)
+        self.lock = threading.Lock()
+        self._local = threading.local()
+
+    def stack(self) -> list:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = [self.root]
+        return stack
+
+
+class _NoSpan:
+    """Shared stand-in returned by span() when no trace is active."""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def start_trace(name: str, **attrs) -> Trace | None:
+    """
+    Start recording spans for a run, replacing any active trace.
+
+    Args:
+        name (str): Run name, e.g. 'gw12'.
+        **attrs: JSON-serialisable details stored on the root span.
+
+    Returns:
+        Trace | None: The active trace, or None when FPL_TRACE=0.
+    """
+    global _trace
+    if not TRACE_ENABLED:
+        return None
+    _trace = Trace(name, attrs)
+    _trace.root.begin()
+    return _trace
+
+
+def finish_trace() -> dict | None:
+    """Close the active trace and return it as a nested dict (None if none was active)."""
+    global _trace
+    trace, _trace = _trace, None
+    if trace is None:
+        return None
+    trace.root.end()
+    return {'started_at': trace.started_at, **trace.root.to_dict(trace.root._wall)}
+
+
+def span(name: str, **attrs):
+    """
+    Time a block as a span of the active trace.
+
+        with span('generate_projections'):
+            projections = generate_projections(gameweek)
+
+    Args:
+        name (str): Stage name.
+        **attrs: JSON-serialisable details stored on the span.
+
+    Returns:
+        A context manager; a shared no-op when no trace is active.
+    """
+    trace = _trace
+    if trace is None:
+        return _NO_SPAN
+    return Span(trace, name, attrs)
+
+
+def traced(name: str | None = None):
+    """
+    Decorator form of span(), named after the function's qualified name by default.
+
+        @traced()
+        def solve(self): ...
+    """
+    def decorate(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _trace is None:
+                return func(*args, **kwargs)
+            with Span(_trace, label, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def add_record(record: dict | None) -> None:
+    """Attach a finished trace (e.g. returned by a worker process) under the current span."""
+    trace = _trace
+    if trace is None or record is None:
+        return
+    with trace.lock:
+        trace.stack()[-1].children.append(record)
+
+
+def format_summary(record: dict) -> str:
+    """Return a table of a trace's top-level stages: wall, CPU, requests and MB downloaded."""
+    rows = [f"{'stage':<40} {'wall s':>8} {'cpu s':>8} {'requests':>8} {'MB':>7}"]
+    for child in record.get('children', []) + [{**record, 'name': 'total'}]:
+        rows.append(
+            f"{child['name'][:40]:<40} {child['wall_ms'] / 1000:>8.2f} {child['cpu_ms'] / 1000:>8.2f} "
+            f"{child['http_requests']:>8} {child['http_bytes'] / 1e6:>7.1f}"
+        )
+    return '\n'.join(rows)
+
+
+def write_trace(record: dict | None, season: str, name: str | None = None) -> str | None:
+    """
+    Write a finished trace beside the lineup files and print its summary.
+
+    Args:
+        record (dict | None): Result of finish_trace(); nothing is written for None.
+        season (str): Season string in YYYY-YY format (e.g. '2025-26').
+        name (str, optional): File stem; defaults to the trace name.
+
+    Returns:
+        str | None: Path written, or None when tracing was disabled.
+    """
+    if record is None:
+        return None
+    from utils.data import write_json_atomic
+
+    path = os.path.join(season, 'data', 'lineups', TRACE_DIRNAME, f"{name or record['name']}.json")
+    write_json_atomic(path, record)
+    print(f"\n{format_summary(record)}\nTrace written to {path}")
+    return path
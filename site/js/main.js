@@ -10,21 +10,102 @@ let currentSeason = null;
 function dataBase() { return `data/${currentSeason}`; }
 
 /* ── State ────────────────────────────────────────────────────────────────────── */
-let store    = null;   // { challenges, predicted, actual }
+let store    = null;   // { challenges, predicted, actual, outcome, pool, summary, shards }
 let filter   = 'all';
 let sortKey  = 'num-asc';
 
 /* ── Data loading ─────────────────────────────────────────────────────────────── */
+const SITE_VERSION = 2;
+
 async function loadData() {
   const base = dataBase();
   const opts = { cache: 'no-cache' };
-  const [challenges, predicted, actual, outcome] = await Promise.all([
+
+  // Small index from utils/site.py: totals and precomputed aggregates, players are in per-GW shards
+  const index = await fetch(`${base}/index.json`, opts)
+    .then(r => r.ok ? r.json() : null)
+    .catch(() => null);
+  if (index?.version === SITE_VERSION) return { ...index, pool: {}, loaded: new Set() };
+
+  // Seasons exported before the bundle existed: fetch each file and summarise here
+  const [challenges, predicted, actual, outcome, pool] = await Promise.all([
     fetch(`${base}/challenges.json`, opts).then(r => r.json()),
     fetch(`${base}/predicted_optimal.json`, opts).then(r => r.json()).catch(() => ({})),
     fetch(`${base}/actual_optimal.json`, opts).then(r => r.json()).catch(() => ({})),
     fetch(`${base}/actual_outcome.json`, opts).then(r => r.json()).catch(() => null),
+    fetch(`${base}/predicted_pool.json`, opts).then(r => r.json()).catch(() => ({})),
   ]);
-  return { challenges, predicted, actual, outcome };
+  return { challenges, predicted, actual, outcome, pool, summary: summariseSeason(challenges, predicted, actual, outcome) };
+}
+
+// Same aggregates as summarise_season() in utils/site.py
+function summariseSeason(challenges, predicted, actual, outcome) {
+  const gameweeks = {};
+  let complete = 0, inProgress = 0;
+  const captured = [];
+  for (const key of Object.keys(challenges)) {
+    const status  = statusOf(key, predicted, actual);
+    const scored  = outcome?.[key]?.Total_Points;
+    const optimal = actual[key]?.Total_Points;
+    const entry   = { status };
+    if (status === 'complete') {
+      complete++;
+      entry.overlap = computeOverlap(predicted[key], actual[key]);
+      if (scored != null) entry.vs_predicted = scored - predicted[key].Total_Points;
+    } else if (status === 'predicted') {
+      inProgress++;
+    }
+    if (scored != null && optimal > 0) {
+      entry.captured = scored / optimal;
+      if (status === 'complete') captured.push(entry.captured);
+    }
+    gameweeks[key] = entry;
+  }
+
+  let standing = null;
+  if (outcome) {
+    const keys = Object.keys(outcome).filter(k => !isNaN(Number(k))).map(Number).sort((a, b) => a - b);
+    if (keys.length > 0) {
+      standing = {
+        gameweeks:     keys,
+        overall_ranks: keys.map(k => outcome[String(k)]?.Ranks?.overall_rank ?? null),
+        points:        keys.map(k => outcome[String(k)]?.Total_Points ?? null),
+        total_players: typeof outcome.total_players === 'number' ? outcome.total_players : null,
+      };
+    }
+  }
+
+  return {
+    gameweeks,
+    stats: {
+      challenges:   Object.keys(challenges).length,
+      complete,
+      in_progress:  inProgress,
+      avg_captured: captured.length > 0 ? captured.reduce((a, b) => a + b, 0) / captured.length : null,
+    },
+    standing,
+  };
+}
+
+// Fetch a gameweek's full lineups on first use. Shard names are content-hashed,
+// so the browser cache can serve them without revalidating.
+async function loadShard(key) {
+  const data = store;
+  const path = data.shards?.[key];
+  if (!path || data.loaded.has(key)) return;
+  const shard = await fetch(`${dataBase()}/${path}`).then(r => {
+    if (!r.ok) throw new Error(`${path}: HTTP ${r.status}`);
+    return r.json();
+  });
+  if (shard.predicted) data.predicted[key] = shard.predicted;
+  if (shard.actual)    data.actual[key]    = shard.actual;
+  if (shard.outcome)   (data.outcome ??= {})[key] = shard.outcome;
+  data.pool[key] = shard.pool;
+  data.loaded.add(key);
+}
+
+function gwSummary(key) {
+  return store.summary.gameweeks[key] ?? { status: 'pending' };
 }
 
 /* ── Utilities ────────────────────────────────────────────────────────────────── */
@@ -87,30 +168,12 @@ function badgeHTML(status) {
 
 /* ── Stats strip ──────────────────────────────────────────────────────────────── */
 function renderStats() {
-  const { challenges, predicted, actual } = store;
-  const keys = Object.keys(challenges);
-
-  let complete = 0, inProgress = 0, totalPtsCaptured = 0, ptsCapturedCount = 0;
-  for (const key of keys) {
-    const s = statusOf(key, predicted, actual);
-    if (s === 'complete') {
-      complete++;
-      const oe  = store.outcome?.[key];
-      const opt = actual[key]?.Total_Points;
-      if (oe?.Total_Points != null && opt > 0) {
-        totalPtsCaptured += oe.Total_Points / opt;
-        ptsCapturedCount++;
-      }
-    } else if (s === 'predicted') {
-      inProgress++;
-    }
-  }
-
-  const avgCaptured = ptsCapturedCount > 0 ? `${(totalPtsCaptured / ptsCapturedCount * 100).toFixed(0)}%` : '—';
+  const stats = store.summary.stats;
+  const avgCaptured = stats.avg_captured != null ? `${(stats.avg_captured * 100).toFixed(0)}%` : '—';
 
   const strip = document.getElementById('stats-strip');
   const cells = strip.querySelectorAll('.stat-cell');
-  const values  = [keys.length, complete, inProgress, avgCaptured];
+  const values  = [stats.challenges, stats.complete, stats.in_progress, avgCaptured];
   const colours  = ['var(--text)', 'var(--accent)', 'var(--blue)', 'var(--text)'];
 
   cells.forEach((cell, i) => {
@@ -126,23 +189,15 @@ function renderStats() {
 
 /* ── Season standing ─────────────────────────────────────────────────────────── */
 function renderStanding() {
-  const outcome = store.outcome;
-  const section = document.getElementById('standing-section');
-  if (!outcome) { section.style.display = 'none'; return; }
-
-  // Collect only numeric gameweek keys, exclude top-level metadata like total_players
-  const gwKeys = Object.keys(outcome)
-    .filter(k => !isNaN(Number(k)))
-    .map(Number)
-    .sort((a, b) => a - b);
-
-  if (gwKeys.length === 0) { section.style.display = 'none'; return; }
+  const standing = store.summary.standing;
+  const section  = document.getElementById('standing-section');
+  if (!standing) { section.style.display = 'none'; return; }
 
-  const lastGw = gwKeys[gwKeys.length - 1];
-  const ranks  = outcome[String(lastGw)]?.Ranks;
-  if (!ranks?.overall_rank) { section.style.display = 'none'; return; }
+  const lastGw = standing.gameweeks.at(-1);
+  const ranks  = { overall_rank: standing.overall_ranks.at(-1) };
+  if (!ranks.overall_rank) { section.style.display = 'none'; return; }
 
-  const totalPlayers = typeof outcome.total_players === 'number' ? outcome.total_players : null;
+  const totalPlayers = standing.total_players;
 
   // Percentage position: rank / total * 100, rounded to one decimal place
   const pctText = (totalPlayers && ranks.overall_rank)
@@ -168,7 +223,7 @@ function sortedKeys() {
 
   // Apply filter
   keys = keys.filter(n => {
-    const s = statusOf(String(n), predicted, actual);
+    const s = gwSummary(String(n)).status;
     if (filter === 'all') return true;
     return s === filter;
   });
@@ -180,10 +235,8 @@ function sortedKeys() {
       case 'num-desc':
         return b - a;
       case 'overlap-desc': {
-        const sa = statusOf(ka, predicted, actual);
-        const sb = statusOf(kb, predicted, actual);
-        const pa = sa === 'complete' ? computeOverlap(predicted[ka], actual[ka]).pct : -1;
-        const pb = sb === 'complete' ? computeOverlap(predicted[kb], actual[kb]).pct : -1;
+        const pa = gwSummary(ka).overlap?.pct ?? -1;
+        const pb = gwSummary(kb).overlap?.pct ?? -1;
         return pb - pa || a - b;
       }
       case 'pts-desc': {
@@ -193,10 +246,8 @@ function sortedKeys() {
       }
       case 'ratio-desc':
       case 'ratio-asc': {
-        const oe_a = store.outcome?.[ka];
-        const oe_b = store.outcome?.[kb];
-        const ra = (oe_a?.Total_Points != null && actual[ka]?.Total_Points > 0) ? oe_a.Total_Points / actual[ka].Total_Points : null;
-        const rb = (oe_b?.Total_Points != null && actual[kb]?.Total_Points > 0) ? oe_b.Total_Points / actual[kb].Total_Points : null;
+        const ra = gwSummary(ka).captured ?? null;
+        const rb = gwSummary(kb).captured ?? null;
         // Push challenges without outcome data to the end
         if (ra === null && rb === null) return a - b;
         if (ra === null) return 1;
@@ -234,7 +285,8 @@ function renderGrid() {
   grid.innerHTML = keys.map(n => {
     const key    = String(n);
     const ch     = challenges[key];
-    const status = statusOf(key, predicted, actual);
+    const summary = gwSummary(key);
+    const status = summary.status;
     const hasBoth = status === 'complete';
     const hasPred = status === 'complete' || status === 'predicted';
     const hasAct  = status === 'complete' || status === 'actual';
@@ -243,21 +295,16 @@ function renderGrid() {
     let footer = '';
 
     if (hasBoth) {
-      const ov    = computeOverlap(predicted[key], actual[key]);
+      const ov    = summary.overlap;
       const fillW = (ov.pct * 100).toFixed(1);
       const oe    = outcome?.[key];
-      const opt   = actual[key].Total_Points;
 
       // ±delta: my score vs model's prediction
-      const gap = (oe?.Total_Points != null)
-        ? Math.round(oe.Total_Points - predicted[key].Total_Points)
-        : null;
+      const gap = summary.vs_predicted != null ? Math.round(summary.vs_predicted) : null;
       const gapColour = gap !== null ? (gap >= 0 ? 'var(--accent)' : 'var(--red)') : null;
 
       // % of optimal ceiling captured
-      const pctOpt = (oe?.Total_Points != null && opt > 0)
-        ? Math.round(oe.Total_Points / opt * 100)
-        : null;
+      const pctOpt = summary.captured != null ? Math.round(summary.captured * 100) : null;
 
       let outcomeRow = '';
       if (oe?.Total_Points != null) {
@@ -387,9 +434,42 @@ function positionSection(players, isActual, sharedIds, outcomeMap = null) {
   }).join('');
 }
 
-function openModal(id) {
+function alternativesHTML(key) {
+  // Ranked runner-up lineups from the solver's top-k pool (rank 1 is the prediction)
+  const pool = store.pool?.[key] ?? [];
+  if (pool.length < 2) return '';
+  const best = pool[0].Total_Points;
+  const rows = pool.slice(1).map(alt => {
+    const players = playersFlat(alt);
+    const captain = players.find(p => p.Captain);
+    const names   = players.map(p => p.Name).join(', ');
+    return `
+      <div class="comp-stat">
+        <div class="eyebrow" style="margin-bottom:6px;">#${alt.Rank}</div>
+        <div class="comp-val" style="color:var(--text-muted);">${fmt(alt.Total_Points, 2)}</div>
+        <div class="comp-sub">${fmt(alt.Total_Points - best, 2)} xPts &middot; C: ${captain ? captain.Name : '&ndash;'}</div>
+        <div class="comp-sub" style="max-width:220px;">${names}</div>
+      </div>`;
+  }).join('');
+  return `
+      <div style="height:1px; background:var(--border); margin:16px 0;"></div>
+      <div class="eyebrow" style="margin-bottom:12px;">Alternative lineups</div>
+      <div class="comparison-grid">${rows}</div>`;
+}
+
+async function openModal(id) {
+  const key = String(id);
+  const loading = store;
+  try {
+    await loadShard(key);
+  } catch (err) {
+    console.error(`Failed to load GW${id}:`, err);
+    return;
+  }
+  // The season was switched while the shard was loading
+  if (store !== loading) return;
+
   const { challenges, predicted, actual } = store;
-  const key         = String(id);
   const ch          = challenges[key];
   const pred        = predicted[key];
   const act         = actual[key];
@@ -530,7 +610,7 @@ function openModal(id) {
   // Footer — comparison stats
   const footer = document.getElementById('modal-footer');
   if (pred && act) {
-    const ov       = computeOverlap(pred, act);
+    const ov       = gwSummary(key).overlap;
     const ptsDiff  = act.Total_Points - pred.Total_Points;
 
     let rankStats = '';
@@ -592,12 +672,13 @@ function openModal(id) {
       <div style="height:1px; background:var(--border); margin:16px 0;"></div>
       <div class="eyebrow" style="margin-bottom:12px;">My result</div>
       <div class="comparison-grid">${rankStats}</div>` : ''}
+      ${alternativesHTML(key)}
       <p class="note-text">
         Green-ticked rows appear in both the predicted and hindsight-optimal lineups.
         The captain (C) is the model&rsquo;s highest-projected or highest-scoring player.
       </p>`;
   } else {
-    footer.innerHTML = '';
+    footer.innerHTML = alternativesHTML(key);
   }
 
   // Open overlay
@@ -661,18 +742,12 @@ async function loadSeason() {
 let standingChartInstance = null;
 
 function openStandingChart() {
-  const outcome = store?.outcome;
-  if (!outcome) return;
-
-  const gwKeys = Object.keys(outcome)
-    .filter(k => !isNaN(Number(k)))
-    .map(Number)
-    .sort((a, b) => a - b);
-
-  if (gwKeys.length === 0) return;
+  const standing = store?.summary.standing;
+  if (!standing) return;
 
-  const totalPlayers = typeof outcome.total_players === 'number' ? outcome.total_players : null;
-  const ranks        = gwKeys.map(k => outcome[String(k)]?.Ranks?.overall_rank ?? null);
+  const gwKeys       = standing.gameweeks;
+  const totalPlayers = standing.total_players;
+  const ranks        = standing.overall_ranks;
   const validRanks   = ranks.filter(r => r !== null);
 
   if (validRanks.length === 0) return;
@@ -811,8 +886,7 @@ function openStandingChart() {
               return `Rank #${fmtNum(rank)}${pct}`;
             },
             afterLabel: item => {
-              const gw  = gwKeys[item.dataIndex];
-              const pts = outcome[String(gw)]?.Total_Points;
+              const pts = standing.points[item.dataIndex];
               return pts != null ? `${pts} pts this GW` : '';
             },
           },
@@ -828,10 +902,10 @@ function closeStandingChart() {
 }
 
 document.getElementById('standing-section').addEventListener('click', () => {
-  if (store?.outcome) openStandingChart();
+  if (store?.summary.standing) openStandingChart();
 });
 document.getElementById('standing-section').addEventListener('keydown', e => {
-  if (e.key === 'Enter' || e.key === ' ') { e.preventDefault(); if (store?.outcome) openStandingChart(); }
+  if (e.key === 'Enter' || e.key === ' ') { e.preventDefault(); if (store?.summary.standing) openStandingChart(); }
 });
 document.getElementById('standing-chart-close').addEventListener('click', closeStandingChart);
 document.getElementById('standing-chart-overlay').addEventListener('click', e => {